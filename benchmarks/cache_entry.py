@@ -0,0 +1,54 @@
+import argparse
+import json
+import pickle
+import time
+from datetime import datetime, timedelta
+from utils.cache_entry import ENTRY_HEADER, decode_entry, decode_header, encode_entry
+
+
+def benchmark(games=272, rounds=200):
+    """Print freshness-check and full-read cost of a season-sized /matches entry"""
+    game = {
+        "id": 0,
+        "date": "2025-09-05T00:20:00.000Z",
+        "league": {"name": "NFL", "abbreviation": "NFL"},
+        "season": 2025,
+        "round": "Week 1",
+        "state": {"score": {"current": "0 - 0"}, "description": "Scheduled"},
+        "homeTeam": {"id": 1, "name": "Eagles", "location": "Philadelphia"},
+        "awayTeam": {"id": 2, "name": "Cowboys", "location": "Dallas"},
+        "venue": {"name": "Lincoln Financial Field", "city": "Philadelphia"},
+    }
+    # round-trip through JSON so games share no objects (pickle would memoize them)
+    data = json.loads(json.dumps({"data": [dict(game, id=i) for i in range(games)]}))
+    ttl = timedelta(hours=1)
+
+    entry_bytes = encode_entry(data, ttl)
+    pickle_bytes = pickle.dumps({"timestamp": datetime.now(), "data": data, "ttl": ttl})
+
+    def measure(func):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        return (time.perf_counter() - start) / rounds * 1000
+
+    pickle_time = measure(lambda: pickle.loads(pickle_bytes)["timestamp"])
+    header_time = measure(
+        lambda: decode_header(entry_bytes[: ENTRY_HEADER.size], len(entry_bytes))
+    )
+    full_time = measure(lambda: decode_entry(entry_bytes))
+
+    print(f"/matches payload with {games} games")
+    print(f"pickle: {len(pickle_bytes)} B, freshness check {pickle_time:.3f} ms")
+    print(
+        f"entry:  {len(entry_bytes)} B, freshness check {header_time:.4f} ms, "
+        f"full read {full_time:.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cache entry format benchmark")
+    parser.add_argument("--games", type=int, default=272)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    benchmark(args.games, args.rounds)
@@ -0,0 +1,75 @@
+import time
+from utils.data_manager import DataManager
+
+
+def benchmark(rounds=10000):
+    """Print the cost of common lookups with the load-time indexes vs linear scans"""
+    data_manager = DataManager()
+    teams_data = data_manager.nfl_teams_data
+    mapping_data = data_manager.nfl_team_character_mapping_data
+    team_keys = list(teams_data)
+    character_keys = list(mapping_data.values())
+    api_names = [team["nickname"] for team in teams_data.values()]
+
+    # lookups as they were done before the indexes (scan per call)
+    def scan_team_key_by_character_key(character_key):
+        character_key = character_key.lower().replace(" ", "_")
+        for team_key, char_key in mapping_data.items():
+            if char_key == character_key:
+                return team_key
+        return None
+
+    def scan_teams_by_conference_and_division(conference, division):
+        return [
+            team
+            for team in teams_data.values()
+            if team["conference"] == conference.upper()
+            and team["division"] == division.capitalize()
+        ]
+
+    def scan_team_by_api_name(api_team_name):
+        for team in teams_data.values():
+            if api_team_name in (team["nickname"], team["name"]):
+                return team
+        return None
+
+    lookups = [
+        (
+            "team key by character key",
+            scan_team_key_by_character_key,
+            data_manager.get_team_key_by_character_key,
+            character_keys,
+        ),
+        (
+            "teams by conference and division",
+            lambda args: scan_teams_by_conference_and_division(*args),
+            lambda args: data_manager.get_teams_key_by_conference_and_division(*args),
+            [("nfc", "north"), ("afc", "west")],
+        ),
+        (
+            "team by API name",
+            scan_team_by_api_name,
+            data_manager.get_team_data_by_api_name,
+            api_names,
+        ),
+        (
+            "character key by team key",
+            lambda team_key: mapping_data[team_key.lower().replace(" ", "_")],
+            data_manager.get_character_key_by_team_key,
+            team_keys,
+        ),
+    ]
+
+    print(f"{rounds} lookups each, {len(team_keys)} teams")
+    for name, scan, indexed, keys in lookups:
+        timings = []
+        for lookup in [scan, indexed]:
+            start = time.perf_counter()
+            for i in range(rounds):
+                lookup(keys[i % len(keys)])
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{name}: scan {timings[0]:.1f} ms, indexed {timings[1]:.1f} ms")
+
+
+if __name__ == "__main__":
+    benchmark()
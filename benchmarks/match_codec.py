@@ -0,0 +1,45 @@
+import argparse
+import glob
+import json
+import os
+import time
+from utils.match_codec import decode_match, encode_match
+
+
+def benchmark(match_cache_dir, rounds=50):
+    """Print bytes and load time per match for JSON vs compact files"""
+    for json_path in sorted(glob.glob(os.path.join(match_cache_dir, "*.json"))):
+        with open(json_path, "rb") as f:
+            json_bytes = f.read()
+        compact_bytes = encode_match(json.loads(json_bytes)[0])
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            game = json.loads(json_bytes)[0]
+            game["homeTeam"], game["events"]
+        json_time = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            game = decode_match(compact_bytes)
+            game["homeTeam"], game["events"]
+        compact_time = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            decode_match(compact_bytes)["homeTeam"]
+        header_time = (time.perf_counter() - start) / rounds
+
+        print(
+            f"{os.path.basename(json_path)}: "
+            f"JSON {len(json_bytes)} B {json_time * 1000:.2f} ms | "
+            f"compact {len(compact_bytes)} B {compact_time * 1000:.2f} ms "
+            f"(match section only {header_time * 1000:.2f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JSON vs compact match file benchmark")
+    parser.add_argument("match_cache_dir", nargs="?", default="./match_cache")
+    args = parser.parse_args()
+    benchmark(args.match_cache_dir)
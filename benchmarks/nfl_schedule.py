@@ -0,0 +1,81 @@
+import argparse
+import time
+from datetime import datetime, timedelta
+from utils.nfl_schedule import Season, get_gameweek_window, parse_game_date
+
+
+def synthetic_games(seasons, games_per_week=16, weeks=17, teams=32):
+    """Games shaped like /matches data, one per slot of a weekly schedule"""
+    games = []
+    first_kickoff = datetime(2025, 9, 5, 0, 20)
+    for season in range(seasons):
+        for week in range(weeks):
+            for slot in range(games_per_week):
+                kickoff = first_kickoff + timedelta(
+                    weeks=week - season * 52, days=slot % 4, hours=slot % 3
+                )
+                games.append(
+                    {
+                        "id": len(games),
+                        "date": kickoff.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                        "state": {
+                            "description": (
+                                "Finished" if kickoff < datetime.now() else "Scheduled"
+                            )
+                        },
+                        "homeTeam": {"id": slot * 2 % teams},
+                        "awayTeam": {"id": (slot * 2 + 1) % teams},
+                    }
+                )
+    return games
+
+
+def benchmark(seasons=10, rounds=100):
+    """Print the cost of schedule queries on a Season vs scanning the raw games"""
+    games = synthetic_games(seasons)
+    today = datetime(2025, 10, 18)
+    window = get_gameweek_window(0, today)
+
+    # queries as they were done before Season (parse and scan per call)
+    def scan_gameweek():
+        week_games = [
+            game for game in games if window[0] <= parse_game_date(game) <= window[1]
+        ]
+        return sorted(week_games, key=lambda game: game["date"])
+
+    def scan_next_games(team_id):
+        team_games = [
+            game
+            for game in games
+            if game["state"]["description"] == "Scheduled"
+            and team_id in (game["homeTeam"]["id"], game["awayTeam"]["id"])
+        ]
+        return sorted(team_games, key=parse_game_date)[:5]
+
+    start = time.perf_counter()
+    season = Season(games)
+    build_time = (time.perf_counter() - start) * 1000
+
+    def measure(func):
+        start = time.perf_counter()
+        for i in range(rounds):
+            func(i)
+        return (time.perf_counter() - start) / rounds * 1000
+
+    print(f"{seasons} seasons, {len(games)} games, Season built in {build_time:.1f} ms")
+    print(
+        f"gameweek: scan {measure(lambda i: scan_gameweek()):.3f} ms, "
+        f"Season {measure(lambda i: season.get_gameweek(0, today)):.4f} ms"
+    )
+    print(
+        f"next games of a team: scan {measure(lambda i: scan_next_games(i % 32)):.3f} ms, "
+        f"Season {measure(lambda i: season.get_next_scheduled_games_by_team_id(i % 32)):.4f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Season schedule benchmark")
+    parser.add_argument("--seasons", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+    benchmark(args.seasons, args.rounds)
@@ -0,0 +1,75 @@
+import argparse
+import time
+from commands.nfl_commands import NFLCommands
+from utils.data_manager import DataManager
+
+
+class FakeBot:
+    def __init__(self):
+        self.data_manager = DataManager()
+        self.nfl_api_manager = None
+
+
+def synthetic_standings(data_manager):
+    """/standings responses by conference, shaped like the highlight API"""
+    standings = {}
+    for i, team in enumerate(data_manager.nfl_teams_data.values()):
+        response = standings.setdefault(team["conference"], {"data": [{"data": []}]})
+        response["data"][0]["data"].append(
+            {
+                "team": {"id": team["id"]},
+                "statistics": [
+                    {"displayName": "Overall Record", "value": "9-8"},
+                    {"displayName": "Division Record", "value": f"{i % 4}-{3 - i % 4}"},
+                ],
+            }
+        )
+    return standings
+
+
+def benchmark(rounds=1000):
+    """Print the cost of rendering every !nfl standings table with and without the cache"""
+    cog = NFLCommands(FakeBot())
+    standings = synthetic_standings(cog.data_manager)
+    divisions = [
+        (conference, division)
+        for conference in ["NFC", "AFC"]
+        for division in ["North", "East", "South", "West"]
+    ]
+
+    # what the command did per call before the render cache
+    start = time.perf_counter()
+    for _ in range(rounds):
+        team_records = cog._get_team_records(standings.values())
+        for conference, division in divisions:
+            cog._render_division_standings(conference, division, team_records)
+    uncached_time = time.perf_counter() - start
+
+    # the command's cached path, the standings payload version never changes
+    start = time.perf_counter()
+    for _ in range(rounds):
+        team_records = None
+        for conference, division in divisions:
+            description = cog.render_cache.get("standings", (conference, division), 1.0)
+            if description is None:
+                if team_records is None:
+                    team_records = cog._get_team_records(standings.values())
+                description = cog._render_division_standings(
+                    conference, division, team_records
+                )
+                cog.render_cache.set(
+                    "standings", (conference, division), 1.0, description
+                )
+    cached_time = time.perf_counter() - start
+
+    print(f"{rounds} x !nfl standings ({len(divisions)} tables)")
+    print(f"without render cache: {uncached_time * 1000:.1f} ms")
+    print(f"with render cache:    {cached_time * 1000:.1f} ms")
+    print(f"render cache: {cog.render_cache.get_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Standings render cache benchmark")
+    parser.add_argument("--rounds", type=int, default=1000)
+    args = parser.parse_args()
+    benchmark(args.rounds)
@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+from utils.story_pacer import StoryPacer
+
+
+class CountingChannel:
+    id = 0
+
+    def __init__(self):
+        self.sends = 0
+
+    async def send(self, message):
+        self.sends += 1
+
+
+def gameweek_lines(games):
+    """Lines shaped like a !story gameweek: header, then title, story and separator per game"""
+    lines = [("Here's the storyline for Current gameweek...\n", 0)]
+    for game_id in range(games):
+        lines.append((f"⚔️ **Home team vs Away team** [Match ID: {game_id}]", 1))
+        lines.append(("A story about how the game went. " * 4, 0))
+        lines.append(("━" * 64, 2))
+    lines.append(
+        ("And that's it for this gameweek. Stay tuned for the next one. 🏈", 0)
+    )
+    return lines
+
+
+async def benchmark(games, flush_delays):
+    """Print Discord sends and paced duration of a gameweek story per flush delay"""
+    lines = gameweek_lines(games)
+    print(f"!story gameweek with {games} games ({len(lines)} lines)")
+    for flush_delay in flush_delays:
+        paused = []
+
+        async def sleep(delay):
+            paused.append(delay)
+
+        channel = CountingChannel()
+        pacer = StoryPacer(sleep=sleep, flush_delay=flush_delay)
+        await pacer.deliver(channel, lines)
+        print(
+            f"STORY_FLUSH_DELAY={flush_delay:g}: {channel.sends} sends, "
+            f"{sum(paused):g}s of pauses"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Story batching benchmark")
+    parser.add_argument("--games", type=int, default=16)
+    parser.add_argument("--flush-delays", type=float, nargs="+", default=[0, 2, 4, 8])
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.games, args.flush_delays))
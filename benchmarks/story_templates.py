@@ -0,0 +1,42 @@
+import time
+from utils.read_json import load_storyline
+from utils.story_templates import (
+    ALLOWED_PLACEHOLDERS,
+    GROUP_PLACEHOLDERS,
+    TemplateRegistry,
+)
+
+
+def benchmark(rounds=20000):
+    """Print render throughput of the compiled templates vs str.format"""
+    registry = TemplateRegistry(load_storyline())
+    # each template gets the values of its category, as the story commands pass them
+    templates = []
+    for (group, category), category_templates in registry.templates.items():
+        allowed = ALLOWED_PLACEHOLDERS.get(
+            (group, category), GROUP_PLACEHOLDERS.get(group, frozenset())
+        )
+        values = {name: f"<{name}>" for name in allowed}
+        templates += [(template, values) for template in category_templates]
+
+    def measure(render):
+        # best of 5 runs, a busy machine only ever makes a run slower
+        best = None
+        for _ in range(5):
+            start = time.perf_counter()
+            for i in range(rounds):
+                render(*templates[i % len(templates)])
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    format_time = measure(lambda template, values: template.text.format(**values))
+    render_time = measure(lambda template, values: template.render(**values))
+
+    print(f"{rounds} renders over {len(templates)} templates")
+    print(f"str.format:       {rounds / format_time:,.0f} renders/s")
+    print(f"compiled render:  {rounds / render_time:,.0f} renders/s")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -5,7 +5,11 @@ from discord.ext import commands
 from dotenv import load_dotenv
 from utils.data_manager import DataManager
 import asyncio
+from utils.api_budget import PRIORITY_LIVE
+from utils.cache_janitor import CacheJanitor
+from utils.live_poller import LivePoller
 from utils.nfl_api import NFLAPIManager
+from utils.prefetch_scheduler import PrefetchScheduler
 from loguru import logger
 
 # Load env
@@ -29,6 +33,63 @@ class MyBot(commands.Bot):
         # load NFL API manager
         self.nfl_api_manager = NFLAPIManager(cache_dir="./cache")
 
+        nfl_api_team_ids = [
+            self.data_manager.get_team_data_by_team_key(team_key)["nflApiId"]
+            for team_key in self.data_manager.get_all_team_keys()
+        ]
+        self.nfl_api_manager.migrate_cache_keys(nfl_api_team_ids)
+
+        # load cache prefetch scheduler
+        self.prefetch_scheduler = PrefetchScheduler(
+            self.nfl_api_manager,
+            nfl_api_team_ids,
+            os.getenv("PREFETCH_SCHEDULE"),
+        )
+        self.prefetch_task = None
+
+        # load cache janitor (bounds ./cache and the match archive)
+        self.cache_janitor = CacheJanitor(
+            self.nfl_api_manager.apiCache,
+            self.nfl_api_manager.match_archive,
+            max_bytes=int(os.getenv("CACHE_MAX_MB", "256")) * 1024 * 1024,
+            max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "1000")),
+            archive_max_bytes=int(os.getenv("MATCH_CACHE_MAX_MB", "64")) * 1024 * 1024,
+            archive_max_entries=int(os.getenv("MATCH_CACHE_MAX_ENTRIES", "5000")),
+            policy=os.getenv("CACHE_EVICTION_POLICY", "lru").lower(),
+        )
+        self.janitor_task = None
+
+        # load live game poller (started by the first subscribed channel)
+        self.live_poller = LivePoller(
+            lambda: self.nfl_api_manager.get_nfl_all_matches(priority=PRIORITY_LIVE),
+            lambda match_id: self.nfl_api_manager.get_nfl_specific_matches(
+                match_id, allow_stale=False
+            ),
+            budget=self.nfl_api_manager.budget,
+        )
+
+    async def setup_hook(self):
+        # open pooled HTTP session before any command can run
+        await self.nfl_api_manager.start()
+
+        # warm the cache at fixed points of the NFL week
+        if os.getenv("PREFETCH_ENABLED", "true").lower() == "true":
+            self.prefetch_task = asyncio.create_task(self.prefetch_scheduler.run())
+
+        # remove expired entries and enforce cache size limits
+        self.janitor_task = asyncio.create_task(self.cache_janitor.run())
+
+    async def close(self):
+        if self.prefetch_task is not None:
+            self.prefetch_task.cancel()
+        if self.janitor_task is not None:
+            self.janitor_task.cancel()
+        self.live_poller.stop()
+
+        # release HTTP connections on shutdown
+        await self.nfl_api_manager.close()
+        await super().close()
+
     async def on_ready(self):
         logger.info(f"{self.user} has connected to Discord!")
         for guild in self.guilds:
@@ -66,6 +127,10 @@ class MyBot(commands.Bot):
             await self.load_extension("commands.story_commands")
             logger.info("✅ Loaded Story commands")
 
+            # Load Cache commands
+            await self.load_extension("commands.cache_commands")
+            logger.info("✅ Loaded Cache commands")
+
         except Exception as e:
             logger.error(f"❌ Failed to load cogs: {e}")
 
@@ -0,0 +1,84 @@
+import discord
+from discord.ext import commands
+from table2ascii import table2ascii, PresetStyle
+from utils.color import COLOR_PURPLE
+
+
+def format_bytes(size):
+    for unit in ["B", "KB", "MB"]:
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class CacheCommands(commands.Cog, name="Cache Commands"):
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.cache_janitor = bot.cache_janitor
+
+    @commands.group(name="cache", invoke_without_command=True)
+    @commands.has_permissions(administrator=True)
+    async def cache(self, ctx):
+        if ctx.invoked_subcommand is None:
+            embed = discord.Embed(
+                title="🗄️ Cache Commands",
+                description="Inspect the bot's API and match caches",
+                color=COLOR_PURPLE,
+            )
+            embed.add_field(
+                name="Commands:",
+                value="`!cache stats` - Get cache size, entries and evictions\n",
+                inline=False,
+            )
+            await ctx.send(embed=embed)
+
+    @cache.command(name="stats", help="Get cache size, entries and evictions")
+    @commands.has_permissions(administrator=True)
+    async def get_cache_stats(self, ctx):
+        stats = self.cache_janitor.get_stats()
+
+        output_value_table = []
+        for name in ["api_cache", "match_archive"]:
+            if name not in stats:
+                continue
+            cache_stats = stats[name]
+            output_value_table.append(
+                [
+                    name,
+                    f"{cache_stats['entries']}/{cache_stats['max_entries']}",
+                    f"{format_bytes(cache_stats['bytes'])}/{format_bytes(cache_stats['max_bytes'])}",
+                    cache_stats["evictions"],
+                ]
+            )
+        memory_stats = stats["memory"]
+        output_value_table.append(
+            [
+                "memory",
+                memory_stats["entries"],
+                format_bytes(memory_stats["bytes"]),
+                memory_stats["evictions"],
+            ]
+        )
+
+        # display to discord
+        output = table2ascii(
+            header=["Cache", "Entries", "Size", "Evictions"],
+            body=output_value_table,
+            style=PresetStyle.thin_box,
+        )
+        embed = discord.Embed(
+            title="🗄️ Cache stats",
+            description=f"```\n{output}\n```",
+            color=COLOR_PURPLE,
+        )
+        embed.set_footer(
+            text=f"Expired entries removed: {stats['api_cache']['expired_removed']} | "
+            f"Sweeps: {stats['sweeps']}"
+        )
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(CacheCommands(bot))
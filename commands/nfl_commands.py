@@ -1,18 +1,19 @@
-import os
 import discord
 from discord.ext import commands
 from loguru import logger
 from table2ascii import table2ascii, PresetStyle
 from utils.color import COLOR_PURPLE
-from utils.nfl_schedule import (
-    get_next_scheduled_games_by_team_id,
-    get_gameweek_by_offset,
-)
 from utils.date import convert_date, convert_short_date
+from utils.nfl_schedule import get_gameweek_window
+from utils.render_cache import RenderCache
+from utils.resilience import describe_api_error
 
-nfl_matches_params = {"league": "NFL", "season": os.getenv("CURRENT_YEAR")}
 nfl_api_matches_error = "Failed to get matches"
 
+# Discord limits per message
+DISCORD_MAX_EMBEDS = 10
+DISCORD_MAX_EMBED_CHARACTERS = 6000
+
 
 class NFLCommands(commands.Cog, name="NFL Commands"):
 
@@ -21,6 +22,9 @@ class NFLCommands(commands.Cog, name="NFL Commands"):
         self.data_manager = bot.data_manager
         self.nfl_api_manager = bot.nfl_api_manager
 
+        # rendered tables, re-rendered only when the source payload is refreshed
+        self.render_cache = RenderCache()
+
     @commands.group(name="nfl", invoke_without_command=True)
     async def nfl(self, ctx):
         # highlight commands
@@ -33,7 +37,9 @@ class NFLCommands(commands.Cog, name="NFL Commands"):
             embed.add_field(
                 name="Commands:",
                 value="`!nfl gameweek <previous|current|next>` - Get gameweek schedule\n"
-                "`!nfl schedule <team_name>` - Get team upcoming schedule\n",
+                "`!nfl schedule <team_name>` - Get team upcoming schedule\n"
+                "`!nfl live [stop]` - Follow in-progress games in this channel\n"
+                "`!nfl quota` - Get remaining daily API calls\n",
                 inline=False,
             )
             embed.add_field(
@@ -52,17 +58,31 @@ class NFLCommands(commands.Cog, name="NFL Commands"):
     async def get_gameweek(self, ctx, period: str = "current"):
         # get latest scores from NFL API
         try:
-            response = await self.bot.nfl_api_manager.get_nfl_all_matches()
-        except:
-            await ctx.send(nfl_api_matches_error)
+            season = await self.bot.nfl_api_manager.get_nfl_season()
+        except Exception as e:
+            await ctx.send(f"{nfl_api_matches_error}: {describe_api_error(e)}")
             return
 
         # get gameweek selection
         period_mapping = {"current": 0, "previous": -1, "next": 1}
         offset = period_mapping.get(period.lower(), 0)
+        target_thursday, target_tuesday = get_gameweek_window(offset)
+
+        description = self.render_cache.get_or_render(
+            "gameweek",
+            (target_thursday,),
+            self.nfl_api_manager.get_matches_version(),
+            lambda: self._render_gameweek(
+                season.get_games_between(target_thursday, target_tuesday)
+            ),
+        )
+        embed = discord.Embed(
+            title=f"🏈 {period.capitalize()} gameweek:",
+            description=description,
+        )
+        await ctx.send(embed=embed)
 
-        games = get_gameweek_by_offset(response["data"], offset)
-
+    def _render_gameweek(self, games):
         # get particular field of each game
         output_value_table = []
         for game in games:
@@ -94,11 +114,7 @@ class NFLCommands(commands.Cog, name="NFL Commands"):
             body=output_value_table,
             style=PresetStyle.thin_box,
         )
-        embed = discord.Embed(
-            title=f"🏈 {period.capitalize()} gameweek:",
-            description=f"```\n{output}\n```",
-        )
-        await ctx.send(embed=embed)
+        return f"```\n{output}\n```"
 
     @nfl.command(
         name="schedule", help="Get team upcoming schedule", usage="<team_name>"
@@ -111,13 +127,34 @@ class NFLCommands(commands.Cog, name="NFL Commands"):
 
         # call nfl api
         try:
-            response = await self.bot.nfl_api_manager.get_nfl_all_matches()
+            season = await self.bot.nfl_api_manager.get_nfl_season()
         except Exception as e:
-            await ctx.send(f"Failed to get matches: {e}")
+            await ctx.send(f"{nfl_api_matches_error}: {describe_api_error(e)}")
             return
 
-        games = get_next_scheduled_games_by_team_id(response["data"], team_id)
+        description = self.render_cache.get_or_render(
+            "schedule",
+            (team_id,),
+            self.nfl_api_manager.get_matches_version(),
+            lambda: self._render_team_schedule(
+                season.get_next_scheduled_games_by_team_id(team_id)
+            ),
+        )
+
+        # get total drama character
+        char_key = self.data_manager.get_character_key_by_team_key(team_name_lower)
+        char_name = self.data_manager.get_character_data_by_character_key(char_key)[
+            "name"
+        ]
+
+        # display to discord
+        embed = discord.Embed(
+            title=f"🏈 Upcoming matches for {char_name}'s {team_name.upper()}",
+            description=description,
+        )
+        await ctx.send(embed=embed)
 
+    def _render_team_schedule(self, games):
         output_value_table = []
         for game in games:
             output_value_table.append(
@@ -128,23 +165,12 @@ class NFLCommands(commands.Cog, name="NFL Commands"):
                 ]
             )
 
-        # get total drama character
-        char_key = self.data_manager.get_character_key_by_team_key(team_name_lower)
-        char_name = self.data_manager.get_character_data_by_character_key(char_key)[
-            "name"
-        ]
-
-        # display to discord
         output = table2ascii(
             header=["Date", "Home Team", "Away Team"],
             body=output_value_table,
             style=PresetStyle.thin_box,
         )
-        embed = discord.Embed(
-            title=f"🏈 Upcoming matches for {char_name}'s {team_name.upper()}",
-            description=f"```\n{output}\n```",
-        )
-        await ctx.send(embed=embed)
+        return f"```\n{output}\n```"
 
     @nfl.command(
         name="upcoming",
@@ -153,13 +179,28 @@ class NFLCommands(commands.Cog, name="NFL Commands"):
     async def get_upcoming_week_games(self, ctx):
         """Get latest scores from previous week"""
         try:
-            response = await self.bot.nfl_api_manager.get_nfl_all_matches()
-        except:
-            await ctx.send(nfl_api_matches_error)
+            season = await self.bot.nfl_api_manager.get_nfl_season()
+        except Exception as e:
+            await ctx.send(f"{nfl_api_matches_error}: {describe_api_error(e)}")
             return
 
-        games = get_gameweek_by_offset(response["data"], offset=1)
+        target_thursday, target_tuesday = get_gameweek_window(offset=1)
+
+        description = self.render_cache.get_or_render(
+            "upcoming",
+            (target_thursday,),
+            self.nfl_api_manager.get_matches_version(),
+            lambda: self._render_upcoming_week_games(
+                season.get_games_between(target_thursday, target_tuesday)
+            ),
+        )
+        embed = discord.Embed(
+            title=f"🏈 Upcoming matches for this week:",
+            description=description,
+        )
+        await ctx.send(embed=embed)
 
+    def _render_upcoming_week_games(self, games):
         output_value_table = []
         for game in games:
             output_value_table.append(
@@ -176,11 +217,7 @@ class NFLCommands(commands.Cog, name="NFL Commands"):
             body=output_value_table,
             style=PresetStyle.thin_box,
         )
-        embed = discord.Embed(
-            title=f"🏈 Upcoming matches for this week:",
-            description=f"```\n{output}\n```",
-        )
-        await ctx.send(embed=embed)
+        return f"```\n{output}\n```"
 
     @nfl.command(
         name="standings",
@@ -204,88 +241,213 @@ class NFLCommands(commands.Cog, name="NFL Commands"):
                 elif arg_lower in valid_divisions:
                     selected_division = [arg_lower.capitalize()]
 
-        # API Call to get standings
-        total_standings = []
-        try:
-            if "NFC" in selected_conference:
-                nfc_standings = await self.nfl_api_manager.get_nfl_standings("nfc")
-                total_standings += nfc_standings["data"][0]["data"]
-            if "AFC" in selected_conference:
-                afc_standings = await self.nfl_api_manager.get_nfl_standings("afc")
-                total_standings += afc_standings["data"][0]["data"]
-        except Exception as e:
-            logger.error(f"Error fetching standings: {e}")
-            await ctx.send(nfl_api_matches_error)
+        # API Calls to get standings, conferences are fetched concurrently
+        standings, errors = await self.nfl_api_manager.fan_out(
+            {
+                conference: (
+                    lambda conference=conference: self.nfl_api_manager.get_nfl_standings(
+                        conference.lower()
+                    )
+                )
+                for conference in selected_conference
+            }
+        )
+        standings = {
+            conference: response
+            for conference, response in standings.items()
+            if response is not None
+        }
+        if not standings:
+            reasons = sorted({describe_api_error(error) for error in errors.values()})
+            if reasons:
+                await ctx.send(f"Failed to get standings: {', '.join(reasons)}")
+            else:
+                await ctx.send(nfl_api_matches_error)
             return
 
-        # get team records via dictionary (team_id as key)
-        team_records = {}
-        for team_standings in total_standings:
-            team_id = team_standings["team"]["id"]
-            team_record = ""
-            for statistic in team_standings["statistics"]:
-                if statistic["displayName"] == "Division Record":
-                    team_record = statistic["value"]
-            team_records[team_id] = team_record
-
         # separately display teams by conference and division
+        team_records = None
+        embeds = []
         for conference in selected_conference:
+            if conference not in standings:
+                continue
+            version = self.nfl_api_manager.get_standings_version(conference.lower())
             for division in selected_division:
-
-                # filtered teams based on conference and division
-                filtered_teams = (
-                    self.data_manager.get_teams_key_by_conference_and_division(
-                        conference, division
-                    )
+                description = self.render_cache.get(
+                    "standings", (conference, division), version
                 )
+                if description is None:
+                    if team_records is None:
+                        team_records = self._get_team_records(standings.values())
+                    description = self._render_division_standings(
+                        conference, division, team_records
+                    )
+                    self.render_cache.set(
+                        "standings", (conference, division), version, description
+                    )
 
-                # get team data with records
-                filter_teams_data = [
-                    [team["abbreviation"], team_records[team["id"]]]
-                    for team in filtered_teams
-                ]
-                filter_teams_data.sort(key=lambda x: (x[1], x[0]))
-
-                # display in discord-friendly table
                 header = f"**{conference.upper()} {division.capitalize()} Division**\n"
-                table_output = table2ascii(
-                    header=["Team", "Record"],
-                    body=filter_teams_data,
-                    style=PresetStyle.thin_box,
-                )
+                embeds.append(discord.Embed(title=header, description=description))
+
+        # one message with every division, noting conferences that failed
+        content = None
+        missing_conferences = [
+            conference
+            for conference in selected_conference
+            if conference not in standings
+        ]
+        if missing_conferences:
+            content = f"⚠️ Failed to get {', '.join(missing_conferences)} standings"
+        await self._send_embeds(ctx, embeds, content)
+
+    async def _send_embeds(self, ctx, embeds, content=None):
+        """Send embeds in as few messages as Discord limits allow"""
+        batch = []
+        batch_length = 0
+        for embed in embeds:
+            if batch and (
+                len(batch) == DISCORD_MAX_EMBEDS
+                or batch_length + len(embed) > DISCORD_MAX_EMBED_CHARACTERS
+            ):
+                await ctx.send(content=content, embeds=batch)
+                content = None
+                batch = []
+                batch_length = 0
+            batch.append(embed)
+            batch_length += len(embed)
+        if batch or content:
+            await ctx.send(content=content, embeds=batch)
+
+    def _get_team_records(self, standings_responses):
+        """Division record by team id of /standings responses"""
+        team_records = {}
+        for standings in standings_responses:
+            for team_standings in standings["data"][0]["data"]:
+                team_id = team_standings["team"]["id"]
+                if self.data_manager.get_team_data_by_team_id(team_id) is None:
+                    logger.warning(f"Standings contain unknown team id: {team_id}")
+                    continue
+                team_record = ""
+                for statistic in team_standings["statistics"]:
+                    if statistic["displayName"] == "Division Record":
+                        team_record = statistic["value"]
+                team_records[team_id] = team_record
+        return team_records
+
+    def _render_division_standings(self, conference, division, team_records):
+        # filtered teams based on conference and division
+        filtered_teams = self.data_manager.get_teams_key_by_conference_and_division(
+            conference, division
+        )
 
-                embed = discord.Embed(
-                    title=header,
-                    description=f"```\n{table_output}\n```",
-                )
-                await ctx.send(embed=embed)
+        # get team data with records
+        filter_teams_data = [
+            [team["abbreviation"], team_records.get(team["id"], "-")]
+            for team in filtered_teams
+        ]
+        filter_teams_data.sort(key=lambda x: (x[1], x[0]))
+
+        # display in discord-friendly table
+        table_output = table2ascii(
+            header=["Team", "Record"],
+            body=filter_teams_data,
+            style=PresetStyle.thin_box,
+        )
+        return f"```\n{table_output}\n```"
 
-    @nfl.command(name="injuries", help="Get injuries for a team", usage="<team_name>")
+    @nfl.command(
+        name="injuries",
+        help="Get injuries for one or more teams (comma separated)",
+        usage="<team_name>[, <team_name>...]",
+    )
     async def get_nfl_team_injuries(self, ctx, *, team_name):
-        try:
-            team_info = self.data_manager.get_team_data_by_team_key(team_name.lower())
-            injuries = await self.nfl_api_manager.get_nfl_team_injuries(
-                team_info["nflApiId"]
+        # get team data of each requested team
+        team_infos = {}
+        for name in team_name.split(","):
+            name = name.strip().lower()
+            team_info = self.data_manager.get_team_data_by_team_key(name)
+            if team_info is None:
+                await ctx.send(f"❌ Unknown team: {name}")
+                return
+            team_infos[name] = team_info
+
+        # API Calls to get injuries, teams are fetched concurrently
+        injuries_by_team, errors = await self.nfl_api_manager.fan_out(
+            {
+                name: (
+                    lambda team_info=team_info: self.nfl_api_manager.get_nfl_team_injuries(
+                        team_info["nflApiId"]
+                    )
+                )
+                for name, team_info in team_infos.items()
+            }
+        )
+
+        embeds = []
+        failed_teams = []
+        for name, team_info in team_infos.items():
+            injuries = injuries_by_team.get(name)
+            if injuries is None:
+                failed_teams.append(name)
+                continue
+
+            output_value_table = []
+            for injury in injuries["injuries"]:
+                output_value_table.append([injury["shortComment"]])
+
+            # display to discord
+            output = table2ascii(
+                header=["Players Injuries"],
+                body=output_value_table,
+                style=PresetStyle.thin_box,
             )
-        except Exception as e:
-            logger.error(f"Failed to get injuries for {team_name}: {e}")
-            await ctx.send(
-                f"❌ Failed to get injuries for {team_name}. Please try again later."
+            embeds.append(
+                discord.Embed(
+                    title=f"🏈 Injuries for {team_info['name']}",
+                    description=f"```\n{output}\n```",
+                )
             )
+
+        content = None
+        if failed_teams:
+            content = f"❌ Failed to get injuries for {', '.join(failed_teams)}. Please try again later."
+        await self._send_embeds(ctx, embeds, content)
+
+    @nfl.command(
+        name="live",
+        help="Follow in-progress games in this channel",
+        usage="[stop]",
+    )
+    async def follow_live_games(self, ctx, action: str = "start"):
+        live_poller = self.bot.live_poller
+        if action.lower() == "stop":
+            live_poller.unsubscribe(ctx.channel)
+            await ctx.send("⏹️ Stopped following live games in this channel.")
             return
 
+        live_poller.subscribe(ctx.channel)
+        await ctx.send(
+            "🏈 Following live games in this channel! Score changes and plays will be posted here."
+        )
+
+    @nfl.command(name="quota", help="Get remaining daily API calls")
+    async def get_api_quota(self, ctx):
+        budget_stats = self.nfl_api_manager.get_budget_stats()
+
         output_value_table = []
-        for injury in injuries["injuries"]:
-            output_value_table.append([injury["shortComment"]])
+        for api_name, stats in budget_stats.items():
+            output_value_table.append(
+                [api_name, stats["used"], stats["budget"], stats["remaining"]]
+            )
 
         # display to discord
         output = table2ascii(
-            header=["Players Injuries"],
+            header=["API", "Used", "Budget", "Remaining"],
             body=output_value_table,
             style=PresetStyle.thin_box,
         )
         embed = discord.Embed(
-            title=f"🏈 Injuries for {team_info['name']}",
+            title="🏈 Daily API quota",
             description=f"```\n{output}\n```",
         )
         await ctx.send(embed=embed)
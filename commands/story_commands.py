@@ -1,10 +1,21 @@
-import time
+import os
 import discord
 from discord.ext import commands
 from loguru import logger
 from utils.color import COLOR_PURPLE
-from utils.nfl_schedule import get_gameweek_by_offset
 from utils.date import convert_date
+from utils.resilience import describe_api_error
+from utils.story_pacer import StoryPacer
+
+# highlight API event result -> storyline.json game event category
+GAME_EVENT_CATEGORIES = {
+    "Touchdown": "touchdown",
+    "Field Goal": "field_goal",
+    "Interception": "interception",
+    "Missed FG": "missed_field_goal",
+    "Fumble": "fumble",
+    "Turnover on Downs": "turnover_on_downs",
+}
 
 
 class StoryCommands(commands.Cog, name="Story Commands"):
@@ -14,6 +25,15 @@ class StoryCommands(commands.Cog, name="Story Commands"):
         self.data_manager = bot.data_manager
         self.nfl_api_manager = bot.nfl_api_manager
 
+        # stories are delivered in the background so the bot stays responsive,
+        # lines are batched into one message per STORY_FLUSH_DELAY seconds of pauses
+        self.story_pacer = StoryPacer(
+            flush_delay=float(os.getenv("STORY_FLUSH_DELAY", "4"))
+        )
+
+    async def cog_unload(self):
+        self.story_pacer.stop_all()
+
     @commands.group(name="story", invoke_without_command=True)
     async def story(self, ctx):
         # highlight commands
@@ -25,7 +45,9 @@ class StoryCommands(commands.Cog, name="Story Commands"):
             )
             embed.add_field(
                 name="Commands:",
-                value="`!story gameweek <previous|current|next>` - Generate Story week\n",
+                value="`!story gameweek <previous|current|next>` - Generate Story week\n"
+                "`!story match <match_id>` - Generate Story for a match\n"
+                "`!story stop` - Stop the story running in this channel\n",
                 inline=False,
             )
             embed.add_field(
@@ -44,64 +66,68 @@ class StoryCommands(commands.Cog, name="Story Commands"):
     async def story_gameweek(self, ctx, period: str = "current"):
         # get latest scores from NFL API
         try:
-            response = await self.bot.nfl_api_manager.get_nfl_all_matches()
+            season = await self.bot.nfl_api_manager.get_nfl_season()
         except Exception as e:
-            await ctx.send(f"Failed to get matches: {e}")
+            await ctx.send(f"Failed to get matches: {describe_api_error(e)}")
             return
 
         # get gameweek selection
         period_mapping = {"current": 0, "previous": -1, "next": 1}
         offset = period_mapping.get(period.lower(), 0)
 
-        games = get_gameweek_by_offset(response["data"], offset)
+        games = season.get_gameweek(offset)
 
-        await ctx.send(f"Here's the storyline for {period.capitalize()} gameweek...\n")
+        lines = [(f"Here's the storyline for {period.capitalize()} gameweek...\n", 0)]
 
         # generate game story
         for game in games:
 
             game_id = game["id"]
 
-            home_team_key = game["homeTeam"]["name"].lower().replace(" ", "_")
-            home_team_info = self.data_manager.get_team_data_by_team_key(home_team_key)
-            home_team_char_key = self.data_manager.get_character_key_by_team_key(
-                home_team_key
-            )
-            home_team_char_info = self.data_manager.get_character_data_by_character_key(
-                home_team_char_key
+            home_record, away_record, unresolved_team_ids = (
+                self.data_manager.resolve_game_teams(game)
             )
+            if unresolved_team_ids:
+                logger.warning(
+                    f"Skipping match {game_id}, unknown team ids: {unresolved_team_ids}"
+                )
+                lines.append(
+                    (
+                        f"❓ Skipping {game['homeTeam']['name']} vs {game['awayTeam']['name']} [Match ID: {game_id}]: unknown team",
+                        0,
+                    )
+                )
+                continue
 
-            away_team_key = game["awayTeam"]["name"].lower().replace(" ", "_")
-            away_team_info = self.data_manager.get_team_data_by_team_key(away_team_key)
-            away_team_char_key = self.data_manager.get_character_key_by_team_key(
-                away_team_key
-            )
-            away_team_char_info = self.data_manager.get_character_data_by_character_key(
-                away_team_char_key
-            )
+            home_team_info = home_record["team"]
+            home_team_char_info = home_record["character"]
+            away_team_info = away_record["team"]
+            away_team_char_info = away_record["character"]
 
-            await ctx.send(
-                f"⚔️ **{home_team_char_info['name']}'s {game['homeTeam']['name']} vs {away_team_char_info['name']}'s {game['awayTeam']['name']}** [Match ID: {game_id}]"
+            lines.append(
+                (
+                    f"⚔️ **{home_team_char_info['name']}'s {game['homeTeam']['name']} vs {away_team_char_info['name']}'s {game['awayTeam']['name']}** [Match ID: {game_id}]",
+                    1,  # Simulate some delay for dramatic effect
+                )
             )
-            time.sleep(1)  # Simulate some delay for dramatic effect
 
             if game["state"]["description"] == "Finished":
                 final_score = game["state"]["score"]["current"]
                 home_score, away_score = final_score.split("-")
                 score_margin = abs(int(home_score) - int(away_score))
                 story = ""
-                placeholder_text = ""
+                placeholder_text = None
                 winner = []
                 loser = []
 
                 if score_margin > 0:
                     if score_margin >= 20:
-                        placeholder_text = (
-                            self.data_manager.get_storyline_random_big_win()
+                        placeholder_text = self.data_manager.get_random_template(
+                            "storylines", "big_win"
                         )
                     else:
-                        placeholder_text = (
-                            self.data_manager.get_storyline_random_small_win()
+                        placeholder_text = self.data_manager.get_random_template(
+                            "storylines", "small_win"
                         )
                     if int(home_score) > int(away_score):
                         winner = [
@@ -126,7 +152,9 @@ class StoryCommands(commands.Cog, name="Story Commands"):
                             home_score,
                         ]
                 else:
-                    placeholder_text = self.data_manager.get_storyline_random_tie()
+                    placeholder_text = self.data_manager.get_random_template(
+                        "storylines", "tie"
+                    )
                     winner = [
                         home_team_char_info["name"],
                         home_team_info["name"],
@@ -138,37 +166,40 @@ class StoryCommands(commands.Cog, name="Story Commands"):
                         away_score,
                     ]
 
-                story = placeholder_text.format(
-                    winner_character=winner[0],
-                    winner_team=winner[1],
-                    winner_score=winner[2],
-                    loser_character=loser[0],
-                    loser_team=loser[1],
-                    loser_score=loser[2],
-                )
-                await ctx.send(f"{story}")
+                if placeholder_text is not None:
+                    story = placeholder_text.render(
+                        winner_character=winner[0],
+                        winner_team=winner[1],
+                        winner_score=winner[2],
+                        loser_character=loser[0],
+                        loser_team=loser[1],
+                        loser_score=loser[2],
+                    )
+                    lines.append((f"{story}", 0))
             elif game["state"]["description"] == "Scheduled":
-                placeholder_text = self.data_manager.get_storyline_random_upcoming()
-                story = placeholder_text.format(
-                    team1_character=home_team_char_info["name"],
-                    team1=home_team_info["name"],
-                    team2_character=away_team_char_info["name"],
-                    team2=away_team_info["name"],
-                    game_time=convert_date(game["date"]),
+                placeholder_text = self.data_manager.get_random_template(
+                    "storylines", "upcoming"
                 )
-                await ctx.send(f"{story}")
+                if placeholder_text is not None:
+                    story = placeholder_text.render(
+                        team1_character=home_team_char_info["name"],
+                        team1=home_team_info["name"],
+                        team2_character=away_team_char_info["name"],
+                        team2=away_team_info["name"],
+                        game_time=convert_date(game["date"]),
+                    )
+                    lines.append((f"{story}", 0))
 
             separator = (
                 "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
             )
-            await ctx.send(separator)
-
-            time.sleep(2)  # Simulate some delay for dramatic effect
+            lines.append((separator, 2))  # Simulate some delay for dramatic effect
 
         # Final message after all games
-        await ctx.send(
-            f"And that's it for this gameweek. Stay tuned for the next one. 🏈"
+        lines.append(
+            (f"And that's it for this gameweek. Stay tuned for the next one. 🏈", 0)
         )
+        self.story_pacer.deliver(ctx.channel, lines)
 
     @story.command(
         name="match",
@@ -185,43 +216,45 @@ class StoryCommands(commands.Cog, name="Story Commands"):
         try:
             response = await self.bot.nfl_api_manager.get_nfl_specific_matches(match_id)
         except Exception as e:
-            await ctx.send(f"Failed to get match {match_id}: {e}")
+            await ctx.send(f"Failed to get match {match_id}: {describe_api_error(e)}")
             return
 
         game_response = response[0]
 
-        home_team_key = game_response["homeTeam"]["name"].lower().replace(" ", "_")
-        home_team_info = self.data_manager.get_team_data_by_team_key(home_team_key)
-        home_team_id = game_response["homeTeam"]["id"]
-        home_team_char_key = self.data_manager.get_character_key_by_team_key(
-            home_team_key
-        )
-        home_team_char_info = self.data_manager.get_character_data_by_character_key(
-            home_team_char_key
+        home_record, away_record, unresolved_team_ids = (
+            self.data_manager.resolve_game_teams(game_response)
         )
+        if unresolved_team_ids:
+            logger.warning(
+                f"Cannot tell story of match {match_id}, unknown team ids: {unresolved_team_ids}"
+            )
+            await ctx.send(f"❌ Match {match_id} has a team I don't know about.")
+            return
+
+        home_team_info = home_record["team"]
+        home_team_id = game_response["homeTeam"]["id"]
+        home_team_char_info = home_record["character"]
 
-        away_team_key = game_response["awayTeam"]["name"].lower().replace(" ", "_")
-        away_team_info = self.data_manager.get_team_data_by_team_key(away_team_key)
+        away_team_info = away_record["team"]
         away_team_id = game_response["awayTeam"]["id"]
-        away_team_char_key = self.data_manager.get_character_key_by_team_key(
-            away_team_key
-        )
-        away_team_char_info = self.data_manager.get_character_data_by_character_key(
-            away_team_char_key
-        )
+        away_team_char_info = away_record["character"]
 
-        await ctx.send(
-            f"⚔️ **{home_team_char_info['name']}'s {game_response['homeTeam']['name']} vs {away_team_char_info['name']}'s {game_response['awayTeam']['name']}** [Match ID: {match_id}]"
-        )
-        time.sleep(2)
+        lines = [
+            (
+                f"⚔️ **{home_team_char_info['name']}'s {game_response['homeTeam']['name']} vs {away_team_char_info['name']}'s {game_response['awayTeam']['name']}** [Match ID: {match_id}]",
+                2,
+            )
+        ]
 
         # stadium & forecast
         venue = game_response["venue"]
         forecast = game_response["forecast"]
-        await ctx.send(
-            f"🎤 Welcome to {venue['city']} as the forecast is {forecast['status']} at the temperature of {forecast['temperature']}"
+        lines.append(
+            (
+                f"🎤 Welcome to {venue['city']} as the forecast is {forecast['status']} at the temperature of {forecast['temperature']}",
+                2,
+            )
         )
-        time.sleep(2)
 
         home_score = 0
         away_score = 0
@@ -258,74 +291,68 @@ class StoryCommands(commands.Cog, name="Story Commands"):
 
             # start of the game
             if START == True:
-                await ctx.send(
-                    f"**{game_period_text[period_index]}**: {offensive_char['name']}'s {offensive_team['nickname']} starts with the ball!"
+                lines.append(
+                    (
+                        f"**{game_period_text[period_index]}**: {offensive_char['name']}'s {offensive_team['nickname']} starts with the ball!",
+                        2,
+                    )
                 )
-                time.sleep(2)
                 START = False
 
             # if play finished in the next period
             if end["period"] != game_period_text[period_index]:
-                await ctx.send(
-                    f"💣 And that's the end of the {game_period_text[period_index]}"
+                lines.append(
+                    (
+                        f"💣 And that's the end of the {game_period_text[period_index]}",
+                        1,
+                    )
                 )
-                time.sleep(1)
                 period_score = game_state["score"][game_period_key[period_index]]
                 home_period_score, away_period_score = [
                     int(x.strip()) for x in period_score.split("-")
                 ]
                 home_score += home_period_score
                 away_score += away_period_score
-                await ctx.send(
-                    f"**At the end of {game_period_text[period_index]}:** it's {home_team_char_info['name']} {home_score} - {away_score} {away_team_char_info['name']}"
+                lines.append(
+                    (
+                        f"**At the end of {game_period_text[period_index]}:** it's {home_team_char_info['name']} {home_score} - {away_score} {away_team_char_info['name']}",
+                        1,
+                    )
                 )
-                time.sleep(1)
                 period_index += 1
 
             placeholder_text = None
-            if result == "Touchdown":
-                placeholder_text = self.data_manager.get_game_event_random_touchdown()
-            elif result == "Field Goal":
-                placeholder_text = self.data_manager.get_game_event_random_field_goal()
-            elif result == "Interception":
-                placeholder_text = (
-                    self.data_manager.get_game_event_random_interception()
-                )
-            elif result == "Missed FG":
-                placeholder_text = (
-                    self.data_manager.get_game_event_random_missed_field_goal()
+            if result in GAME_EVENT_CATEGORIES:
+                placeholder_text = self.data_manager.get_random_template(
+                    "game_events", GAME_EVENT_CATEGORIES[result]
                 )
-            elif result == "Fumble":
-                placeholder_text = self.data_manager.get_game_event_random_fumble()
-            elif result == "Turnover on Downs":
-                placeholder_text = self.data_manager.get_game_event_random_downs()
 
             if placeholder_text is not None:
-                story = placeholder_text.format(
+                story = placeholder_text.render(
                     offensive_character=offensive_char["name"],
                     offensive_team=offensive_team["nickname"],
-                    defensiv_character=defensive_char["name"],
+                    defensive_character=defensive_char["name"],
                     defensive_team=defensive_team["nickname"],
                 )
-                await ctx.send(f"{story}")
-                time.sleep(2)
+                lines.append((f"{story}", 2))
 
             # Game finished at the end of the current period or next period
             if end["clock"] is None or end["period"] != game_period_text[period_index]:
-                await ctx.send(
-                    f"💣 That's the end of the {game_period_text[period_index]}"
+                lines.append(
+                    (f"💣 That's the end of the {game_period_text[period_index]}", 1)
                 )
-                time.sleep(1)
                 period_score = game_state["score"][game_period_key[period_index]]
                 home_period_score, away_period_score = [
                     int(x.strip()) for x in period_score.split("-")
                 ]
                 home_score += home_period_score
                 away_score += away_period_score
-                await ctx.send(
-                    f"**At the end of {game_period_text[period_index]}:** it's {home_team_char_info['name']} {home_score} - {away_score} {away_team_char_info['name']}"
+                lines.append(
+                    (
+                        f"**At the end of {game_period_text[period_index]}:** it's {home_team_char_info['name']} {home_score} - {away_score} {away_team_char_info['name']}",
+                        1,
+                    )
                 )
-                time.sleep(1)
                 period_index += 1
 
         # Show the winner of the game
@@ -345,13 +372,17 @@ class StoryCommands(commands.Cog, name="Story Commands"):
             loser_score = home_score
 
         if winner is not None and loser is not None:
-            await ctx.send(
-                f"🏆 **{winner}** wins against **{loser}** with the score of {winner_score} - {loser_score}!"
+            lines.append(
+                (
+                    f"🏆 **{winner}** wins against **{loser}** with the score of {winner_score} - {loser_score}!",
+                    0,
+                )
             )
         else:
-            await ctx.send(
-                f"🏆 It's a tie! Both teams scored {home_score} - {away_score}!"
+            lines.append(
+                (f"🏆 It's a tie! Both teams scored {home_score} - {away_score}!", 0)
             )
+        self.story_pacer.deliver(ctx.channel, lines)
 
         # game_state = game_response["state"]
         # game_period_key = ["firstPeriod", "secondPeriod", "thirdPeriod", "fourthPeriod"]
@@ -362,6 +393,16 @@ class StoryCommands(commands.Cog, name="Story Commands"):
         #     away_score += away_period_score
         #     await ctx.send(f"**{period}** {home_score} - {away_score}")
 
+    @story.command(
+        name="stop",
+        help="Stop the story running in this channel",
+    )
+    async def story_stop(self, ctx):
+        if self.story_pacer.stop(ctx.channel.id):
+            await ctx.send("⏹️ Story stopped.")
+        else:
+            await ctx.send("There is no story running in this channel.")
+
 
 async def setup(bot):
     await bot.add_cog(StoryCommands(bot))
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from utils.api_cache import APICache
+from utils.atomic_file import atomic_write
+from utils.match_archive import ARCHIVE_FILE, RECORD_HEADER, RECORD_MAGIC, MatchArchive
+
+# every writer hammers the same key: PROCESSES processes plus the test
+# process, each running TASKS tasks of ROUNDS writes and reads
+PROCESSES = 3
+TASKS = 4
+ROUNDS = 25
+
+URL = "https://example.com/matches"
+MATCH_ID = 1
+
+
+def make_payload(writer, round_number):
+    # large enough that a torn write would be noticed
+    return {"writer": writer, "round": round_number, "filler": [writer] * 2000}
+
+
+def is_payload(data):
+    return (
+        isinstance(data, dict)
+        and set(data) == {"writer", "round", "filler"}
+        and data["filler"] == [data["writer"]] * 2000
+    )
+
+
+def hammer_file(path, writer):
+    """Rewrite path, every read must see a complete payload"""
+    bad_reads = 0
+    for i in range(ROUNDS):
+        atomic_write(path, json.dumps(make_payload(writer, i)).encode("utf-8"))
+        with open(path, "rb") as f:
+            try:
+                bad_reads += not is_payload(json.loads(f.read()))
+            except ValueError:
+                bad_reads += 1
+    return bad_reads
+
+
+def hammer_cache(cache, writer):
+    """Rewrite one cache entry, every disk read must decode"""
+    bad_reads = 0
+    for i in range(ROUNDS):
+        assert cache.set(URL, make_payload(writer, i))
+        cache.memory.clear()
+        bad_reads += not is_payload(cache.get_stale(URL))
+    return bad_reads + cache.disk_corrupt
+
+
+def hammer_archive(archive, writer):
+    """Append records of one match, every read must return a whole record"""
+    bad_reads = 0
+    for i in range(ROUNDS):
+        archive.append(MATCH_ID, json.dumps(make_payload(writer, i)).encode("utf-8"))
+        try:
+            bad_reads += not is_payload(json.loads(archive.get_bytes(MATCH_ID)))
+        except ValueError:
+            bad_reads += 1
+    return bad_reads
+
+
+def run_tasks(kind, path, process_number):
+    """Run TASKS concurrent writers sharing one cache/archive, returning bad reads"""
+
+    async def main():
+        if kind == "file":
+            target = path
+            hammer = hammer_file
+        elif kind == "cache":
+            target = APICache(path, ttl_policy=None, file_locking=True)
+            hammer = hammer_cache
+        else:
+            target = MatchArchive(path, file_locking=True)
+            hammer = hammer_archive
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(hammer, target, process_number * TASKS + task)
+                for task in range(TASKS)
+            )
+        )
+        if kind == "archive":
+            target.close()
+        return sum(results)
+
+    return asyncio.run(main())
+
+
+def run_everywhere(kind, path):
+    """Hammer path from PROCESSES processes and this one at the same time"""
+    # spawn, forking a process running threads is unsafe
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(PROCESSES, mp_context=context) as pool:
+        futures = [
+            pool.submit(run_tasks, kind, path, process_number)
+            for process_number in range(1, PROCESSES + 1)
+        ]
+        bad_reads = run_tasks(kind, path, 0)
+        return bad_reads + sum(future.result() for future in futures)
+
+
+def leftover_temp_files(directory):
+    return [name for name in os.listdir(directory) if name.endswith(".tmp")]
+
+
+def count_records(archive_path):
+    """Number of whole records in an archive, None if a record is torn"""
+    with open(archive_path, "rb") as f:
+        data = f.read()
+    offset = 0
+    count = 0
+    while offset < len(data):
+        magic, crc, _, length = RECORD_HEADER.unpack_from(data, offset)
+        payload = data[
+            offset + RECORD_HEADER.size : offset + RECORD_HEADER.size + length
+        ]
+        if magic != RECORD_MAGIC or zlib.crc32(payload) != crc:
+            return None
+        offset += RECORD_HEADER.size + length
+        count += 1
+    return count
+
+
+def test_atomic_write_under_contention(tmp_path):
+    path = str(tmp_path / "entry.json")
+    assert run_everywhere("file", path) == 0
+    with open(path, "rb") as f:
+        assert is_payload(json.loads(f.read()))
+    assert leftover_temp_files(tmp_path) == []
+
+
+def test_cache_set_under_contention(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    assert run_everywhere("cache", cache_dir) == 0
+    assert is_payload(APICache(cache_dir, ttl_policy=None).get(URL))
+    assert leftover_temp_files(cache_dir) == []
+
+
+def test_archive_append_under_contention(tmp_path):
+    archive_dir = str(tmp_path / "match_cache")
+    assert run_everywhere("archive", archive_dir) == 0
+
+    # no append was lost or interleaved with another one
+    writes = (PROCESSES + 1) * TASKS * ROUNDS
+    archive_path = os.path.join(archive_dir, ARCHIVE_FILE)
+    assert count_records(archive_path) == writes
+
+    archive = MatchArchive(archive_dir)
+    assert archive.archive_size == os.path.getsize(archive_path)
+    assert is_payload(json.loads(archive.get_bytes(MATCH_ID)))
+    assert archive.get_stats()["entries"] == 1
+    archive.close()
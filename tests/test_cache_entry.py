@@ -0,0 +1,73 @@
+import json
+import time
+import zlib
+from datetime import timedelta
+from utils.api_cache import APICache
+from utils.cache_entry import (
+    ENTRY_FORMAT_VERSION,
+    ENTRY_HEADER,
+    ENTRY_HEADER_V1,
+    ENTRY_MAGIC,
+    decode_entry,
+    decode_header,
+    encode_entry,
+)
+
+URL = "https://nfl-football-api.p.rapidapi.com/matches"
+DATA = {"data": [{"id": 1, "state": {"description": "Finished"}}]}
+
+
+def encode_v1_entry(data, ttl, created_at=None):
+    """Entry bytes as written before validators were stored"""
+    payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    header = ENTRY_HEADER_V1.pack(
+        ENTRY_MAGIC,
+        1,
+        created_at or time.time(),
+        ttl.total_seconds(),
+        len(payload),
+        zlib.crc32(payload),
+    )
+    return header + payload
+
+
+def test_entry_round_trip():
+    entry = encode_entry(DATA, timedelta(hours=1), validators={"etag": '"v1"'})
+    header, data = decode_entry(entry)
+    assert data == DATA
+    assert header.validators_length > 0
+    assert ENTRY_FORMAT_VERSION == 2
+
+
+def test_version_1_entries_are_still_read():
+    entry = encode_v1_entry(DATA, timedelta(hours=1))
+    header = decode_header(entry[: ENTRY_HEADER.size], len(entry))
+    assert header.header_size == ENTRY_HEADER_V1.size
+    assert header.validators_length == 0
+    assert header.is_fresh()
+    assert decode_entry(entry)[1] == DATA
+
+
+def test_short_version_1_entry_is_read():
+    # shorter than a version 2 header, callers read at most that many bytes
+    entry = encode_v1_entry(1, timedelta(hours=1))
+    assert decode_header(entry, len(entry)).payload_length == 1
+    assert decode_entry(entry)[1] == 1
+
+
+def test_api_cache_serves_and_renews_version_1_entries(tmp_path):
+    cache = APICache(str(tmp_path), ttl_policy=None)
+    cache_path = tmp_path / cache._get_cache_key(URL)
+    cache_path.write_bytes(
+        encode_v1_entry(DATA, timedelta(hours=1), created_at=time.time() - 7200)
+    )
+
+    # expired, but kept as stale fallback and revalidated without validators
+    assert cache.get(URL) is None
+    assert cache.get_stale(URL) == DATA
+    assert cache.get_validators(URL) == {}
+
+    data, payload_length = cache.renew(URL)
+    assert data == DATA
+    assert cache.get(URL) == DATA
+    assert cache_path.stat().st_size == ENTRY_HEADER_V1.size + payload_length
@@ -0,0 +1,94 @@
+import os
+import pickle
+from datetime import datetime, timedelta
+from utils.api_cache import APICache
+from utils.cache_entry import encode_entry
+from utils.nfl_api import NFLAPIManager
+from utils.request_key import get_legacy_cache_key
+
+MATCHES_URL = "https://nfl-football-api.p.rapidapi.com/matches"
+PARAMS = {"leagueName": "NFL", "year": "2025"}
+SEASON = {"data": [{"id": 1, "state": {"description": "Finished"}}]}
+
+
+def write_legacy(cache_dir, url, params, raw_data):
+    path = os.path.join(cache_dir, get_legacy_cache_key(url, params))
+    with open(path, "wb") as f:
+        f.write(raw_data)
+    return path
+
+
+def pickled_entry(data, timestamp):
+    # as written by the APICache before the entry format
+    return pickle.dumps({"timestamp": timestamp, "data": data})
+
+
+def test_pickled_entry_is_rewritten_under_the_canonical_key(tmp_path):
+    cache = APICache(str(tmp_path), expiration_hours=24, ttl_policy=None)
+    timestamp = datetime.now().replace(microsecond=0) - timedelta(hours=1)
+    legacy_path = write_legacy(
+        tmp_path, MATCHES_URL, PARAMS, pickled_entry(SEASON, timestamp)
+    )
+
+    assert cache.migrate_legacy_keys([(MATCHES_URL, PARAMS)]) == 1
+    assert not os.path.exists(legacy_path)
+
+    # a fresh cache instance reads it from disk, keeping its original age
+    cache = APICache(str(tmp_path), expiration_hours=24, ttl_policy=None)
+    data, expires_at = cache.get_entry(MATCHES_URL, PARAMS)
+    assert data == SEASON
+    assert expires_at == timestamp + timedelta(hours=24)
+    assert cache.disk_corrupt == 0
+
+
+def test_expired_pickled_entry_stays_expired(tmp_path):
+    cache = APICache(str(tmp_path), expiration_hours=24, ttl_policy=None)
+    timestamp = datetime.now() - timedelta(days=2)
+    write_legacy(tmp_path, MATCHES_URL, PARAMS, pickled_entry(SEASON, timestamp))
+
+    cache.migrate_legacy_keys([(MATCHES_URL, PARAMS)])
+    assert cache.get(MATCHES_URL, PARAMS) is None
+    assert cache.get_stale(MATCHES_URL, PARAMS) == SEASON
+
+
+def test_entry_format_file_is_moved_as_is(tmp_path):
+    cache = APICache(str(tmp_path), ttl_policy=None)
+    raw_data = encode_entry(SEASON, timedelta(hours=1))
+    write_legacy(tmp_path, MATCHES_URL, PARAMS, raw_data)
+
+    assert cache.migrate_legacy_keys([(MATCHES_URL, PARAMS)]) == 1
+    with open(tmp_path / cache._get_cache_key(MATCHES_URL, PARAMS), "rb") as f:
+        assert f.read() == raw_data
+
+
+def test_unreadable_legacy_entry_is_dropped(tmp_path):
+    cache = APICache(str(tmp_path), ttl_policy=None)
+    legacy_path = write_legacy(tmp_path, MATCHES_URL, PARAMS, b"not a pickle")
+
+    assert cache.migrate_legacy_keys([(MATCHES_URL, PARAMS)]) == 0
+    assert not os.path.exists(legacy_path)
+    assert cache.get_stale(MATCHES_URL, PARAMS) is None
+
+
+def test_manager_migrates_a_pickled_cache_directory(tmp_path):
+    cache_dir = tmp_path / "cache"
+    manager = NFLAPIManager(
+        cache_dir=str(cache_dir),
+        match_cache_dir=str(tmp_path / "match_cache"),
+        budget_ledger_path=str(tmp_path / "api_budget.json"),
+        season_store_path=str(tmp_path / "season_store.json"),
+        incremental_sync=False,
+    )
+    matches_url, matches_params = manager._get_matches_request()
+    match_url = f"{matches_url}/1"
+    timestamp = datetime.now()
+    write_legacy(
+        cache_dir, matches_url, matches_params, pickled_entry(SEASON, timestamp)
+    )
+    write_legacy(cache_dir, match_url, None, pickled_entry(SEASON["data"], timestamp))
+
+    # the match id is only known from the migrated season entry
+    assert manager.migrate_cache_keys([]) == 2
+    assert manager.apiCache.get_stale(matches_url, matches_params) == SEASON
+    assert manager.apiCache.get_stale(match_url) == SEASON["data"]
+    assert manager.migrate_cache_keys([]) == 0
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import os
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from utils.cache_entry import ENTRY_LIFETIME, ENTRY_LIFETIME_OFFSET, decode_header
+from utils.nfl_api import NFLAPIManager
+
+
+class ValidatorServer:
+    """Local API answering 304 when the request's validators match the current version"""
+
+    def __init__(self):
+        self.version = 1
+        self.requests = []
+
+    @property
+    def etag(self):
+        return f'"v{self.version}"'
+
+    def payload(self):
+        return [{"id": 1, "version": self.version, "events": ["play"] * 100}]
+
+    async def handle(self, request):
+        self.requests.append(dict(request.headers))
+        headers = {"ETag": self.etag, "Last-Modified": "Sat, 18 Oct 2025 12:00:00 GMT"}
+        if request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304, headers=headers)
+        return web.json_response(self.payload(), headers=headers)
+
+
+def run_with_validator_server(tmp_path, scenario, **manager_kwargs):
+    """Run scenario(manager, validator_server, url)"""
+
+    async def main():
+        validator_server = ValidatorServer()
+        app = web.Application()
+        app.router.add_get("/matches/{match_id}", validator_server.handle)
+        async with TestServer(app) as server:
+            manager = NFLAPIManager(
+                cache_dir=str(tmp_path / "cache"),
+                match_cache_dir=str(tmp_path / "match_cache"),
+                budget_ledger_path=str(tmp_path / "api_budget.json"),
+                season_store_path=str(tmp_path / "season_store.json"),
+                incremental_sync=False,
+                **manager_kwargs,
+            )
+            await manager.start()
+            try:
+                url = str(server.make_url("/matches/1"))
+                await scenario(manager, validator_server, url)
+            finally:
+                await manager.close()
+
+    asyncio.run(main())
+
+
+def entry_path(manager, url):
+    return os.path.join(
+        manager.apiCache.cache_dir, manager.apiCache._get_cache_key(url)
+    )
+
+
+def expire(manager, url):
+    """Zero the created at and TTL of an entry so the next request revalidates it"""
+    with open(entry_path(manager, url), "r+b") as f:
+        f.seek(ENTRY_LIFETIME_OFFSET)
+        f.write(b"\0" * ENTRY_LIFETIME.size)
+    manager.apiCache.memory.clear()
+
+
+def read_entry(manager, url):
+    """(header, payload and validators bytes, inode) of an entry on disk"""
+    path = entry_path(manager, url)
+    with open(path, "rb") as f:
+        raw_data = f.read()
+    header = decode_header(raw_data, len(raw_data))
+    return header, raw_data[header.header_size :], os.stat(path).st_ino
+
+
+def used_calls(manager):
+    return manager.get_budget_stats()["nfl_ncca_api"]["used"]
+
+
+def test_not_modified_renews_the_entry_in_place(tmp_path):
+    async def scenario(manager, validator_server, url):
+        first = await manager._cached_request("get", url)
+        _, body, inode = read_entry(manager, url)
+
+        expire(manager, url)
+        assert manager.apiCache.get(url) is None
+        assert await manager._cached_request("get", url) == first
+
+        # the server was asked conditionally and answered 304
+        assert validator_server.requests[1]["If-None-Match"] == '"v1"'
+        assert "If-Modified-Since" in validator_server.requests[1]
+
+        # fresh again, with the payload left untouched on disk
+        header, renewed_body, renewed_inode = read_entry(manager, url)
+        assert header.is_fresh()
+        assert (renewed_body, renewed_inode) == (body, inode)
+        manager.apiCache.memory.clear()
+        assert manager.apiCache.get(url) == first
+        assert len(validator_server.requests) == 2
+
+    run_with_validator_server(tmp_path, scenario)
+
+
+def test_changed_etag_downloads_the_payload_again(tmp_path):
+    async def scenario(manager, validator_server, url):
+        await manager._cached_request("get", url)
+
+        validator_server.version = 2
+        expire(manager, url)
+        result = await manager._cached_request("get", url)
+
+        assert validator_server.requests[1]["If-None-Match"] == '"v1"'
+        assert result == validator_server.payload()
+        assert manager.apiCache.get(url) == validator_server.payload()
+        assert manager.apiCache.get_validators(url)["etag"] == '"v2"'
+        assert manager.conditional_stats["not_modified"] == 0
+
+    run_with_validator_server(tmp_path, scenario)
+
+
+def test_not_modified_saves_bytes_and_refunds_the_call(tmp_path):
+    async def scenario(manager, validator_server, url):
+        await manager._cached_request("get", url)
+        expire(manager, url)
+        await manager._cached_request("get", url)
+
+        payload_length = len(
+            json.dumps(validator_server.payload(), separators=(",", ":"))
+        )
+        stats = manager.conditional_stats
+        assert stats["conditional_requests"] == 1
+        assert stats["not_modified"] == 1
+        assert stats["bytes_saved"] == payload_length
+        assert stats["bytes_received"] == len(json.dumps(validator_server.payload()))
+        # the 304 is not billed, only the first download counts
+        assert used_calls(manager) == 1
+
+    run_with_validator_server(tmp_path, scenario, not_modified_counts=False)
+
+
+def test_not_modified_counts_when_the_upstream_bills_it(tmp_path):
+    async def scenario(manager, validator_server, url):
+        await manager._cached_request("get", url)
+        expire(manager, url)
+        await manager._cached_request("get", url)
+
+        assert manager.conditional_stats["not_modified"] == 1
+        assert used_calls(manager) == 2
+
+    run_with_validator_server(tmp_path, scenario, not_modified_counts=True)
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from commands.nfl_commands import NFLCommands
+from utils.data_manager import DataManager
+from utils.nfl_api import CONFERENCE_LEAGUE_NAMES, NFLAPIManager
+
+# latency the stub API adds to every /standings response
+LATENCY = 0.4
+HANG = "hang"
+
+
+class StandingsServer:
+    """Local /standings answering each conference after its injected latency"""
+
+    def __init__(self, data_manager, latencies):
+        # conference -> seconds, or HANG to never answer
+        self.latencies = latencies
+        self.released = asyncio.Event()
+        self.standings = {}
+        for team in data_manager.nfl_teams_data.values():
+            conference = team["conference"].lower()
+            self.standings.setdefault(conference, []).append(
+                {
+                    "team": {"id": team["id"]},
+                    "statistics": [{"displayName": "Division Record", "value": "3-3"}],
+                }
+            )
+
+    async def handle(self, request):
+        conference = {
+            name: conference for conference, name in CONFERENCE_LEAGUE_NAMES.items()
+        }[request.query["leagueName"]]
+        latency = self.latencies.get(conference, 0)
+        if latency == HANG:
+            await self.released.wait()
+        else:
+            await asyncio.sleep(latency)
+        return web.json_response({"data": [{"data": self.standings[conference]}]})
+
+
+class FakeContext:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append(dict(kwargs, content=content))
+
+
+class FakeBot:
+    def __init__(self, nfl_api_manager, data_manager):
+        self.nfl_api_manager = nfl_api_manager
+        self.data_manager = data_manager
+
+
+def run_standings(tmp_path, latencies, **manager_kwargs):
+    """Run !nfl standings against a StandingsServer, returning (elapsed, sent)"""
+
+    async def main():
+        data_manager = DataManager()
+        standings_server = StandingsServer(data_manager, latencies)
+        app = web.Application()
+        app.router.add_get("/standings", standings_server.handle)
+        async with TestServer(app) as server:
+            manager = NFLAPIManager(
+                cache_dir=str(tmp_path / "cache"),
+                match_cache_dir=str(tmp_path / "match_cache"),
+                budget_ledger_path=str(tmp_path / "api_budget.json"),
+                season_store_path=str(tmp_path / "season_store.json"),
+                incremental_sync=False,
+                **manager_kwargs,
+            )
+            manager.base_nfl_ncca_api_url = str(server.make_url(""))
+            await manager.start()
+            try:
+                cog = NFLCommands(FakeBot(manager, data_manager))
+                ctx = FakeContext()
+                start = time.perf_counter()
+                await cog.get_nfl_standings.callback(cog, ctx)
+                return time.perf_counter() - start, ctx.sent
+            finally:
+                standings_server.released.set()
+                await manager.close()
+
+    return asyncio.run(main())
+
+
+def count_embeds(sent):
+    return sum(len(message["embeds"]) for message in sent)
+
+
+def test_conferences_are_fetched_concurrently(tmp_path):
+    latencies = {"afc": LATENCY, "nfc": LATENCY}
+    sequential, sequential_sent = run_standings(
+        tmp_path / "sequential", latencies, fan_out_concurrency=1
+    )
+    concurrent, concurrent_sent = run_standings(tmp_path / "fan_out", latencies)
+
+    # one conference after the other vs both at once
+    assert sequential >= 2 * LATENCY
+    assert concurrent < 1.5 * LATENCY
+    assert count_embeds(sequential_sent) == count_embeds(concurrent_sent) == 8
+
+
+def test_hanging_conference_is_cut_at_the_deadline(tmp_path):
+    deadline = 2 * LATENCY
+    elapsed, sent = run_standings(
+        tmp_path, {"afc": HANG, "nfc": LATENCY}, fan_out_deadline=deadline
+    )
+
+    # the NFC divisions are sent once the AFC request hits the deadline
+    assert deadline <= elapsed < deadline + LATENCY
+    assert [message["content"] for message in sent] == ["⚠️ Failed to get AFC standings"]
+    titles = [embed.title for message in sent for embed in message["embeds"]]
+    assert len(titles) == 4
+    assert all(title.startswith("**NFC") for title in titles)
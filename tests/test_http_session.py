@@ -0,0 +1,161 @@
+import asyncio
+import time
+from datetime import datetime
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from commands.nfl_commands import NFLCommands
+from utils.nfl_api import NFLAPIManager
+
+# latency the stub API adds to every response
+LATENCY = 0.3
+CONCURRENT_CALLS = 50
+
+
+def make_game(game_id):
+    return {
+        "id": game_id,
+        "date": datetime.now().strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        "state": {
+            "description": "Scheduled",
+            "report": "Scheduled",
+            "score": {"current": "0 - 0"},
+        },
+        "homeTeam": {"id": 1, "abbreviation": "PHI"},
+        "awayTeam": {"id": 2, "abbreviation": "DAL"},
+    }
+
+
+class SlowServer:
+    """Local API answering every request after LATENCY seconds"""
+
+    def __init__(self):
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(LATENCY)
+        finally:
+            self.in_flight -= 1
+        match_id = request.match_info.get("match_id")
+        if match_id is not None:
+            return web.json_response([make_game(int(match_id))])
+        return web.json_response({"data": [make_game(1)]})
+
+
+class FakeContext:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append(content or kwargs)
+
+
+class FakeBot:
+    def __init__(self, nfl_api_manager):
+        self.nfl_api_manager = nfl_api_manager
+        self.data_manager = None
+
+
+def run_with_slow_server(tmp_path, scenario, **manager_kwargs):
+    async def main():
+        slow_server = SlowServer()
+        app = web.Application()
+        app.router.add_get("/matches", slow_server.handle)
+        app.router.add_get("/matches/{match_id}", slow_server.handle)
+        async with TestServer(app) as server:
+            manager = NFLAPIManager(
+                cache_dir=str(tmp_path / "cache"),
+                match_cache_dir=str(tmp_path / "match_cache"),
+                budget_ledger_path=str(tmp_path / "api_budget.json"),
+                season_store_path=str(tmp_path / "season_store.json"),
+                incremental_sync=False,
+                **manager_kwargs,
+            )
+            manager.base_nfl_ncca_api_url = str(server.make_url(""))
+            await manager.start()
+            try:
+                await scenario(manager, slow_server)
+            finally:
+                await manager.close()
+
+    asyncio.run(main())
+
+
+def test_concurrent_gameweek_commands_do_not_serialize(tmp_path):
+    async def scenario(manager, slow_server):
+        cog = NFLCommands(FakeBot(manager))
+        contexts = [FakeContext() for _ in range(CONCURRENT_CALLS)]
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(cog.get_gameweek.callback(cog, ctx, "current") for ctx in contexts)
+        )
+        elapsed = time.perf_counter() - start
+
+        # one coalesced upstream call, every command answered within ~1 latency
+        assert slow_server.requests == 1
+        assert elapsed < 3 * LATENCY
+        assert all(len(ctx.sent) == 1 and "embed" in ctx.sent[0] for ctx in contexts)
+
+    run_with_slow_server(tmp_path, scenario)
+
+
+def test_distinct_requests_run_in_parallel(tmp_path):
+    async def scenario(manager, slow_server):
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(
+                manager.get_nfl_specific_matches(match_id)
+                for match_id in range(CONCURRENT_CALLS)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+        assert [response[0]["id"] for response in responses] == list(
+            range(CONCURRENT_CALLS)
+        )
+        assert slow_server.max_in_flight == CONCURRENT_CALLS
+        # sequential requests would take CONCURRENT_CALLS * LATENCY (15s)
+        assert elapsed < 5 * LATENCY
+
+    run_with_slow_server(
+        tmp_path,
+        scenario,
+        max_connections=CONCURRENT_CALLS,
+        max_connections_per_host=CONCURRENT_CALLS,
+    )
+
+
+def test_connection_pool_bounds_requests_per_host(tmp_path):
+    async def scenario(manager, slow_server):
+        await asyncio.gather(
+            *(manager.get_nfl_specific_matches(match_id) for match_id in range(10))
+        )
+        assert slow_server.max_in_flight == 5
+
+    run_with_slow_server(tmp_path, scenario, max_connections_per_host=5)
+
+
+def test_event_loop_stays_responsive_during_requests(tmp_path):
+    async def scenario(manager, slow_server):
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(LATENCY / 10)
+                ticks += 1
+
+        heartbeat_task = asyncio.create_task(heartbeat())
+        await manager.get_nfl_specific_matches(1)
+        heartbeat_task.cancel()
+
+        # a blocking HTTP client would have frozen the loop for the whole request
+        assert ticks >= 5
+
+    run_with_slow_server(tmp_path, scenario)
@@ -0,0 +1,78 @@
+import asyncio
+import os
+from utils.live_poller import HALFTIME_POLL_INTERVAL, LivePoller, SnapshotReplay
+
+# Scheduled -> In Progress -> Halftime -> In Progress -> Finished
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), "snapshots", "live_game")
+
+
+class RecordingChannel:
+    id = 1
+
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, message):
+        self.messages.append(message)
+
+
+def replay_snapshots():
+    """Replay the recorded game, returning the messages pushed after each poll"""
+
+    async def main():
+        replay = SnapshotReplay(SNAPSHOT_DIR)
+        poller = LivePoller(replay.fetch_matches, replay.fetch_match)
+        channel = RecordingChannel()
+        poller.subscribers[channel.id] = channel
+
+        polls = []
+        while not replay.is_finished():
+            updates, live_games = await poller.poll_once()
+            await poller.push(updates)
+            polls.append(
+                (channel.messages[:], poller.get_poll_interval(live_games), live_games)
+            )
+            channel.messages.clear()
+        return polls, poller
+
+    return asyncio.run(main())
+
+
+def test_replay_pushes_each_transition():
+    polls, poller = replay_snapshots()
+    messages = [poll[0] for poll in polls]
+
+    assert messages == [
+        # a scheduled game is not polled
+        [],
+        # first live snapshot is the baseline score
+        ["📣 **PHI 7 - 0 DAL**"],
+        [
+            "📣 **PHI 7 - 3 DAL**",
+            "🏈 [PHI vs DAL] Dallas Cowboys: **Field Goal** "
+            "(11 plays, 52 yards, 6:26) 2nd Quarter",
+            "⏱️ [PHI vs DAL] Halftime",
+        ],
+        [
+            "📣 **PHI 7 - 10 DAL**",
+            "🏈 [PHI vs DAL] Dallas Cowboys: **Touchdown** "
+            "(9 plays, 70 yards, 4:19) 3rd Quarter",
+            "⏱️ [PHI vs DAL] In Progress",
+        ],
+        # the finished game is fetched once more for its final events
+        [
+            "📣 **PHI 10 - 10 DAL**",
+            "🏈 [PHI vs DAL] Philadelphia Eagles: **Field Goal** "
+            "(10 plays, 48 yards, 4:55) 4th Quarter",
+            "⏱️ [PHI vs DAL] Finished",
+        ],
+    ]
+    assert poller.snapshots == {}
+
+
+def test_halftime_stays_live_with_a_slower_poll():
+    polls, poller = replay_snapshots()
+    live_counts = [len(poll[2]) for poll in polls]
+    assert live_counts == [0, 1, 1, 1, 0]
+    assert polls[2][1] == HALFTIME_POLL_INTERVAL
+    assert polls[3][1] < HALFTIME_POLL_INTERVAL
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from utils.cache_policy import (
+    FINISHED_TTL,
+    LIVE_MATCH_TTL,
+    LIVE_TTL,
+    get_cache_ttl,
+)
+from utils.live_poller import is_live
+from utils.nfl_schedule import LIVE_STATES
+from utils.season_store import SeasonStore
+
+API_URL = "https://nfl-football-api.p.rapidapi.com"
+DEFAULT_TTL = timedelta(hours=24)
+
+
+def make_game(game_id, kickoff, description):
+    return {
+        "id": game_id,
+        "date": kickoff.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        "state": {"description": description},
+    }
+
+
+def utc_now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@pytest.mark.parametrize("description", LIVE_STATES)
+def test_live_match_gets_live_ttl(description):
+    game = make_game(1, utc_now() - timedelta(hours=1), description)
+    assert get_cache_ttl(f"{API_URL}/matches/1", None, [game], DEFAULT_TTL) == (
+        LIVE_MATCH_TTL
+    )
+
+
+@pytest.mark.parametrize("description", LIVE_STATES)
+def test_date_with_live_game_gets_live_ttl(description):
+    games = [
+        make_game(1, utc_now() - timedelta(hours=1), description),
+        make_game(2, utc_now() + timedelta(hours=3), "Scheduled"),
+    ]
+    ttl = get_cache_ttl(
+        f"{API_URL}/matches", {"date": "2025-10-19"}, {"data": games}, DEFAULT_TTL
+    )
+    assert ttl == LIVE_TTL
+
+
+def test_finished_match_is_not_live():
+    game = make_game(1, utc_now() - timedelta(hours=4), "Finished")
+    assert get_cache_ttl(f"{API_URL}/matches/1", None, [game], DEFAULT_TTL) == (
+        FINISHED_TTL
+    )
+    assert not is_live(game)
+
+
+@pytest.mark.parametrize("description", LIVE_STATES)
+def test_poller_tracks_live_states(description):
+    assert is_live(make_game(1, utc_now(), description))
+
+
+def test_season_store_syncs_dates_of_live_games(tmp_path):
+    now = utc_now()
+    store = SeasonStore(str(tmp_path / "season_store.json"), 2025)
+    store.replace(
+        [
+            make_game(1, now - timedelta(days=7), "Finished"),
+            make_game(2, now - timedelta(days=1, hours=1), "Halftime"),
+            make_game(3, now + timedelta(days=1), "Scheduled"),
+        ]
+    )
+    assert store.get_dates_to_sync(now) == [
+        (now - timedelta(days=1, hours=1)).strftime("%Y-%m-%d")
+    ]
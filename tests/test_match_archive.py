@@ -0,0 +1,72 @@
+import threading
+import time
+from utils import match_archive
+from utils.match_archive import RECORD_HEADER, MatchArchive
+
+# how long the compaction's fsync takes in the blocking test
+SLOW_FSYNC = 0.5
+
+
+def record(match_id, version):
+    return f"match {match_id} version {version}".encode("utf-8")
+
+
+def test_compact_keeps_latest_records_and_drops_ids(tmp_path):
+    archive = MatchArchive(str(tmp_path))
+    for version in range(3):
+        for match_id in range(1, 4):
+            archive.append(match_id, record(match_id, version))
+
+    archive.compact(drop_match_ids=[3])
+
+    assert archive.get_stats()["dead_bytes"] == 0
+    assert archive.get_bytes(1) == record(1, 2)
+    assert archive.get_bytes(2) == record(2, 2)
+    assert archive.get_bytes(3) is None
+    archive.close()
+
+    # the compacted archive and index are what a new process loads
+    reopened = MatchArchive(str(tmp_path))
+    assert len(reopened) == 2
+    assert reopened.get_bytes(1) == record(1, 2)
+    assert reopened.archive_size == archive.archive_size
+    reopened.close()
+
+
+def test_reads_and_appends_do_not_wait_for_compaction(tmp_path, monkeypatch):
+    archive = MatchArchive(str(tmp_path))
+    for match_id in range(1, 101):
+        archive.append(match_id, record(match_id, 0))
+        archive.append(match_id, record(match_id, 1))
+
+    fsync = match_archive.os.fsync
+    compaction_writing = threading.Event()
+
+    def slow_fsync(fd):
+        if threading.current_thread() is compaction:
+            compaction_writing.set()
+            time.sleep(SLOW_FSYNC)
+        fsync(fd)
+
+    monkeypatch.setattr(match_archive.os, "fsync", slow_fsync)
+    compaction = threading.Thread(target=archive.compact)
+    compaction.start()
+    assert compaction_writing.wait(SLOW_FSYNC)
+
+    start = time.perf_counter()
+    assert archive.get_bytes(50) == record(50, 1)
+    archive.append(101, record(101, 0))
+    archive.append(1, record(1, 2))
+    elapsed = time.perf_counter() - start
+    compaction.join()
+
+    assert elapsed < SLOW_FSYNC / 2
+    # records appended during the rewrite made it into the compacted archive
+    assert archive.get_bytes(101) == record(101, 0)
+    assert archive.get_bytes(1) == record(1, 2)
+    assert archive.get_bytes(2) == record(2, 1)
+    # only the copy of match 1 superseded during the rewrite is left behind
+    dead_bytes = RECORD_HEADER.size + len(record(1, 1))
+    assert archive.get_stats()["dead_bytes"] == dead_bytes
+    assert len(archive) == 101
+    archive.close()
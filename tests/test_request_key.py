@@ -0,0 +1,154 @@
+import pytest
+from utils.request_key import (
+    get_canonical_request,
+    get_legacy_cache_key,
+    get_request_key,
+)
+
+MATCHES_URL = "https://nfl-football-api.p.rapidapi.com/matches"
+
+# (method, url, params, headers) pairs the upstream answers identically
+EQUIVALENT_REQUESTS = [
+    (
+        ("GET", MATCHES_URL, {"leagueName": "NFL", "year": "2025"}, None),
+        ("GET", MATCHES_URL, {"year": "2025", "leagueName": "NFL"}, None),
+    ),
+    (
+        ("GET", MATCHES_URL, {"year": 2025}, None),
+        ("GET", MATCHES_URL, {"year": "2025"}, None),
+    ),
+    (
+        ("GET", MATCHES_URL, {"year": 2025.0}, None),
+        ("GET", MATCHES_URL, {"year": "2025"}, None),
+    ),
+    (
+        ("GET", MATCHES_URL, {"live": True}, None),
+        ("GET", MATCHES_URL, {"live": "true"}, None),
+    ),
+    (
+        ("GET", MATCHES_URL, None, None),
+        ("GET", MATCHES_URL, {}, None),
+    ),
+    (
+        ("GET", MATCHES_URL, {"year": "2025", "team": None}, None),
+        ("GET", MATCHES_URL, {"year": "2025"}, None),
+    ),
+    (
+        ("GET", MATCHES_URL, {"year": " 2025 "}, None),
+        ("GET", MATCHES_URL, {"year": "2025"}, None),
+    ),
+    (
+        ("GET", f"{MATCHES_URL}?year=2025&leagueName=NFL", None, None),
+        ("GET", MATCHES_URL, {"leagueName": "NFL", "year": 2025}, None),
+    ),
+    (
+        ("GET", f"{MATCHES_URL}?year=2025", {"leagueName": "NFL"}, None),
+        ("GET", MATCHES_URL, {"leagueName": "NFL", "year": "2025"}, None),
+    ),
+    (
+        ("GET", "HTTPS://NFL-Football-API.p.rapidapi.com/matches", None, None),
+        ("GET", MATCHES_URL, None, None),
+    ),
+    (
+        ("GET", "https://nfl-football-api.p.rapidapi.com:443/matches", None, None),
+        ("GET", MATCHES_URL, None, None),
+    ),
+    (
+        ("GET", f"{MATCHES_URL}/", None, None),
+        ("GET", MATCHES_URL, None, None),
+    ),
+    (
+        ("GET", f"{MATCHES_URL}#week-1", None, None),
+        ("GET", MATCHES_URL, None, None),
+    ),
+    (
+        ("get", MATCHES_URL, None, None),
+        ("GET", MATCHES_URL, None, None),
+    ),
+    (
+        ("GET", MATCHES_URL, {"teams": ["1", "2"]}, None),
+        ("GET", MATCHES_URL, {"teams": (1, 2)}, None),
+    ),
+    (
+        ("GET", MATCHES_URL, None, {"x-rapidapi-key": "key-1"}),
+        ("GET", MATCHES_URL, None, {"x-rapidapi-key": "key-2"}),
+    ),
+    (
+        ("GET", MATCHES_URL, None, {"x-rapidapi-host": "a", "User-Agent": "bot"}),
+        ("GET", MATCHES_URL, None, None),
+    ),
+    (
+        ("GET", MATCHES_URL, None, {"Accept": "application/json"}),
+        ("GET", MATCHES_URL, None, {"accept": " application/json"}),
+    ),
+    (
+        ("GET", MATCHES_URL, None, {"Accept-Language": None}),
+        ("GET", MATCHES_URL, None, None),
+    ),
+]
+
+# pairs that must NOT share a key
+DIFFERENT_REQUESTS = [
+    (
+        ("GET", MATCHES_URL, {"year": "2025"}, None),
+        ("GET", MATCHES_URL, {"year": "2024"}, None),
+    ),
+    (
+        ("GET", MATCHES_URL, None, None),
+        ("POST", MATCHES_URL, None, None),
+    ),
+    (
+        ("GET", MATCHES_URL, None, None),
+        ("GET", f"{MATCHES_URL}/253941", None, None),
+    ),
+    (
+        ("GET", MATCHES_URL, None, None),
+        ("GET", "https://nfl-football-api.p.rapidapi.com:8443/matches", None, None),
+    ),
+    (
+        ("GET", MATCHES_URL, None, None),
+        ("GET", "http://nfl-football-api.p.rapidapi.com/matches", None, None),
+    ),
+    (
+        ("GET", MATCHES_URL, {"teams": ["1", "2"]}, None),
+        ("GET", MATCHES_URL, {"teams": "1"}, None),
+    ),
+    (
+        ("GET", MATCHES_URL, None, {"Accept-Language": "en"}),
+        ("GET", MATCHES_URL, None, {"Accept-Language": "fr"}),
+    ),
+    (
+        ("GET", MATCHES_URL, {"year": ""}, None),
+        ("GET", MATCHES_URL, None, None),
+    ),
+]
+
+
+@pytest.mark.parametrize("first, second", EQUIVALENT_REQUESTS)
+def test_equivalent_requests_share_a_key(first, second):
+    assert get_canonical_request(*first) == get_canonical_request(*second)
+    assert get_request_key(*first) == get_request_key(*second)
+
+
+@pytest.mark.parametrize("first, second", DIFFERENT_REQUESTS)
+def test_different_requests_get_different_keys(first, second):
+    assert get_request_key(*first) != get_request_key(*second)
+
+
+def test_key_is_a_file_name():
+    key = get_request_key("GET", MATCHES_URL, {"year": 2025})
+    assert len(key) == 32 and key.isalnum()
+
+
+def test_credentials_never_in_canonical_request():
+    canonical = get_canonical_request(
+        "GET", MATCHES_URL, None, {"x-rapidapi-key": "secret", "x-rapidapi-host": "h"}
+    )
+    assert "secret" not in canonical
+
+
+def test_legacy_key_depends_on_param_order():
+    # the reason for the migration, the previous keys split equivalent requests
+    assert get_legacy_cache_key(MATCHES_URL, {"a": 1, "b": 2}) != (
+        get_legacy_cache_key(MATCHES_URL, {"b": 2, "a": 1})
+    )
@@ -0,0 +1,227 @@
+import asyncio
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from utils.cache_entry import ENTRY_LIFETIME, ENTRY_LIFETIME_OFFSET
+from utils.nfl_api import NFLAPIManager
+from utils.resilience import (
+    APIClientError,
+    APIRateLimitError,
+    APIServerError,
+    APITimeoutError,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    describe_api_error,
+)
+
+GAME = {
+    "id": 1,
+    "date": "2025-09-05T00:20:00.000Z",
+    "state": {"description": "Finished", "report": "Final"},
+}
+
+
+class FaultServer:
+    """Local API answering each request with the next scripted fault"""
+
+    def __init__(self, script):
+        # each step is a status code, (status, headers) or "slow"
+        self.script = list(script)
+        self.requests = 0
+        self.server = None
+
+    async def handle(self, request):
+        self.requests += 1
+        step = self.script.pop(0) if self.script else 200
+        if step == "slow":
+            await asyncio.sleep(2)
+            step = 200
+        status, headers = step if isinstance(step, tuple) else (step, {})
+        if status == 200:
+            return web.json_response([GAME], headers=headers)
+        return web.Response(status=status, text="fault", headers=headers)
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/{path:.*}", self.handle)
+        app.router.add_post("/{path:.*}", self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.server.close()
+
+    def url(self, path):
+        return str(self.server.make_url(path))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_with_server(tmp_path, script, scenario, **manager_kwargs):
+    """Run scenario(manager, server, sleeps) against a FaultServer"""
+
+    async def main():
+        sleeps = []
+
+        async def sleep(delay):
+            sleeps.append(delay)
+
+        async with FaultServer(script) as server:
+            manager = NFLAPIManager(
+                cache_dir=str(tmp_path / "cache"),
+                match_cache_dir=str(tmp_path / "match_cache"),
+                budget_ledger_path=str(tmp_path / "api_budget.json"),
+                season_store_path=str(tmp_path / "season_store.json"),
+                incremental_sync=False,
+                sleep=sleep,
+                **manager_kwargs,
+            )
+            manager.base_nfl_ncca_api_url = server.url("")
+            await manager.start()
+            try:
+                return await scenario(manager, server, sleeps)
+            finally:
+                await manager.close()
+
+    return asyncio.run(main())
+
+
+def test_server_errors_are_retried_with_backoff(tmp_path):
+    async def scenario(manager, server, sleeps):
+        result = await manager._cached_request("get", server.url("/matches/1"))
+        assert result == [GAME]
+        assert server.requests == 3
+        assert len(sleeps) == 2
+
+    run_with_server(tmp_path, [503, 502], scenario)
+
+
+def test_retries_are_bounded(tmp_path):
+    async def scenario(manager, server, sleeps):
+        with pytest.raises(APIServerError):
+            await manager._cached_request("get", server.url("/matches/1"))
+        assert server.requests == 3
+
+    run_with_server(tmp_path, [500] * 5, scenario)
+
+
+def test_rate_limit_waits_retry_after(tmp_path):
+    async def scenario(manager, server, sleeps):
+        await manager._cached_request("get", server.url("/matches/1"))
+        assert sleeps == [2.0]
+
+    run_with_server(tmp_path, [(429, {"Retry-After": "2"})], scenario)
+
+
+def test_rate_limit_over_max_retry_after_is_not_retried(tmp_path):
+    async def scenario(manager, server, sleeps):
+        with pytest.raises(APIRateLimitError) as error:
+            await manager.get_nfl_standings("nfc")
+        assert error.value.retry_after == 3600
+        assert server.requests == 1
+
+    run_with_server(tmp_path, [(429, {"Retry-After": "3600"})], scenario)
+
+
+def test_client_errors_reach_the_caller_without_retries(tmp_path):
+    async def scenario(manager, server, sleeps):
+        with pytest.raises(APIClientError) as error:
+            await manager.get_nfl_specific_matches(404404)
+        assert error.value.status == 404
+        assert describe_api_error(error.value) == "not found"
+        assert server.requests == 1
+        assert sleeps == []
+
+    run_with_server(tmp_path, [404], scenario)
+
+
+def test_posts_are_not_retried(tmp_path):
+    async def scenario(manager, server, sleeps):
+        with pytest.raises(APIServerError):
+            await manager._cached_request("post", server.url("/matches"))
+        assert server.requests == 1
+
+    run_with_server(tmp_path, [503], scenario)
+
+
+def test_timeouts_are_not_retried_by_default(tmp_path):
+    async def scenario(manager, server, sleeps):
+        with pytest.raises(APITimeoutError):
+            await manager._cached_request("get", server.url("/matches/1"))
+        assert server.requests == 1
+
+    run_with_server(tmp_path, ["slow"], scenario, api_timeout=0.2)
+
+
+def test_timeouts_are_retried_when_enabled(tmp_path):
+    async def scenario(manager, server, sleeps):
+        result = await manager._cached_request("get", server.url("/matches/1"))
+        assert result == [GAME]
+        assert server.requests == 2
+
+    run_with_server(
+        tmp_path,
+        ["slow"],
+        scenario,
+        api_timeout=0.2,
+        retry_policy=RetryPolicy(retry_timeouts=True),
+    )
+
+
+def test_circuit_opens_then_probes_after_reset_timeout(tmp_path):
+    clock = FakeClock()
+
+    async def scenario(manager, server, sleeps):
+        manager.breakers["nfl_ncca_api"] = CircuitBreaker(
+            "nfl_ncca_api", failure_threshold=2, reset_timeout=30, clock=clock
+        )
+        url = server.url("/matches/1")
+        with pytest.raises(CircuitOpenError):
+            await manager._cached_request("get", url, use_cache=False)
+        # two failures opened the circuit, the third attempt never left the process
+        assert server.requests == 2
+
+        with pytest.raises(CircuitOpenError):
+            await manager._cached_request("get", url, use_cache=False)
+        assert server.requests == 2
+
+        clock.now += 31
+        assert await manager._cached_request("get", url, use_cache=False) == [GAME]
+        assert server.requests == 3
+        assert manager.breakers["nfl_ncca_api"].state == "closed"
+
+    run_with_server(
+        tmp_path, [503, 503], scenario, retry_policy=RetryPolicy(max_attempts=3)
+    )
+
+
+def test_stale_cache_is_served_while_the_host_fails(tmp_path):
+    async def scenario(manager, server, sleeps):
+        url = server.url("/matches/1")
+        assert await manager._cached_request("get", url) == [GAME]
+
+        # expire the entry (zero its created at and TTL), the next request
+        # goes upstream and fails
+        cache_key = manager.apiCache._get_cache_key(url)
+        with open(tmp_path / "cache" / cache_key, "r+b") as f:
+            f.seek(ENTRY_LIFETIME_OFFSET)
+            f.write(b"\0" * ENTRY_LIFETIME.size)
+        manager.apiCache.memory.clear()
+
+        assert await manager._cached_request("get", url) == [GAME]
+        assert server.requests == 4
+
+    run_with_server(tmp_path, [200, 503, 503, 503], scenario)
+
+
+def test_open_circuit_is_described_to_users():
+    error = CircuitOpenError("Circuit for nfl_ncca_api is open")
+    assert "unavailable" in describe_api_error(error)
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import zlib
+from datetime import datetime, timedelta, timezone
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from utils.nfl_api import NFLAPIManager
+from utils.resilience import RetryPolicy
+
+
+def make_game(game_id, kickoff, description, score):
+    return {
+        "id": game_id,
+        "date": kickoff.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        "state": {"description": description, "score": {"current": score}},
+        "homeTeam": {"id": 1},
+        "awayTeam": {"id": 2},
+    }
+
+
+class SeasonServer:
+    """Local /matches answering full season and date requests from self.games"""
+
+    def __init__(self, games):
+        self.games = {game["id"]: game for game in games}
+        self.full_status = 200
+        self.requests = []
+        # If-None-Match of each full season request
+        self.full_validators = []
+
+    async def handle(self, request):
+        date = request.query.get("date")
+        self.requests.append(date)
+        if date is None and self.full_status != 200:
+            return web.Response(status=self.full_status, text="unavailable")
+        games = [
+            game
+            for game in self.games.values()
+            if date is None or game["date"].startswith(date)
+        ]
+        if date is not None:
+            return web.json_response({"data": games})
+
+        # the full season honours validators
+        etag = f'"{zlib.crc32(json.dumps(games).encode("utf-8"))}"'
+        self.full_validators.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.json_response({"data": games}, headers={"ETag": etag})
+
+
+def run_sync(tmp_path, games, scenario):
+    """Run scenario(manager, season_server) with an incremental season store"""
+
+    async def main():
+        season_server = SeasonServer(games)
+        app = web.Application()
+        app.router.add_get("/matches", season_server.handle)
+        async with TestServer(app) as server:
+
+            async def sleep(delay):
+                pass
+
+            manager = NFLAPIManager(
+                cache_dir=str(tmp_path / "cache"),
+                match_cache_dir=str(tmp_path / "match_cache"),
+                budget_ledger_path=str(tmp_path / "api_budget.json"),
+                season_store_path=str(tmp_path / "season_store.json"),
+                incremental_sync=True,
+                full_sync_hours=24,
+                retry_policy=RetryPolicy(max_attempts=1),
+                sleep=sleep,
+            )
+            manager.base_nfl_ncca_api_url = str(server.make_url(""))
+            await manager.start()
+            try:
+                await scenario(manager, season_server)
+            finally:
+                await manager.close()
+
+    asyncio.run(main())
+
+
+def kickoff_times():
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    return now - timedelta(days=7), now - timedelta(minutes=30)
+
+
+def test_incremental_sync_merges_only_live_dates(tmp_path):
+    last_week, today = kickoff_times()
+    games = [
+        make_game(1, last_week, "Finished", "10 - 3"),
+        make_game(2, today, "In Progress", "7 - 0"),
+    ]
+
+    async def scenario(manager, season_server):
+        await manager.get_nfl_all_matches()
+        assert manager.sync_stats["last_sync"]["mode"] == "full"
+
+        season_server.games[2] = make_game(2, today, "Finished", "21 - 0")
+        manager.apiCache.clear()
+        payload = await manager.get_nfl_all_matches()
+        assert season_server.requests == [None, today.strftime("%Y-%m-%d")]
+        assert manager.sync_stats["last_sync"]["changed"] == 1
+        game = {game["id"]: game for game in payload["data"]}[2]
+        assert game["state"]["score"]["current"] == "21 - 0"
+
+    run_sync(tmp_path, games, scenario)
+
+
+def test_failed_full_sync_keeps_merged_games(tmp_path):
+    last_week, today = kickoff_times()
+    games = [
+        make_game(1, last_week, "Finished", "10 - 3"),
+        make_game(2, today, "In Progress", "7 - 0"),
+    ]
+
+    async def scenario(manager, season_server):
+        await manager.get_nfl_all_matches()
+
+        # an incremental merge finishes game 2
+        season_server.games[2] = make_game(2, today, "Finished", "21 - 0")
+        await manager.get_nfl_all_matches()
+
+        # the next full sync fails upstream, the older cached season must not
+        # replace the merged games nor count as a full sync
+        store = manager.season_store
+        store.full_synced_at -= manager.full_sync_interval
+        season_server.full_status = 503
+        payload = await manager.get_nfl_all_matches()
+
+        game = {game["id"]: game for game in payload["data"]}[2]
+        assert game["state"]["description"] == "Finished"
+        assert game["state"]["score"]["current"] == "21 - 0"
+        assert store.is_full_sync_due(manager.full_sync_interval)
+
+    run_sync(tmp_path, games, scenario)
+
+
+def test_full_sync_bypasses_the_cached_season(tmp_path):
+    last_week, today = kickoff_times()
+    games = [make_game(1, last_week, "Finished", "10 - 3")]
+
+    async def scenario(manager, season_server):
+        await manager.get_nfl_all_matches()
+
+        season_server.games[3] = make_game(3, today, "Scheduled", "0 - 0")
+        manager.season_store.full_synced_at -= manager.full_sync_interval
+        payload = await manager.get_nfl_all_matches()
+
+        assert season_server.requests == [None, None]
+        assert {game["id"] for game in payload["data"]} == {1, 3}
+
+    run_sync(tmp_path, games, scenario)
+
+
+def test_concurrent_syncs_run_one_at_a_time(tmp_path):
+    last_week, today = kickoff_times()
+    games = [make_game(1, last_week, "Finished", "10 - 3")]
+
+    async def scenario(manager, season_server):
+        await asyncio.gather(*(manager.get_nfl_all_matches() for _ in range(3)))
+        assert season_server.requests == [None]
+        assert manager.sync_stats["full_syncs"] == 1
+
+    run_sync(tmp_path, games, scenario)
+
+
+def test_unchanged_full_sync_is_confirmed_by_a_304(tmp_path):
+    last_week, today = kickoff_times()
+    games = [
+        make_game(1, last_week, "Finished", "10 - 3"),
+        make_game(2, today, "Finished", "21 - 0"),
+    ]
+
+    async def scenario(manager, season_server):
+        first = await manager.get_nfl_all_matches()
+        store = manager.season_store
+        version = store.version
+
+        store.full_synced_at -= manager.full_sync_interval
+        payload = await manager.get_nfl_all_matches()
+
+        # asked conditionally, the 304 counts as a full sync of an unchanged store
+        assert season_server.full_validators[0] is None
+        assert season_server.full_validators[1] is not None
+        assert manager.conditional_stats["not_modified"] == 1
+        assert manager.sync_stats["full_syncs"] == 2
+        assert manager.sync_stats["last_sync"]["changed"] == 0
+        assert not store.is_full_sync_due(manager.full_sync_interval)
+        assert store.version == version
+        assert payload == first
+
+    run_sync(tmp_path, games, scenario)
+
+
+def test_changed_full_sync_downloads_the_season(tmp_path):
+    last_week, today = kickoff_times()
+    games = [make_game(1, last_week, "Finished", "10 - 3")]
+
+    async def scenario(manager, season_server):
+        await manager.get_nfl_all_matches()
+
+        season_server.games[3] = make_game(3, today, "Scheduled", "0 - 0")
+        manager.season_store.full_synced_at -= manager.full_sync_interval
+        payload = await manager.get_nfl_all_matches()
+
+        assert season_server.full_validators[1] is not None
+        assert manager.conditional_stats["not_modified"] == 0
+        assert {game["id"] for game in payload["data"]} == {1, 3}
+
+    run_sync(tmp_path, games, scenario)
+
+
+def test_not_modified_fills_an_empty_store_from_the_cache(tmp_path):
+    last_week, today = kickoff_times()
+    games = [make_game(1, last_week, "Finished", "10 - 3")]
+
+    async def scenario(manager, season_server):
+        await manager.get_nfl_all_matches()
+
+        # e.g. season_store.json was deleted, the cached season is still current
+        manager.season_store.games = {}
+        payload = await manager.get_nfl_all_matches()
+
+        assert manager.conditional_stats["not_modified"] == 1
+        assert [game["id"] for game in payload["data"]] == [1]
+        assert len(manager.season_store) == 1
+
+    run_sync(tmp_path, games, scenario)
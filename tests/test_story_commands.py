@@ -0,0 +1,76 @@
+import asyncio
+from commands.story_commands import StoryCommands
+from utils.data_manager import DataManager
+
+
+class FakeSeason:
+    def __init__(self, games):
+        self.games = games
+
+    def get_gameweek(self, offset):
+        return self.games
+
+
+class FakeAPIManager:
+    def __init__(self, games):
+        self.season = FakeSeason(games)
+
+    async def get_nfl_season(self):
+        return self.season
+
+
+class FakeBot:
+    def __init__(self, games):
+        self.data_manager = DataManager()
+        self.nfl_api_manager = FakeAPIManager(games)
+
+
+class FakeContext:
+    channel = None
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append(content or kwargs)
+
+
+class FakePacer:
+    def __init__(self):
+        self.stories = []
+
+    def deliver(self, channel, lines):
+        self.stories.append(lines)
+
+
+def make_game(game_id, home_id, away_id, description, score):
+    return {
+        "id": game_id,
+        "date": "2025-09-05T00:20:00.000Z",
+        "state": {"description": description, "score": {"current": score}},
+        "homeTeam": {"id": home_id, "name": "Home"},
+        "awayTeam": {"id": away_id, "name": "Away"},
+    }
+
+
+def test_gameweek_story_skips_empty_template_categories():
+    games = [
+        make_game(1, 92765, 92736, "Finished", "31 - 3"),
+        make_game(2, 92765, 92736, "Finished", "10 - 7"),
+        make_game(3, 92765, 92736, "Scheduled", "0 - 0"),
+    ]
+    bot = FakeBot(games)
+    templates = bot.data_manager.story_templates.templates
+    templates[("storylines", "big_win")] = []
+    templates[("storylines", "upcoming")] = []
+
+    cog = StoryCommands(bot)
+    cog.story_pacer = FakePacer()
+    ctx = FakeContext()
+    asyncio.run(cog.story_gameweek.callback(cog, ctx, "current"))
+
+    assert ctx.sent == []
+    (lines,) = cog.story_pacer.stories
+    # title, optional story, separator per game between header and outro
+    game_lines = [line for line, _ in lines[1:-1] if not line.startswith("━")]
+    assert [line.startswith("⚔️") for line in game_lines] == [True, True, False, True]
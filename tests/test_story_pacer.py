@@ -0,0 +1,113 @@
+import asyncio
+import time
+from commands.story_commands import StoryCommands
+from utils.story_pacer import StoryPacer
+
+# story pauses are in seconds, the tests run them this many times faster
+TIME_SCALE = 0.01
+
+
+async def scaled_sleep(delay):
+    await asyncio.sleep(delay * TIME_SCALE)
+
+
+class RecordingChannel:
+    def __init__(self, channel_id):
+        self.id = channel_id
+        self.messages = []
+
+    async def send(self, message):
+        self.messages.append(message)
+
+
+class FakeContext:
+    def __init__(self, channel):
+        self.channel = channel
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append(content or kwargs)
+
+
+class FakeBot:
+    data_manager = None
+    nfl_api_manager = None
+
+
+def story(name, pauses):
+    return [(f"{name} {i}", pause) for i, pause in enumerate(pauses)]
+
+
+def test_stories_in_different_channels_run_concurrently():
+    async def main():
+        pacer = StoryPacer(sleep=scaled_sleep, flush_delay=0)
+        first, second = RecordingChannel(1), RecordingChannel(2)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            pacer.deliver(first, story("first", [10] * 10)),
+            pacer.deliver(second, story("second", [10] * 6)),
+        )
+        elapsed = time.perf_counter() - start
+
+        # 100s and 60s of pauses: about the longer story, not the 160s sum
+        assert 100 * TIME_SCALE <= elapsed < 130 * TIME_SCALE
+        assert len(first.messages) == 10
+        assert len(second.messages) == 6
+
+    asyncio.run(main())
+
+
+def test_stories_in_one_channel_keep_their_order():
+    async def main():
+        pacer = StoryPacer(sleep=scaled_sleep, flush_delay=0)
+        channel = RecordingChannel(1)
+
+        first = pacer.deliver(channel, story("first", [5] * 3))
+        second = pacer.deliver(channel, story("second", [1] * 3))
+        assert pacer.is_running(channel.id)
+        await asyncio.gather(first, second)
+
+        # the shorter second story waits for the first instead of interleaving
+        assert channel.messages == [
+            "first 0",
+            "first 1",
+            "first 2",
+            "second 0",
+            "second 1",
+            "second 2",
+        ]
+        assert not pacer.is_running(channel.id)
+
+    asyncio.run(main())
+
+
+def test_story_stop_cancels_running_and_queued_stories():
+    async def main():
+        cog = StoryCommands(FakeBot())
+        cog.story_pacer = StoryPacer(sleep=scaled_sleep, flush_delay=0)
+        channel, other = RecordingChannel(1), RecordingChannel(2)
+
+        running = cog.story_pacer.deliver(channel, story("running", [10] * 10))
+        queued = cog.story_pacer.deliver(channel, story("queued", [10] * 10))
+        untouched = cog.story_pacer.deliver(other, story("other", [10] * 3))
+        await asyncio.sleep(25 * TIME_SCALE)
+
+        ctx = FakeContext(channel)
+        await cog.story_stop.callback(cog, ctx)
+        await asyncio.gather(running, queued, untouched, return_exceptions=True)
+        sent_before_stop = len(channel.messages)
+        await asyncio.sleep(20 * TIME_SCALE)
+
+        assert ctx.sent == ["⏹️ Story stopped."]
+        assert running.cancelled() and queued.cancelled()
+        assert 1 <= sent_before_stop < 10
+        assert len(channel.messages) == sent_before_stop
+        assert not any(message.startswith("queued") for message in channel.messages)
+        # other channels keep their story
+        assert len(other.messages) == 3
+
+        await cog.story_stop.callback(cog, ctx)
+        assert ctx.sent[-1] == "There is no story running in this channel."
+
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+import json
+import os
+from datetime import datetime, timezone
+from loguru import logger
+
+# Priority classes (lower value = more important)
+PRIORITY_LIVE = 0
+PRIORITY_MATCHES = 1
+PRIORITY_STANDINGS = 2
+PRIORITY_INJURIES = 3
+PRIORITY_PREFETCH = 4
+
+# Calls kept in reserve for more important requests: a request is only sent
+# while the remaining budget is above the reserve of its priority class
+DEFAULT_RESERVED_CALLS = {
+    PRIORITY_LIVE: 0,
+    PRIORITY_MATCHES: 5,
+    PRIORITY_STANDINGS: 10,
+    PRIORITY_INJURIES: 20,
+    PRIORITY_PREFETCH: 30,
+}
+
+DEFAULT_DAILY_BUDGET = 100
+
+
+class APIBudget:
+    """Persistent per-host ledger of upstream API calls against a daily budget"""
+
+    def __init__(
+        self, ledger_path="./api_budget.json", daily_budgets=None, reserved_calls=None
+    ):
+        self.ledger_path = ledger_path
+        self.daily_budgets = daily_budgets or {}
+        self.reserved_calls = reserved_calls or DEFAULT_RESERVED_CALLS
+
+        self.day = self._today()
+        self.calls = {}
+        self.denied = {}
+        self._load()
+
+    @staticmethod
+    def _today():
+        # RapidAPI quotas reset at midnight UTC
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def _load(self):
+        if not os.path.exists(self.ledger_path):
+            return
+        try:
+            with open(self.ledger_path, "r", encoding="utf-8") as f:
+                ledger = json.load(f)
+            if ledger.get("day") == self.day:
+                self.calls = ledger.get("calls", {})
+                self.denied = ledger.get("denied", {})
+        except Exception as e:
+            logger.error(f"Error loading API budget ledger: {e}")
+
+    def _save(self):
+        ledger = {"day": self.day, "calls": self.calls, "denied": self.denied}
+        tmp_path = f"{self.ledger_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(ledger, f, indent=2)
+            os.replace(tmp_path, self.ledger_path)
+        except Exception as e:
+            logger.error(f"Error saving API budget ledger: {e}")
+
+    def _roll_over(self):
+        """Start a fresh ledger when the UTC day changes"""
+        today = self._today()
+        if today != self.day:
+            self.day = today
+            self.calls = {}
+            self.denied = {}
+
+    def get_budget(self, api_name):
+        return self.daily_budgets.get(api_name, DEFAULT_DAILY_BUDGET)
+
+    def get_remaining(self, api_name):
+        self._roll_over()
+        return max(self.get_budget(api_name) - self.calls.get(api_name, 0), 0)
+
+    def can_spend(self, api_name, priority=PRIORITY_LIVE):
+        """Check whether a request of this priority may spend a call now"""
+        reserve = self.reserved_calls.get(priority, 0)
+        return self.get_remaining(api_name) > reserve
+
+    def allow(self, api_name, priority=PRIORITY_LIVE):
+        """Like can_spend, but counts and logs denied requests"""
+        if self.can_spend(api_name, priority):
+            return True
+
+        remaining = self.get_remaining(api_name)
+        reserve = self.reserved_calls.get(priority, 0)
+        self.denied[api_name] = self.denied.get(api_name, 0) + 1
+        self._save()
+        logger.warning(
+            f"API budget for {api_name}: {remaining} calls left, "
+            f"priority {priority} request denied (reserve {reserve})"
+        )
+        return False
+
+    def record_call(self, api_name):
+        """Record one upstream call against today's budget"""
+        self._roll_over()
+        self.calls[api_name] = self.calls.get(api_name, 0) + 1
+        self._save()
+
+    def refund_call(self, api_name):
+        """Take back a recorded call that the upstream does not bill (e.g. a 304)"""
+        self._roll_over()
+        if self.calls.get(api_name, 0) > 0:
+            self.calls[api_name] -= 1
+            self._save()
+
+    def get_stats(self):
+        self._roll_over()
+        return {
+            api_name: {
+                "used": self.calls.get(api_name, 0),
+                "budget": self.get_budget(api_name),
+                "remaining": self.get_remaining(api_name),
+                "denied": self.denied.get(api_name, 0),
+            }
+            for api_name in sorted(set(self.daily_budgets) | set(self.calls))
+        }
@@ -1,66 +1,402 @@
-import hashlib
 import os
-import pickle
+import threading
+import time
 from datetime import datetime, timedelta
 from loguru import logger
+from utils.atomic_file import (
+    LOCK_FILE,
+    KeyedLock,
+    atomic_write,
+    file_lock,
+    is_internal_file,
+)
+from utils.cache_entry import (
+    ENTRY_HEADER,
+    ENTRY_LIFETIME_OFFSET,
+    CacheEntryError,
+    decode_entry,
+    decode_header,
+    decode_legacy_entry,
+    decode_validators,
+    encode_entry,
+    encode_lifetime,
+)
+from utils.cache_policy import get_cache_ttl
+from utils.memory_cache import MemoryCache
+from utils.request_key import get_legacy_cache_key, get_request_key
 
 
 class APICache:
 
-    def __init__(self, cache_dir="./cache", expiration_hours=24):
+    def __init__(
+        self,
+        cache_dir="./cache",
+        expiration_hours=24,
+        memory_max_entries=64,
+        memory_max_bytes=32 * 1024 * 1024,
+        ttl_policy=get_cache_ttl,
+        file_locking=False,
+    ):
         self.cache_dir = cache_dir
         self.expiration_delta = timedelta(hours=expiration_hours)
 
+        # per entry TTL derived from endpoint and payload, expiration_delta is the fallback
+        self.ttl_policy = ttl_policy
+
+        # hot entries are served from memory, the directory is the durable tier
+        self.memory = MemoryCache(memory_max_entries, memory_max_bytes)
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_corrupt = 0
+
+        # writes are atomic renames serialized per key, the optional file lock
+        # lets several bot processes share one cache directory
+        self.key_locks = KeyedLock()
+        self.file_locking = file_locking
+        self.lock_path = os.path.join(cache_dir, LOCK_FILE)
+
+        # access recency/frequency for the janitor, and entries being read
+        # from disk (which must not be evicted until the read is done)
+        self.last_access = {}
+        self.access_counts = {}
+        self.readers = {}
+        self.readers_lock = threading.Lock()
+        self.evictions = 0
+        self.expired_removed = 0
+
+        # creation time of the payload last returned or stored per key,
+        # lets derived data (e.g. rendered embeds) detect a refresh
+        self.versions = {}
+
         # Create cache directory if it doesn't exist
         if not os.path.exists(cache_dir):
             os.makedirs(cache_dir)
 
-    def _get_cache_key(self, url, params=None):
-        key_data = f"{url}_{str(params)}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+    def _get_cache_key(self, url, params=None, headers=None):
+        return get_request_key("GET", url, params, headers)
 
-    def get(self, url, params=None):
-        cache_key = self._get_cache_key(url, params)
-        cache_path = os.path.join(self.cache_dir, cache_key)
+    def get(self, url, params=None, headers=None):
+        entry = self.get_entry(url, params, max_stale=timedelta(0), headers=headers)
+        if entry is not None and datetime.now() < entry[1]:
+            return entry[0]
+        return None
 
-        if os.path.exists(cache_path):
-            try:
-                with open(cache_path, "rb") as f:
-                    cached_data = pickle.load(f)
+    def get_stale(self, url, params=None, headers=None):
+        """Return cached data even if expired, or None if nothing is cached"""
+        entry = self.get_entry(url, params, headers=headers)
+        if entry is not None:
+            return entry[0]
+        return None
 
-                # check if cache is expired
-                if datetime.now() - cached_data["timestamp"] < self.expiration_delta:
-                    return cached_data["data"]
-                else:
+    def get_entry(self, url, params=None, max_stale=None, headers=None):
+        """
+        Return (data, expires_at) for a cached entry, expired or not, or None
+
+        Args:
+            max_stale: Entries expired for longer than this (timedelta) are a miss
+                       and their payload is not decoded, None accepts any age
+            headers: Request headers, only those the response varies on matter
+        """
+        cache_key = self._get_cache_key(url, params, headers)
+
+        # first tier: memory (only holds fresh entries)
+        entry = self.memory.get(cache_key)
+        if entry is not None:
+            self._touch(cache_key)
+            return entry
+
+        # second tier: disk, freshness is checked from the header alone
+        cache_path = os.path.join(self.cache_dir, cache_key)
+        with self.readers_lock:
+            self.readers[cache_key] = self.readers.get(cache_key, 0) + 1
+        try:
+            with file_lock(self.lock_path, False, self.file_locking), open(
+                cache_path, "rb"
+            ) as f:
+                header_bytes = f.read(ENTRY_HEADER.size)
+                header = decode_header(header_bytes, os.fstat(f.fileno()).st_size)
+                expires_at = header.expires_at
+                now = datetime.now()
+                if max_stale is not None and now >= expires_at + max_stale:
+                    self.disk_misses += 1
                     logger.info(f"Cache expired for {url}")
-            except Exception as e:
-                logger.error(f"Error loading cache: {e}")
+                    return None
+                raw_data = header_bytes + f.read()
+            _, data = decode_entry(raw_data)
+        except FileNotFoundError:
+            self.disk_misses += 1
+            return None
+        except (CacheEntryError, OSError) as e:
+            logger.warning(f"Dropping unreadable cache entry for {url}: {e}")
+            self.disk_corrupt += 1
+            self.disk_misses += 1
+            self._remove_file(cache_path)
+            return None
+        finally:
+            with self.readers_lock:
+                if self.readers[cache_key] == 1:
+                    del self.readers[cache_key]
+                else:
+                    self.readers[cache_key] -= 1
 
-        return None
+        self._touch(cache_key)
+        self.versions[cache_key] = header.created_at
+        if now < expires_at:
+            self.disk_hits += 1
+            self.memory.set(cache_key, expires_at, data, len(raw_data))
+        else:
+            self.disk_misses += 1
+            logger.info(f"Cache expired for {url}")
+        return data, expires_at
 
-    def set(self, url, data, params=None):
-        cache_key = self._get_cache_key(url, params)
+    def set(self, url, data, params=None, headers=None, validators=None):
+        cache_key = self._get_cache_key(url, params, headers)
         cache_file = os.path.join(self.cache_dir, cache_key)
 
         try:
-            cache_data = {"timestamp": datetime.now(), "data": data}
-            with open(cache_file, "wb") as f:
-                pickle.dump(cache_data, f)
-            return True
+            ttl = self.expiration_delta
+            if self.ttl_policy is not None:
+                ttl = self.ttl_policy(url, params, data, self.expiration_delta)
+            created_at = time.time()
+            raw_data = encode_entry(data, ttl, created_at, validators)
+            with self.key_locks(cache_key), file_lock(
+                self.lock_path, True, self.file_locking
+            ):
+                atomic_write(cache_file, raw_data)
         except Exception as e:
             logger.error(f"Error saving cache: {e}")
+            self.memory.remove(cache_key)
             return False
 
-    def clear(self, url=None, params=None):
-        if url:
+        # write-through: disk first, then memory
+        self._touch(cache_key)
+        self.versions[cache_key] = created_at
+        self.memory.set(
+            cache_key,
+            datetime.fromtimestamp(created_at) + ttl,
+            data,
+            len(raw_data),
+        )
+        return True
+
+    def get_validators(self, url, params=None, headers=None):
+        """Stored response validators of an entry ({} if none), read without decoding the payload"""
+        cache_key = self._get_cache_key(url, params, headers)
+        cache_path = os.path.join(self.cache_dir, cache_key)
+        try:
+            with file_lock(self.lock_path, False, self.file_locking), open(
+                cache_path, "rb"
+            ) as f:
+                header = decode_header(
+                    f.read(ENTRY_HEADER.size), os.fstat(f.fileno()).st_size
+                )
+                f.seek(header.validators_offset)
+                return decode_validators(f.read(header.validators_length))
+        except (CacheEntryError, OSError):
+            return {}
+
+    def renew(self, url, params=None, headers=None):
+        """
+        Restart the TTL of an entry the upstream confirmed unchanged (304 Not Modified)
+
+        Only the lifetime fields of the header are rewritten, the payload stays as is
+
+        Returns:
+            (data, payload_length) of the renewed entry, or None if it is gone
+        """
+        cache_key = self._get_cache_key(url, params, headers)
+        cache_path = os.path.join(self.cache_dir, cache_key)
+        try:
+            with self.key_locks(cache_key), file_lock(
+                self.lock_path, True, self.file_locking
+            ):
+                with open(cache_path, "rb") as f:
+                    raw_data = f.read()
+                header, data = decode_entry(raw_data)
+
+                ttl = self.expiration_delta
+                if self.ttl_policy is not None:
+                    ttl = self.ttl_policy(url, params, data, self.expiration_delta)
+                created_at = time.time()
+                fd = os.open(cache_path, os.O_WRONLY)
+                try:
+                    os.pwrite(
+                        fd, encode_lifetime(ttl, created_at), ENTRY_LIFETIME_OFFSET
+                    )
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+        except FileNotFoundError:
+            return None
+        except (CacheEntryError, OSError) as e:
+            logger.warning(f"Dropping unreadable cache entry for {url}: {e}")
+            self.disk_corrupt += 1
+            self._remove_file(cache_path)
+            return None
+
+        # the payload is unchanged, so derived data keeps its version
+        self._touch(cache_key)
+        self.versions.setdefault(cache_key, header.created_at)
+        self.memory.set(
+            cache_key, datetime.fromtimestamp(created_at) + ttl, data, len(raw_data)
+        )
+        return data, header.payload_length
+
+    def get_version(self, url, params=None, headers=None):
+        """Creation time of the payload last returned or stored for a request, or None"""
+        return self.versions.get(self._get_cache_key(url, params, headers))
+
+    def _touch(self, cache_key):
+        self.last_access[cache_key] = time.time()
+        self.access_counts[cache_key] = self.access_counts.get(cache_key, 0) + 1
+
+    def scan_entries(self):
+        """
+        Header information of every entry on disk
+
+        Returns:
+            List of dicts with key, size, expires (epoch, None if unreadable),
+            last_access (epoch, file mtime if not accessed by this process) and accesses
+        """
+        entries = []
+        for cache_key in os.listdir(self.cache_dir):
+            if is_internal_file(cache_key):
+                continue
+            cache_path = os.path.join(self.cache_dir, cache_key)
+            try:
+                with open(cache_path, "rb") as f:
+                    stat = os.fstat(f.fileno())
+                    try:
+                        header = decode_header(f.read(ENTRY_HEADER.size), stat.st_size)
+                        expires = header.created_at + header.ttl
+                    except CacheEntryError:
+                        expires = None
+            except FileNotFoundError:
+                continue
+            entries.append(
+                {
+                    "key": cache_key,
+                    "size": stat.st_size,
+                    "expires": expires,
+                    "last_access": self.last_access.get(cache_key, stat.st_mtime),
+                    "accesses": self.access_counts.get(cache_key, 0),
+                }
+            )
+        return entries
+
+    def evict(self, cache_key, expired=False):
+        """Remove an entry from both tiers unless it is being read, returning whether it was removed"""
+        with self.key_locks(cache_key), file_lock(
+            self.lock_path, True, self.file_locking
+        ):
+            with self.readers_lock:
+                if self.readers.get(cache_key):
+                    return False
+                self._remove_file(os.path.join(self.cache_dir, cache_key))
+        self.memory.remove(cache_key)
+        self.last_access.pop(cache_key, None)
+        self.access_counts.pop(cache_key, None)
+        self.versions.pop(cache_key, None)
+        if expired:
+            self.expired_removed += 1
+        else:
+            self.evictions += 1
+        return True
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def migrate_legacy_keys(self, known_requests):
+        """
+        Move entries stored under the legacy key to the canonical request key
+
+        Entries written before the entry format (pickles) are rewritten as
+        entries keeping their original creation time, unreadable ones are dropped.
+
+        Args:
+            known_requests: (url, params) pairs as previously passed to the cache
+        Returns:
+            Number of migrated entries
+        """
+        migrated = 0
+        for url, params in known_requests:
+            legacy_path = os.path.join(
+                self.cache_dir, get_legacy_cache_key(url, params)
+            )
             cache_key = self._get_cache_key(url, params)
+            cache_path = os.path.join(self.cache_dir, cache_key)
+            if legacy_path == cache_path or not os.path.exists(legacy_path):
+                continue
+            with self.key_locks(cache_key), file_lock(
+                self.lock_path, True, self.file_locking
+            ):
+                if os.path.exists(cache_path):
+                    # a newer entry already exists under the canonical key
+                    self._remove_file(legacy_path)
+                    continue
+                try:
+                    with open(legacy_path, "rb") as f:
+                        raw_data = f.read()
+                    if not self._is_entry(raw_data):
+                        raw_data = self._convert_legacy_entry(url, params, raw_data)
+                    atomic_write(cache_path, raw_data)
+                    migrated += 1
+                except (CacheEntryError, OSError) as e:
+                    logger.warning(
+                        f"Dropping unreadable legacy cache entry for {url}: {e}"
+                    )
+                self._remove_file(legacy_path)
+        return migrated
+
+    @staticmethod
+    def _is_entry(raw_data):
+        try:
+            decode_header(raw_data, len(raw_data))
+            return True
+        except CacheEntryError:
+            return False
+
+    def _convert_legacy_entry(self, url, params, raw_data):
+        """Entry bytes of a pickled entry, with the TTL the current policy gives it"""
+        data, created_at, ttl = decode_legacy_entry(raw_data)
+        if ttl is None:
+            ttl = self.expiration_delta
+            if self.ttl_policy is not None:
+                ttl = self.ttl_policy(url, params, data, self.expiration_delta)
+        return encode_entry(data, ttl, created_at)
+
+    def clear(self, url=None, params=None, headers=None):
+        if url:
+            cache_key = self._get_cache_key(url, params, headers)
+            self.memory.remove(cache_key)
+            self.versions.pop(cache_key, None)
             cache_file = os.path.join(self.cache_dir, cache_key)
             if os.path.exists(cache_file):
                 os.remove(cache_file)
                 return True
         else:
+            self.memory.clear()
+            self.versions.clear()
             for file in os.listdir(self.cache_dir):
-                os.remove(os.path.join(self.cache_dir, file))
+                if not is_internal_file(file):
+                    os.remove(os.path.join(self.cache_dir, file))
             logger.info("Cache cleared")
             return True
         return False
+
+    def get_stats(self):
+        """Hit/miss/eviction statistics per cache tier"""
+        return {
+            "memory": self.memory.get_stats(),
+            "disk": {
+                "hits": self.disk_hits,
+                "misses": self.disk_misses,
+                "corrupt": self.disk_corrupt,
+                "evictions": self.evictions,
+                "expired_removed": self.expired_removed,
+            },
+        }
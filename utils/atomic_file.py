@@ -0,0 +1,89 @@
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, file locking becomes a no-op
+    fcntl = None
+
+# name of the lock file shared by every process using a cache directory
+LOCK_FILE = ".lock"
+
+
+def atomic_write(path, data):
+    """
+    Write bytes to path so readers see either the old or the new file, never a partial one
+
+    The data is written to a temporary file in the same directory, fsynced and renamed over path
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def is_internal_file(filename):
+    """Lock and temporary files (dotfiles) are not cache entries"""
+    return filename.startswith(".")
+
+
+@contextmanager
+def file_lock(lock_path, exclusive=True, enabled=True):
+    """
+    Advisory lock shared between processes (fcntl.flock on lock_path)
+
+    Args:
+        lock_path: Lock file, created if missing
+        exclusive: Exclusive (writer) lock, otherwise a shared (reader) lock
+        enabled: Skip locking entirely when False or when fcntl is unavailable
+    """
+    if not enabled or fcntl is None:
+        yield
+        return
+
+    with open(lock_path, "a+b") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class KeyedLock:
+    """One lock per key, dropped once no thread holds or waits for it"""
+
+    def __init__(self):
+        self.guard = threading.Lock()
+        self.locks = {}
+
+    @contextmanager
+    def __call__(self, key):
+        with self.guard:
+            lock, users = self.locks.get(key, (None, 0))
+            if lock is None:
+                lock = threading.Lock()
+            self.locks[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self.guard:
+                lock, users = self.locks[key]
+                if users == 1:
+                    del self.locks[key]
+                else:
+                    self.locks[key] = (lock, users - 1)
@@ -0,0 +1,176 @@
+import json
+import pickle
+import struct
+import time
+import zlib
+from datetime import datetime
+
+# Cache entry format:
+#   magic (4s) | version (B) | created at epoch (d) | TTL seconds (d)
+#   | payload length (I) | payload crc32 (I) | validators length (H)
+#   | payload (compact JSON) | validators (JSON, e.g. {"etag": ...})
+# the header alone is enough to decide freshness, the payload is only
+# decoded (and checksummed) when the data is actually needed
+ENTRY_MAGIC = b"NFLC"
+ENTRY_FORMAT_VERSION = 2
+ENTRY_HEADER = struct.Struct("<4sBddIIH")
+
+# version 1 entries have no validators length (nor validators), they are
+# still read so an upgrade does not throw away the cache
+ENTRY_HEADER_V1 = struct.Struct("<4sBddII")
+ENTRY_HEADERS = {1: ENTRY_HEADER_V1, ENTRY_FORMAT_VERSION: ENTRY_HEADER}
+ENTRY_PREFIX = struct.Struct("<4sB")
+
+# created at and TTL, rewritten in place when a 304 renews an entry
+ENTRY_LIFETIME = struct.Struct("<dd")
+ENTRY_LIFETIME_OFFSET = 5
+
+
+class CacheEntryError(Exception):
+    """Raised when a cache entry is corrupted, truncated or of an unknown version"""
+
+    pass
+
+
+class EntryHeader:
+    """Fixed-size header of a cache entry"""
+
+    __slots__ = (
+        "created_at",
+        "ttl",
+        "payload_length",
+        "checksum",
+        "validators_length",
+        "header_size",
+    )
+
+    def __init__(
+        self,
+        created_at,
+        ttl,
+        payload_length,
+        checksum,
+        validators_length=0,
+        header_size=ENTRY_HEADER.size,
+    ):
+        self.created_at = created_at
+        self.ttl = ttl
+        self.payload_length = payload_length
+        self.checksum = checksum
+        self.validators_length = validators_length
+        self.header_size = header_size
+
+    @property
+    def expires_at(self):
+        return datetime.fromtimestamp(self.created_at + self.ttl)
+
+    @property
+    def entry_size(self):
+        return self.header_size + self.payload_length + self.validators_length
+
+    @property
+    def validators_offset(self):
+        return self.header_size + self.payload_length
+
+    def is_fresh(self, now=None):
+        return (now or time.time()) < self.created_at + self.ttl
+
+
+def encode_entry(data, ttl, created_at=None, validators=None):
+    """
+    Encode JSON-serializable data with a TTL (timedelta) into entry bytes
+
+    Args:
+        validators: Response validators for conditional requests ({"etag": ..., "last_modified": ...})
+    """
+    if created_at is None:
+        created_at = time.time()
+    payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8"
+    )
+    validators_bytes = b""
+    if validators:
+        validators_bytes = json.dumps(validators, separators=(",", ":")).encode("utf-8")
+    header = ENTRY_HEADER.pack(
+        ENTRY_MAGIC,
+        ENTRY_FORMAT_VERSION,
+        created_at,
+        ttl.total_seconds(),
+        len(payload),
+        zlib.crc32(payload),
+        len(validators_bytes),
+    )
+    return header + payload + validators_bytes
+
+
+def encode_lifetime(ttl, created_at=None):
+    """Bytes to write at ENTRY_LIFETIME_OFFSET to renew an entry without touching its payload"""
+    if created_at is None:
+        created_at = time.time()
+    return ENTRY_LIFETIME.pack(created_at, ttl.total_seconds())
+
+
+def decode_header(data, entry_size=None):
+    """
+    Decode the header of an entry
+
+    Args:
+        data: At least the first ENTRY_HEADER.size bytes of the entry (or the whole
+            entry if it is shorter)
+        entry_size: Total size of the entry file, checked against the payload length if given
+    """
+    if len(data) < ENTRY_PREFIX.size:
+        raise CacheEntryError("Truncated cache entry header")
+    magic, version = ENTRY_PREFIX.unpack_from(data)
+    header_struct = ENTRY_HEADERS.get(version)
+    if magic != ENTRY_MAGIC or header_struct is None:
+        raise CacheEntryError(f"Unknown cache entry format {magic!r} v{version}")
+    if len(data) < header_struct.size:
+        raise CacheEntryError("Truncated cache entry header")
+
+    header = EntryHeader(
+        *header_struct.unpack_from(data)[2:], header_size=header_struct.size
+    )
+    if entry_size is not None and entry_size != header.entry_size:
+        raise CacheEntryError(
+            f"Cache entry is {entry_size} bytes, header expects {header.entry_size}"
+        )
+    return header
+
+
+def decode_entry(data):
+    """Decode full entry bytes into (header, data), verifying length and checksum"""
+    header = decode_header(data, len(data))
+    payload = memoryview(data)[header.header_size : header.validators_offset]
+    if zlib.crc32(payload) != header.checksum:
+        raise CacheEntryError("Cache entry checksum mismatch")
+    try:
+        return header, json.loads(bytes(payload).decode("utf-8"))
+    except ValueError as e:
+        raise CacheEntryError(f"Corrupted cache entry payload: {e}")
+
+
+def decode_validators(data):
+    """Decode the validators section of an entry ({} if it has none)"""
+    if not data:
+        return {}
+    try:
+        return json.loads(bytes(data).decode("utf-8"))
+    except ValueError as e:
+        raise CacheEntryError(f"Corrupted cache entry validators: {e}")
+
+
+def decode_legacy_entry(data):
+    """
+    Decode a pickled entry written before the entry format
+
+    Only used to migrate the cache directory, entries are never written as pickles.
+
+    Returns:
+        (data, created_at epoch, ttl timedelta or None if the entry has none)
+    """
+    try:
+        entry = pickle.loads(data)
+        return entry["data"], entry["timestamp"].timestamp(), entry.get("ttl")
+    except Exception as e:
+        raise CacheEntryError(f"Unreadable legacy cache entry: {e}")
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from loguru import logger
+
+EVICTION_POLICIES = ("lru", "lfu")
+
+
+class CacheJanitor:
+    """Bound the API cache directory and the match archive, and remove long-expired entries"""
+
+    def __init__(
+        self,
+        api_cache,
+        match_archive=None,
+        max_bytes=256 * 1024 * 1024,
+        max_entries=1000,
+        archive_max_bytes=64 * 1024 * 1024,
+        archive_max_entries=5000,
+        policy="lru",
+        expired_grace=24 * 60 * 60,
+        interval=60 * 60,
+    ):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy '{policy}'")
+        self.api_cache = api_cache
+        self.match_archive = match_archive
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.archive_max_bytes = archive_max_bytes
+        self.archive_max_entries = archive_max_entries
+        self.policy = policy
+
+        # expired entries are kept this many seconds as stale fallback
+        # (e.g. once the daily API budget is exhausted) before removal
+        self.expired_grace = expired_grace
+        self.interval = interval
+
+        self.sweeps = 0
+        self.last_sweep = None
+        self.archive_evictions = 0
+
+    def _eviction_order(self, entry):
+        """Sort key, entries sorting first are evicted first"""
+        if self.policy == "lfu":
+            return entry["accesses"], entry["last_access"]
+        return (entry["last_access"],)
+
+    def sweep_cache(self, now=None):
+        """Remove long-expired entries, then evict until the directory is within bounds"""
+        now = now or time.time()
+        kept = []
+        expired = 0
+        for entry in self.api_cache.scan_entries():
+            # unreadable entries (expires None) are removed right away
+            if entry["expires"] is None or entry["expires"] + self.expired_grace < now:
+                if self.api_cache.evict(entry["key"], expired=True):
+                    expired += 1
+                    continue
+            kept.append(entry)
+
+        total_bytes = sum(entry["size"] for entry in kept)
+        total_entries = len(kept)
+        evicted = 0
+        for entry in sorted(kept, key=self._eviction_order):
+            if total_bytes <= self.max_bytes and total_entries <= self.max_entries:
+                break
+            # entries being read are skipped, they can go in a later sweep
+            if self.api_cache.evict(entry["key"]):
+                total_bytes -= entry["size"]
+                total_entries -= 1
+                evicted += 1
+        return expired, evicted
+
+    def sweep_archive(self):
+        """Drop least recently used matches over the bounds and compact away superseded records"""
+        archive = self.match_archive
+        stats = archive.get_stats()
+        live_bytes = stats["bytes"] - stats["dead_bytes"]
+
+        # snapshot taken under the archive lock, the event loop keeps appending
+        # while the sweep runs in a worker thread
+        # without access times, earlier appended (older) matches go first
+        drop_match_ids = []
+        total_entries = stats["entries"]
+        candidates = sorted(
+            archive.get_eviction_candidates(),
+            key=lambda candidate: (candidate[1], candidate[2]),
+        )
+        for match_id, _, _, length in candidates:
+            if (
+                live_bytes <= self.archive_max_bytes
+                and total_entries <= self.archive_max_entries
+            ):
+                break
+            drop_match_ids.append(match_id)
+            live_bytes -= length
+            total_entries -= 1
+
+        if drop_match_ids or stats["dead_bytes"] > live_bytes:
+            archive.compact(drop_match_ids)
+            self.archive_evictions += len(drop_match_ids)
+        return len(drop_match_ids)
+
+    def sweep(self):
+        start = time.perf_counter()
+        expired, evicted = self.sweep_cache()
+        archive_evicted = 0
+        if self.match_archive is not None:
+            archive_evicted = self.sweep_archive()
+        self.sweeps += 1
+        self.last_sweep = time.time()
+        logger.info(
+            f"Cache sweep: {expired} expired, {evicted} evicted, "
+            f"{archive_evicted} matches dropped in {time.perf_counter() - start:.2f}s"
+        )
+
+    async def run(self):
+        """Sweep forever, file I/O runs off the event loop"""
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                logger.error(f"Cache sweep failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def get_stats(self):
+        """Directory size, entry counts and eviction totals per cache"""
+        entries = self.api_cache.scan_entries()
+        cache_stats = self.api_cache.get_stats()
+        stats = {
+            "api_cache": {
+                "entries": len(entries),
+                "bytes": sum(entry["size"] for entry in entries),
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": cache_stats["disk"]["evictions"],
+                "expired_removed": cache_stats["disk"]["expired_removed"],
+            },
+            "memory": cache_stats["memory"],
+            "sweeps": self.sweeps,
+            "last_sweep": self.last_sweep,
+        }
+        if self.match_archive is not None:
+            stats["match_archive"] = {
+                **self.match_archive.get_stats(),
+                "max_entries": self.archive_max_entries,
+                "max_bytes": self.archive_max_bytes,
+                "evictions": self.archive_evictions,
+            }
+        return stats
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+from utils.nfl_schedule import is_live_state
+
+# TTL bounds used by the policy
+LIVE_TTL = timedelta(minutes=2)
+LIVE_MATCH_TTL = timedelta(seconds=30)
+MIN_TTL = timedelta(minutes=5)
+MAX_SEASON_TTL = timedelta(days=3)
+FINISHED_TTL = timedelta(days=7)
+INJURIES_TTL = timedelta(hours=6)
+PAST_SEASON_TTL = timedelta(days=30)
+
+# a game still "Scheduled" this long after kickoff was most likely postponed,
+# before that the API is just slow to flip it to "In Progress"
+LATE_KICKOFF_WINDOW = timedelta(hours=6)
+
+# a season (year Y) ends with the Super Bowl in February of Y + 1
+SEASON_END_MONTH = 3
+
+
+def _parse_game_date(game):
+    return datetime.fromisoformat(game["date"].replace("Z", "+00:00"))
+
+
+def _is_live(game, now):
+    """Being played, or scheduled with a kickoff that passed within LATE_KICKOFF_WINDOW"""
+    state = game["state"]["description"]
+    if is_live_state(state):
+        return True
+    if state != "Scheduled":
+        return False
+    try:
+        game_date = _parse_game_date(game)
+    except (ValueError, KeyError):
+        return False
+    return now - LATE_KICKOFF_WINDOW <= game_date <= now
+
+
+def _ttl_until_next_kickoff(games, now):
+    """TTL lasting until the next scheduled kickoff, bounded by MIN_TTL and MAX_SEASON_TTL"""
+    next_kickoff = None
+    for game in games:
+        if game["state"]["description"] != "Scheduled":
+            continue
+        try:
+            game_date = _parse_game_date(game)
+        except (ValueError, KeyError):
+            continue
+        if game_date > now and (next_kickoff is None or game_date < next_kickoff):
+            next_kickoff = game_date
+
+    if next_kickoff is None:
+        # nothing left to play, scores can no longer change
+        return FINISHED_TTL
+    return max(MIN_TTL, min(next_kickoff - now, MAX_SEASON_TTL))
+
+
+def _matches_ttl(data, now):
+    games = data["data"]
+    if any(_is_live(game, now) for game in games):
+        return LIVE_TTL
+    return _ttl_until_next_kickoff(games, now)
+
+
+def _match_ttl(data, now):
+    games = list(data)
+    if any(_is_live(game, now) for game in games):
+        return LIVE_MATCH_TTL
+    return _ttl_until_next_kickoff(games, now)
+
+
+def _season_end(year):
+    return datetime(year + 1, SEASON_END_MONTH, 1, tzinfo=timezone.utc)
+
+
+def _standings_ttl(params, default_ttl, now):
+    year = (params or {}).get("year")
+    if year is not None and str(year).isdigit() and now >= _season_end(int(year)):
+        return PAST_SEASON_TTL
+    return default_ttl
+
+
+def get_cache_ttl(url, params, data, default_ttl):
+    """
+    Derive how long a cached response stays fresh from its endpoint and payload
+
+    Args:
+        url: Requested URL
+        params: Request query parameters
+        data: Parsed JSON response
+        default_ttl: TTL used when no rule matches
+    """
+    now = datetime.now(timezone.utc)
+    path = urlparse(url).path.rstrip("/")
+
+    try:
+        if path.endswith("/matches"):
+            return _matches_ttl(data, now)
+        if "/matches/" in path:
+            return _match_ttl(data, now)
+        if path.endswith("/standings"):
+            return _standings_ttl(params, default_ttl, now)
+        if path.endswith("/nfl-team-injuries"):
+            return INJURIES_TTL
+    except (AttributeError, KeyError, TypeError):
+        # unexpected payload shape, fall back to the default
+        pass
+    return default_ttl
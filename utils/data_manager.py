@@ -1,6 +1,7 @@
-import random
+from types import MappingProxyType
 from loguru import logger
 from utils.api_cache import APICache
+from utils.story_templates import TemplateRegistry
 from utils.read_json import (
     load_characters,
     load_nfl_team_character_mapping,
@@ -10,6 +11,14 @@ from utils.read_json import (
 
 DATA_CACHE_EXPIRATION_HOUR = 24
 
+
+def normalize_key(key):
+    """Normalize a team/character key or name ("Green Bay " -> "green_bay")"""
+    if key is None:
+        return None
+    return str(key).strip().lower().replace(" ", "_")
+
+
 class DataManager:
 
     def __init__(self):
@@ -21,97 +30,168 @@ class DataManager:
             self.nfl_team_character_mapping_data = load_nfl_team_character_mapping()
             self.characters_data = load_characters()
             self.storyline_data = load_storyline()
+            self._build_indexes()
+            self.story_templates = TemplateRegistry(self.storyline_data)
             logger.debug("✅ Loaded all static data")
         except Exception as e:
             logger.error(f"❌ Error loading static data: {e}")
 
-        # load cache
-        self.cache = APICache(cache_dir="./cache", expiration_hours=DATA_CACHE_EXPIRATION_HOUR)
+        # load cache (per entry TTL comes from the shared cache policy)
+        self.cache = APICache(
+            cache_dir="./cache", expiration_hours=DATA_CACHE_EXPIRATION_HOUR
+        )
         logger.debug("✅ Loaded API Cache")
 
+    def _build_indexes(self):
+        """Build read-only lookup tables so every getter is a single dict hit"""
+        teams = {
+            normalize_key(team_key): team
+            for team_key, team in self.nfl_teams_data.items()
+        }
+        characters = {
+            normalize_key(char_key): character
+            for char_key, character in self.characters_data.items()
+        }
+        character_key_by_team_key = {
+            normalize_key(team_key): normalize_key(char_key)
+            for team_key, char_key in self.nfl_team_character_mapping_data.items()
+        }
+        team_key_by_character_key = {}
+        for team_key, char_key in character_key_by_team_key.items():
+            # keep the first team like the previous linear scan did
+            team_key_by_character_key.setdefault(char_key, team_key)
+
+        team_by_id = {}
+        team_by_nfl_api_id = {}
+        team_by_abbreviation = {}
+        team_by_api_name = {}
+        teams_by_conference_division = {}
+        for team in teams.values():
+            team_by_id[team["id"]] = team
+            team_by_nfl_api_id[team["nflApiId"]] = team
+            team_by_abbreviation[normalize_key(team["abbreviation"])] = team
+
+            # the highlight API uses nickname as "name" and full name as "displayName"
+            team_by_api_name[normalize_key(team["nickname"])] = team
+            team_by_api_name[normalize_key(team["name"])] = team
+
+            conference = team["conference"]
+            division = team["division"]
+            for group_key in [
+                (None, None),
+                (conference, None),
+                (None, division),
+                (conference, division),
+            ]:
+                teams_by_conference_division.setdefault(group_key, []).append(team)
+
+        self.teams_by_key = MappingProxyType(teams)
+        self.characters_by_key = MappingProxyType(characters)
+        self.character_key_by_team_key = MappingProxyType(character_key_by_team_key)
+        self.team_key_by_character_key = MappingProxyType(team_key_by_character_key)
+        self.team_by_id = MappingProxyType(team_by_id)
+        self.team_by_nfl_api_id = MappingProxyType(team_by_nfl_api_id)
+        self.team_by_abbreviation = MappingProxyType(team_by_abbreviation)
+        self.team_by_api_name = MappingProxyType(team_by_api_name)
+        self.teams_by_conference_division = MappingProxyType(
+            {
+                group_key: tuple(group_teams)
+                for group_key, group_teams in teams_by_conference_division.items()
+            }
+        )
+        # highlight API team id -> resolved team + character, for game rendering
+        team_record_by_id = {}
+        for team_key, team in teams.items():
+            char_key = character_key_by_team_key.get(team_key)
+            character = characters.get(char_key)
+            if character is None:
+                logger.warning(f"No character assigned to team '{team_key}'")
+                continue
+            team_record_by_id[team["id"]] = MappingProxyType(
+                {
+                    "team_key": team_key,
+                    "team": team,
+                    "character_key": char_key,
+                    "character": character,
+                }
+            )
+        self.team_record_by_id = MappingProxyType(team_record_by_id)
+
+        self.all_team_keys = tuple(teams)
+        self.all_character_keys = tuple(characters)
+
     ### CHARACTERS AND NFL TEAMS ###
 
     def get_character_key_by_team_key(self, team_key):
-        team_key_formatted = team_key.lower().replace(" ", "_")
-        return self.nfl_team_character_mapping_data[team_key_formatted]
+        return self.character_key_by_team_key.get(normalize_key(team_key))
 
     def get_team_key_by_character_key(self, character_key):
-        character_key_formatted = character_key.lower().replace(" ", "_")
-        for team_key, char_key in self.nfl_team_character_mapping_data.items():
-            if char_key == character_key_formatted:
-                return team_key
-        return None
+        return self.team_key_by_character_key.get(normalize_key(character_key))
 
     def get_teams_key_by_conference_and_division(self, conference=None, division=None):
-        filtered_teams = list(self.nfl_teams_data.keys())
-        if conference:
-            filtered_teams = [
-                team
-                for team in filtered_teams
-                if self.nfl_teams_data[team]["conference"] == conference.upper()
-            ]
-        if division:
-            filtered_teams = [
-                team
-                for team in filtered_teams
-                if self.nfl_teams_data[team]["division"] == division.capitalize()
-            ]
-        return [self.nfl_teams_data[team] for team in filtered_teams]
+        group_key = (
+            conference.upper() if conference else None,
+            division.capitalize() if division else None,
+        )
+        return list(self.teams_by_conference_division.get(group_key, ()))
 
     def get_team_data_by_team_key(self, team_key):
-        team_key_formatted = team_key.lower().replace(" ", "_")
-        return self.nfl_teams_data.get(team_key_formatted, None)
+        return self.teams_by_key.get(normalize_key(team_key))
+
+    def get_team_data_by_team_id(self, team_id):
+        return self.team_by_id.get(team_id)
+
+    def get_team_data_by_nfl_api_id(self, nfl_api_id):
+        return self.team_by_nfl_api_id.get(nfl_api_id)
+
+    def get_team_data_by_abbreviation(self, abbreviation):
+        return self.team_by_abbreviation.get(normalize_key(abbreviation))
+
+    def get_team_data_by_api_name(self, api_team_name):
+        return self.team_by_api_name.get(normalize_key(api_team_name))
+
+    def get_team_record_by_team_id(self, team_id):
+        """Team and character record for a highlight API team id (or None)"""
+        return self.team_record_by_id.get(team_id)
+
+    def resolve_game_teams(self, game):
+        """
+        Resolve both teams of a highlight API game to team + character records
+
+        Returns:
+            (home_record, away_record, unresolved_team_ids)
+        """
+        home_team_id = game["homeTeam"]["id"]
+        away_team_id = game["awayTeam"]["id"]
+        home_record = self.team_record_by_id.get(home_team_id)
+        away_record = self.team_record_by_id.get(away_team_id)
+        unresolved_team_ids = [
+            team_id
+            for team_id, record in [
+                (home_team_id, home_record),
+                (away_team_id, away_record),
+            ]
+            if record is None
+        ]
+        return home_record, away_record, unresolved_team_ids
 
     def get_character_data_by_character_key(self, character_key):
-        character_key_formatted = character_key.lower().replace(" ", "_")
-        return self.characters_data.get(character_key_formatted, None)
+        return self.characters_by_key.get(normalize_key(character_key))
 
     def get_all_team_keys(self):
-        return list(self.nfl_teams_data.keys())
+        return list(self.all_team_keys)
 
     def get_all_character_keys(self):
-        return list(self.characters_data.keys())
+        return list(self.all_character_keys)
 
-    ### STORYLINE ###
-    def get_storyline_random_big_win(self):
-        return random.choice(self.storyline_data["storylines"]["big_win"]["templates"])
+    ### STORYLINE AND GAME EVENTS ###
 
-    def get_storyline_random_small_win(self):
-        return random.choice(
-            self.storyline_data["storylines"]["small_win"]["templates"]
-        )
+    def get_random_template(self, group, category):
+        """
+        Get a random compiled template
 
-    def get_storyline_random_tie(self):
-        return random.choice(self.storyline_data["storylines"]["tie"]["templates"])
-
-    def get_storyline_random_upcoming(self):
-        return random.choice(self.storyline_data["storylines"]["upcoming"]["templates"])
-
-    ### GAME EVENTS ###
-    def get_game_event_random_touchdown(self):
-        return random.choice(
-            self.storyline_data["game_events"]["touchdown"]["templates"]
-        )
-
-    def get_game_event_random_interception(self):
-        return random.choice(
-            self.storyline_data["game_events"]["interception"]["templates"]
-        )
-
-    def get_game_event_random_field_goal(self):
-        return random.choice(
-            self.storyline_data["game_events"]["field_goal"]["templates"]
-        )
-
-    def get_game_event_random_missed_field_goal(self):
-        return random.choice(
-            self.storyline_data["game_events"]["missed_field_goal"]["templates"]
-        )
-
-    def get_game_event_random_fumble(self):
-        return random.choice(self.storyline_data["game_events"]["fumble"]["templates"])
-
-    def get_game_event_random_downs(self):
-        return random.choice(
-            self.storyline_data["game_events"]["turnover_on_downs"]["templates"]
-        )
+        Args:
+            group: "storylines" or "game_events"
+            category: Category in the group, e.g. "big_win" or "touchdown"
+        """
+        return self.story_templates.get_random(group, category)
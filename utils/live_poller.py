@@ -0,0 +1,270 @@
+import argparse
+import asyncio
+import glob
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from loguru import logger
+from utils.nfl_schedule import is_live_state
+
+# Poll intervals in seconds
+DEFAULT_POLL_INTERVAL = 60
+FOURTH_QUARTER_POLL_INTERVAL = 30
+HALFTIME_POLL_INTERVAL = 300
+IDLE_POLL_INTERVAL = 600
+
+
+def get_event_key(event):
+    """Identity of a drive event, a drive that gets its result is a new event"""
+    start = event.get("start") or {}
+    team = event.get("team") or {}
+    return (
+        team.get("id"),
+        start.get("period"),
+        start.get("clock"),
+        event.get("result"),
+    )
+
+
+def diff_match_snapshots(previous, current):
+    """
+    Get what changed between two snapshots of the same match
+
+    Args:
+        previous: Previous game object (or None for the first snapshot)
+        current: Current game object
+
+    Returns:
+        List of updates, each a dict with "type" of "score", "event" or "state"
+    """
+    current_state = current["state"]
+    current_score = (current_state.get("score") or {}).get("current")
+
+    # first snapshot is the baseline, only the current score is pushed
+    if previous is None:
+        return [{"type": "score", "game": current, "score": current_score}]
+
+    updates = []
+    previous_state = previous["state"]
+    previous_score = (previous_state.get("score") or {}).get("current")
+    if current_score != previous_score:
+        updates.append({"type": "score", "game": current, "score": current_score})
+
+    seen_events = {get_event_key(event) for event in previous.get("events") or []}
+    for event in current.get("events") or []:
+        if event.get("result") and get_event_key(event) not in seen_events:
+            updates.append({"type": "event", "game": current, "event": event})
+
+    if current_state.get("description") != previous_state.get("description"):
+        updates.append(
+            {
+                "type": "state",
+                "game": current,
+                "description": current_state.get("description"),
+            }
+        )
+    return updates
+
+
+def format_live_update(update):
+    game = update["game"]
+    home = game["homeTeam"]["abbreviation"]
+    away = game["awayTeam"]["abbreviation"]
+    if update["type"] == "score":
+        return f"📣 **{home} {update['score']} {away}**"
+    if update["type"] == "event":
+        event = update["event"]
+        period = (event.get("end") or {}).get("period", "")
+        return (
+            f"🏈 [{home} vs {away}] {event['team']['displayName']}: "
+            f"**{event['result']}** ({event.get('description', '')}) {period}"
+        )
+    return f"⏱️ [{home} vs {away}] {update['description']}"
+
+
+def is_live(game):
+    """Whether a game is polled, any other state ends a tracked game"""
+    return is_live_state(game["state"].get("description"))
+
+
+def is_halftime(state):
+    description = (state.get("description") or "").lower()
+    return "half" in description or (
+        state.get("period") == 2 and not state.get("clock")
+    )
+
+
+class LivePoller:
+    """Poll in-progress matches and push score changes and new events to channels"""
+
+    def __init__(
+        self,
+        fetch_matches,
+        fetch_match,
+        budget=None,
+        api_name="nfl_ncca_api",
+        sleep=None,
+    ):
+        """
+        Args:
+            fetch_matches: Coroutine function returning the /matches response
+            fetch_match: Coroutine function returning the /matches/{id} response
+            budget: Optional APIBudget used to slow down under budget pressure
+            api_name: Budget ledger name of the API polled
+            sleep: Coroutine function used to wait between polls
+        """
+        self.fetch_matches = fetch_matches
+        self.fetch_match = fetch_match
+        self.budget = budget
+        self.api_name = api_name
+        self.sleep = sleep or asyncio.sleep
+
+        self.subscribers = {}
+        self.snapshots = {}
+        self.task = None
+
+    def subscribe(self, channel):
+        """Push live updates to channel, starting the poller if needed"""
+        self.subscribers[channel.id] = channel
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def unsubscribe(self, channel):
+        self.subscribers.pop(channel.id, None)
+        if not self.subscribers and self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def stop(self):
+        self.subscribers.clear()
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def get_poll_interval(self, live_games):
+        """Seconds to wait before the next poll of the live games"""
+        states = [game["state"] for game in live_games]
+        if any(state.get("period", 0) >= 4 for state in states):
+            interval = FOURTH_QUARTER_POLL_INTERVAL
+        elif states and all(is_halftime(state) for state in states):
+            interval = HALFTIME_POLL_INTERVAL
+        else:
+            interval = DEFAULT_POLL_INTERVAL
+
+        # spread the remaining daily budget until the UTC reset
+        if self.budget is not None and live_games:
+            now = datetime.now(timezone.utc)
+            reset_at = (now + timedelta(days=1)).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+            remaining = max(self.budget.get_remaining(self.api_name), 1)
+            budget_interval = (reset_at - now).total_seconds() * len(live_games)
+            interval = max(interval, budget_interval / remaining)
+        return interval
+
+    async def poll_once(self):
+        """Poll live matches once, returning (updates, live_games)"""
+        response = await self.fetch_matches()
+        live_games = [
+            game for game in (response or {}).get("data", []) if is_live(game)
+        ]
+        live_ids = {game["id"] for game in live_games}
+
+        updates = []
+        for game_id in list(self.snapshots):
+            if game_id not in live_ids:
+                # game just ended, fetch it once more for the final events
+                live_ids.add(game_id)
+        for game_id in sorted(live_ids):
+            try:
+                match_response = await self.fetch_match(game_id)
+            except Exception as e:
+                logger.error(f"Live poll of match {game_id} failed: {e}")
+                continue
+            if not match_response:
+                continue
+            current = match_response[0]
+            updates += diff_match_snapshots(self.snapshots.get(game_id), current)
+            if is_live(current):
+                self.snapshots[game_id] = current
+            else:
+                self.snapshots.pop(game_id, None)
+        return updates, live_games
+
+    async def push(self, updates):
+        for update in updates:
+            message = format_live_update(update)
+            for channel in list(self.subscribers.values()):
+                try:
+                    await channel.send(message)
+                except Exception as e:
+                    logger.error(f"Failed to push live update to {channel.id}: {e}")
+
+    async def run(self):
+        while self.subscribers:
+            try:
+                updates, live_games = await self.poll_once()
+            except Exception as e:
+                logger.error(f"Live poll failed: {e}")
+                updates, live_games = [], []
+            await self.push(updates)
+
+            if live_games or self.snapshots:
+                interval = self.get_poll_interval(live_games)
+            else:
+                interval = IDLE_POLL_INTERVAL
+            logger.debug(f"Next live poll in {interval:.0f}s")
+            await self.sleep(interval)
+
+
+class SnapshotReplay:
+    """Replay recorded /matches/{id} snapshots (one JSON file per poll) from disk"""
+
+    def __init__(self, snapshot_dir):
+        self.snapshot_paths = sorted(glob.glob(os.path.join(snapshot_dir, "*.json")))
+        self.position = 0
+        self.current = None
+
+    def _load(self):
+        with open(self.snapshot_paths[self.position], "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def is_finished(self):
+        return self.position >= len(self.snapshot_paths)
+
+    async def fetch_matches(self):
+        """Each poll moves to the next snapshot, whatever the state of the game"""
+        if self.is_finished():
+            self.current = None
+            return {"data": []}
+        self.current = self._load()
+        self.position += 1
+        return {"data": [self.current[0]]}
+
+    async def fetch_match(self, match_id):
+        return self.current
+
+
+class _PrintChannel:
+    id = 0
+
+    async def send(self, message):
+        print(message)
+
+
+async def _replay(snapshot_dir):
+    replay = SnapshotReplay(snapshot_dir)
+    poller = LivePoller(replay.fetch_matches, replay.fetch_match)
+    channel = _PrintChannel()
+    poller.subscribers[channel.id] = channel
+    while not replay.is_finished():
+        updates, live_games = await poller.poll_once()
+        await poller.push(updates)
+        print(f"-- next poll in {poller.get_poll_interval(live_games):.0f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded match snapshots")
+    parser.add_argument("snapshot_dir", help="Directory of /matches/{id} snapshots")
+    args = parser.parse_args()
+    asyncio.run(_replay(args.snapshot_dir))
@@ -0,0 +1,365 @@
+import argparse
+import glob
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from loguru import logger
+from utils.atomic_file import LOCK_FILE, atomic_write, file_lock
+from utils.match_codec import (
+    COMPACT_MATCH_EXTENSION,
+    MatchFormatError,
+    decode_match,
+    encode_match,
+)
+
+# Archive record: magic (4s) | crc32 (I) | match id (Q) | length (I) | compact match
+RECORD_MAGIC = b"NFLR"
+RECORD_HEADER = struct.Struct("<4sIQI")
+
+ARCHIVE_FILE = "matches.archive"
+INDEX_FILE = "matches.index"
+
+
+class MatchArchive:
+    """Append-only archive of compact matches read through mmap with an ID -> (offset, length) index"""
+
+    def __init__(self, archive_dir="./match_cache", file_locking=True):
+        self.archive_dir = archive_dir
+        self.archive_path = os.path.join(archive_dir, ARCHIVE_FILE)
+        self.index_path = os.path.join(archive_dir, INDEX_FILE)
+
+        # appends are serialized within the process, and across processes
+        # sharing the directory unless file_locking is disabled
+        self.write_lock = threading.RLock()
+        # one compaction at a time, it reads the archive without the lock
+        self.compact_lock = threading.Lock()
+        self.file_locking = file_locking
+        self.lock_path = os.path.join(archive_dir, LOCK_FILE)
+
+        if not os.path.exists(archive_dir):
+            os.makedirs(archive_dir)
+        if not os.path.exists(self.archive_path):
+            open(self.archive_path, "wb").close()
+
+        self.index = {}
+        self.archive_size = 0
+        self.last_access = {}
+        self.archive_file = None
+        self.mm = None
+        with self._locked():
+            self._load_index()
+
+    @contextmanager
+    def _locked(self):
+        with self.write_lock, file_lock(self.lock_path, True, self.file_locking):
+            yield
+
+    ### INDEX ###
+
+    def _load_index(self):
+        """Load the index file and recover records appended after it was written"""
+        archive_size = os.path.getsize(self.archive_path)
+        indexed_size = 0
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    index_data = json.load(f)
+                if index_data["archive_size"] <= archive_size:
+                    self.index = {
+                        int(match_id): tuple(location)
+                        for match_id, location in index_data["matches"].items()
+                    }
+                    indexed_size = index_data["archive_size"]
+            except Exception as e:
+                logger.error(f"Error loading match archive index, rebuilding: {e}")
+                self.index = {}
+
+        self.archive_size = indexed_size
+        if indexed_size < archive_size:
+            self._recover(indexed_size, archive_size)
+
+    def _recover(self, start, archive_size):
+        """Scan records from start, truncating a partially written last record"""
+        with open(self.archive_path, "r+b") as f:
+            offset = start
+            while offset + RECORD_HEADER.size <= archive_size:
+                f.seek(offset)
+                magic, crc, match_id, length = RECORD_HEADER.unpack(
+                    f.read(RECORD_HEADER.size)
+                )
+                payload_offset = offset + RECORD_HEADER.size
+                if magic != RECORD_MAGIC or payload_offset + length > archive_size:
+                    break
+                if zlib.crc32(f.read(length)) != crc:
+                    break
+                self.index[match_id] = (payload_offset, length)
+                offset = payload_offset + length
+
+            if offset < archive_size:
+                logger.warning(
+                    f"Truncating {archive_size - offset} bytes of incomplete match archive records"
+                )
+                f.truncate(offset)
+        self.archive_size = offset
+        self._save_index()
+
+    def _sync(self):
+        """Pick up records appended by other processes (caller holds the lock)"""
+        archive_size = os.path.getsize(self.archive_path)
+        if archive_size != self.archive_size:
+            self._unmap()
+            self.index = {}
+            self._load_index()
+
+    def _save_index(self):
+        index_data = {
+            "archive_size": self.archive_size,
+            "matches": {
+                str(match_id): list(loc) for match_id, loc in self.index.items()
+            },
+        }
+        atomic_write(self.index_path, json.dumps(index_data).encode("utf-8"))
+
+    ### READ ###
+
+    def _map(self):
+        """(Re)map the archive so it covers every indexed record"""
+        self._unmap()
+        if os.path.getsize(self.archive_path) == 0:
+            return
+        self.archive_file = open(self.archive_path, "rb")
+        self.mm = mmap.mmap(self.archive_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _unmap(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        if self.archive_file is not None:
+            self.archive_file.close()
+            self.archive_file = None
+
+    def __contains__(self, match_id):
+        return int(match_id) in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def get_bytes(self, match_id):
+        """Compact bytes of a match, or None if it is not archived"""
+        match_id = int(match_id)
+        if match_id not in self.index and self.archive_size != os.path.getsize(
+            self.archive_path
+        ):
+            with self._locked():
+                self._sync()
+
+        # the location is looked up under the lock too, compaction moves
+        # records and unmaps the archive while a reader waits for the lock
+        with self.write_lock:
+            location = self.index.get(match_id)
+            if location is None:
+                return None
+            offset, length = location
+            self.last_access[match_id] = time.time()
+            if self.mm is None or offset + length > len(self.mm):
+                self._map()
+            return self.mm[offset : offset + length]
+
+    def get_live_bytes(self):
+        """Bytes of the latest record of every match (the archive size after compaction)"""
+        with self.write_lock:
+            return sum(RECORD_HEADER.size + length for _, length in self.index.values())
+
+    def get_stats(self):
+        with self.write_lock:
+            live_bytes = self.get_live_bytes()
+            return {
+                "entries": len(self.index),
+                "bytes": self.archive_size,
+                "dead_bytes": self.archive_size - live_bytes,
+            }
+
+    def get_eviction_candidates(self):
+        """Snapshot of (match id, last access, offset, length) of every archived match"""
+        with self.write_lock:
+            return [
+                (match_id, self.last_access.get(match_id, 0), offset, length)
+                for match_id, (offset, length) in self.index.items()
+            ]
+
+    def get(self, match_id):
+        """Lazily decoded match, or None if it is not archived"""
+        data = self.get_bytes(match_id)
+        if data is None:
+            return None
+        return decode_match(data)
+
+    ### WRITE ###
+
+    def append(self, match_id, compact_bytes):
+        """Append a compact match, a later record of the same id replaces the earlier one"""
+        match_id = int(match_id)
+        header = RECORD_HEADER.pack(
+            RECORD_MAGIC, zlib.crc32(compact_bytes), match_id, len(compact_bytes)
+        )
+        with self._locked():
+            self._sync()
+            with open(self.archive_path, "ab") as f:
+                offset = f.tell()
+                f.write(header + compact_bytes)
+                f.flush()
+                os.fsync(f.fileno())
+
+            self.index[match_id] = (offset + RECORD_HEADER.size, len(compact_bytes))
+            self.archive_size = offset + len(header) + len(compact_bytes)
+            self._save_index()
+
+    def append_match(self, game):
+        self.append(game["id"], encode_match(game))
+
+    def compact(self, drop_match_ids=()):
+        """
+        Rewrite the archive keeping only the latest record of each match
+
+        The new archive is written and fsynced without holding the lock, so
+        reads and appends carry on meanwhile. Only the swap takes the lock,
+        copying the records appended during the rewrite into the new archive.
+        """
+        drop_match_ids = {int(match_id) for match_id in drop_match_ids}
+        with self.compact_lock:
+            while not self._compact(drop_match_ids):
+                logger.info("Match archive replaced during compaction, retrying")
+            for match_id in drop_match_ids:
+                self.last_access.pop(match_id, None)
+
+    def _compact(self, drop_match_ids):
+        """One compaction attempt, False if another process replaced the archive meanwhile"""
+        with self._locked():
+            self._sync()
+            snapshot = dict(self.index)
+            # keeps reading the snapshot archive even if it gets replaced
+            source = open(self.archive_path, "rb")
+            source_inode = os.fstat(source.fileno()).st_ino
+
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.archive_dir, prefix=f".{ARCHIVE_FILE}.", suffix=".tmp"
+        )
+        try:
+            with source, os.fdopen(fd, "wb") as f:
+                new_index = self._write_records(f, source, snapshot, drop_match_ids)
+                f.flush()
+                os.fsync(f.fileno())
+
+            with self._locked():
+                if os.stat(self.archive_path).st_ino != source_inode:
+                    os.remove(tmp_path)
+                    return False
+                self._sync()
+
+                # records appended while the new archive was written
+                appended = {
+                    match_id: location
+                    for match_id, location in self.index.items()
+                    if snapshot.get(match_id) != location
+                }
+                with open(tmp_path, "ab") as f, open(self.archive_path, "rb") as source:
+                    new_index.update(
+                        self._write_records(f, source, appended, drop_match_ids)
+                    )
+                    f.flush()
+                    os.fsync(f.fileno())
+                    archive_size = f.tell()
+
+                self._unmap()
+                os.replace(tmp_path, self.archive_path)
+                self.index = new_index
+                self.archive_size = archive_size
+                self._save_index()
+            return True
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _write_records(f, source, locations, drop_match_ids):
+        """Copy the records at locations from source to the end of f, returning their new index"""
+        new_index = {}
+        offset = f.tell()
+        for match_id in sorted(locations):
+            if match_id in drop_match_ids:
+                continue
+            payload_offset, length = locations[match_id]
+            source.seek(payload_offset - RECORD_HEADER.size)
+            record = source.read(RECORD_HEADER.size + length)
+            f.write(record)
+            new_index[match_id] = (offset + RECORD_HEADER.size, length)
+            offset += len(record)
+        return new_index
+
+    def close(self):
+        self._unmap()
+
+    ### MIGRATION ###
+
+    def migrate_match_files(self, delete_files=False):
+        """Import per-match <id>.json / <id>.nflm files of the archive directory"""
+        migrated = 0
+        paths = glob.glob(os.path.join(self.archive_dir, "*.json"))
+        paths += glob.glob(
+            os.path.join(self.archive_dir, f"*{COMPACT_MATCH_EXTENSION}")
+        )
+        for path in sorted(paths):
+            match_id = os.path.splitext(os.path.basename(path))[0]
+            if not match_id.isdigit():
+                continue
+            try:
+                if path.endswith(".json"):
+                    with open(path, "r", encoding="utf-8") as f:
+                        compact_bytes = encode_match(json.load(f)[0])
+                else:
+                    with open(path, "rb") as f:
+                        compact_bytes = f.read()
+                    decode_match(compact_bytes)
+            except (ValueError, KeyError, IndexError, MatchFormatError) as e:
+                logger.error(f"Skipping match file {path}: {e}")
+                continue
+
+            if int(match_id) not in self.index:
+                self.append(match_id, compact_bytes)
+                migrated += 1
+            if delete_files:
+                os.remove(path)
+        return migrated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Match archive tools")
+    parser.add_argument("action", choices=["migrate", "compact", "info"])
+    parser.add_argument("archive_dir", nargs="?", default="./match_cache")
+    parser.add_argument(
+        "--delete-files",
+        action="store_true",
+        help="Remove per-match files once migrated",
+    )
+    args = parser.parse_args()
+
+    archive = MatchArchive(args.archive_dir)
+    if args.action == "migrate":
+        count = archive.migrate_match_files(args.delete_files)
+        print(f"Migrated {count} matches into {archive.archive_path}")
+    elif args.action == "compact":
+        archive.compact()
+        print(f"Compacted {archive.archive_path}")
+    print(
+        f"{len(archive)} matches, {os.path.getsize(archive.archive_path)} bytes in {archive.archive_path}"
+    )
+    archive.close()
@@ -0,0 +1,236 @@
+import argparse
+import glob
+import json
+import os
+import struct
+import zlib
+from collections.abc import Mapping
+
+# Compact match format:
+#   magic (4s) | version (B) | index length (I) | index (JSON) | sections
+# index maps section name -> [offset, length] relative to the end of the index,
+# every section is zlib compressed compact JSON and only decoded when accessed
+MATCH_MAGIC = b"NFLM"
+MATCH_FORMAT_VERSION = 1
+MATCH_HEADER = struct.Struct("<4sBI")
+COMPACT_MATCH_EXTENSION = ".nflm"
+
+# top-level fields kept from /matches/{id}, everything else is dropped
+MATCH_FIELDS = [
+    "id",
+    "league",
+    "season",
+    "date",
+    "round",
+    "state",
+    "homeTeam",
+    "awayTeam",
+    "venue",
+    "forecast",
+]
+
+# event columns: (column name, path in the event); "plays" is dropped
+EVENT_COLUMNS = [
+    ("start_clock", ("start", "clock")),
+    ("start_period", ("start", "period")),
+    ("start_yard_line", ("start", "yardLine")),
+    ("end_clock", ("end", "clock")),
+    ("end_period", ("end", "period")),
+    ("end_yard_line", ("end", "yardLine")),
+    ("description", ("description",)),
+    ("is_scoring_play", ("isScoringPlay",)),
+]
+# columns holding few distinct values, stored as indexes into a string table
+INTERNED_COLUMNS = ["start_period", "end_period", "result"]
+
+
+class MatchFormatError(Exception):
+    """Raised when compact match bytes are corrupted or of an unknown version"""
+
+    pass
+
+
+def _compress(value):
+    return zlib.compress(
+        json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    )
+
+
+def _decompress(data):
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+def _encode_events(events):
+    """Encode events column by column with interned teams and strings"""
+    teams = []
+    team_indexes = {}
+    strings = []
+    string_indexes = {}
+
+    def intern_string(value):
+        if value not in string_indexes:
+            string_indexes[value] = len(strings)
+            strings.append(value)
+        return string_indexes[value]
+
+    columns = {name: [] for name, _ in EVENT_COLUMNS}
+    columns["team"] = []
+    columns["result"] = []
+    for event in events:
+        team = event.get("team")
+        team_id = None if team is None else team.get("id")
+        if team_id not in team_indexes:
+            team_indexes[team_id] = len(teams)
+            teams.append(team)
+        columns["team"].append(team_indexes[team_id])
+        columns["result"].append(event.get("result"))
+
+        for name, path in EVENT_COLUMNS:
+            value = event
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            columns[name].append(value)
+
+    for name in INTERNED_COLUMNS:
+        columns[name] = [intern_string(value) for value in columns[name]]
+
+    return {
+        "count": len(events),
+        "teams": teams,
+        "strings": strings,
+        "columns": columns,
+    }
+
+
+def _decode_events(encoded):
+    teams = encoded["teams"]
+    strings = encoded["strings"]
+    columns = dict(encoded["columns"])
+    for name in INTERNED_COLUMNS:
+        columns[name] = [strings[index] for index in columns[name]]
+
+    events = []
+    for i in range(encoded["count"]):
+        event = {
+            "start": {
+                "clock": columns["start_clock"][i],
+                "period": columns["start_period"][i],
+                "yardLine": columns["start_yard_line"][i],
+            },
+            "end": {
+                "clock": columns["end_clock"][i],
+                "period": columns["end_period"][i],
+                "yardLine": columns["end_yard_line"][i],
+            },
+            "team": teams[columns["team"][i]],
+            "result": columns["result"][i],
+            "description": columns["description"][i],
+            "isScoringPlay": columns["is_scoring_play"][i],
+        }
+        events.append(event)
+    return events
+
+
+def encode_match(game):
+    """Encode one game object of a /matches/{id} response into compact bytes"""
+    sections = {
+        "match": _compress({field: game.get(field) for field in MATCH_FIELDS}),
+        "events": _compress(_encode_events(game.get("events") or [])),
+    }
+
+    index = {}
+    offset = 0
+    for name, data in sections.items():
+        index[name] = [offset, len(data)]
+        offset += len(data)
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+
+    header = MATCH_HEADER.pack(MATCH_MAGIC, MATCH_FORMAT_VERSION, len(index_bytes))
+    return header + index_bytes + b"".join(sections.values())
+
+
+class CompactMatch(Mapping):
+    """Read-only game object decoding its sections on first access"""
+
+    def __init__(self, data):
+        data = memoryview(data)
+        if len(data) < MATCH_HEADER.size:
+            raise MatchFormatError("Truncated match header")
+        magic, version, index_length = MATCH_HEADER.unpack_from(data)
+        if magic != MATCH_MAGIC or version != MATCH_FORMAT_VERSION:
+            raise MatchFormatError(f"Unknown match format {magic!r} v{version}")
+
+        index_end = MATCH_HEADER.size + index_length
+        try:
+            self.index = json.loads(bytes(data[MATCH_HEADER.size : index_end]))
+        except ValueError as e:
+            raise MatchFormatError(f"Corrupted match index: {e}")
+        for offset, length in self.index.values():
+            if index_end + offset + length > len(data):
+                raise MatchFormatError("Truncated match section")
+
+        self.data = data
+        self.sections_offset = index_end
+        self.match = None
+        self.events = None
+
+    def _load_section(self, name):
+        offset, length = self.index[name]
+        start = self.sections_offset + offset
+        try:
+            return _decompress(self.data[start : start + length])
+        except (zlib.error, ValueError) as e:
+            raise MatchFormatError(f"Corrupted match section '{name}': {e}")
+
+    def __getitem__(self, key):
+        if key == "events":
+            if self.events is None:
+                self.events = _decode_events(self._load_section("events"))
+            return self.events
+        if self.match is None:
+            self.match = self._load_section("match")
+        return self.match[key]
+
+    def __iter__(self):
+        return iter(MATCH_FIELDS + ["events"])
+
+    def __len__(self):
+        return len(MATCH_FIELDS) + 1
+
+
+def decode_match(data):
+    """Decode compact bytes into a lazily decoded CompactMatch"""
+    return CompactMatch(data)
+
+
+def convert_match_cache(match_cache_dir, delete_json=False):
+    """Convert every <id>.json of a match cache directory to the compact format"""
+    results = []
+    for json_path in sorted(glob.glob(os.path.join(match_cache_dir, "*.json"))):
+        with open(json_path, "r", encoding="utf-8") as f:
+            response = json.load(f)
+        compact_bytes = encode_match(response[0])
+
+        compact_path = json_path[: -len(".json")] + COMPACT_MATCH_EXTENSION
+        with open(compact_path, "wb") as f:
+            f.write(compact_bytes)
+        results.append((json_path, os.path.getsize(json_path), len(compact_bytes)))
+        if delete_json:
+            os.remove(json_path)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert JSON match files to compact files"
+    )
+    parser.add_argument("match_cache_dir", nargs="?", default="./match_cache")
+    parser.add_argument(
+        "--delete-json", action="store_true", help="Remove JSON files once converted"
+    )
+    args = parser.parse_args()
+
+    for path, json_size, compact_size in convert_match_cache(
+        args.match_cache_dir, args.delete_json
+    ):
+        print(f"{path}: {json_size} B -> {compact_size} B")
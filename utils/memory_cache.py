@@ -0,0 +1,86 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+
+class MemoryCache:
+    """In-process LRU cache bounded by entry count and approximate bytes"""
+
+    def __init__(self, max_entries=64, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # the event loop and the cache janitor thread both change the entries
+        self.lock = threading.Lock()
+
+        # cache_key -> (expires_at, data, size), oldest first
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, cache_key):
+        """Return fresh (data, expires_at) for cache_key or None, marking it as recently used"""
+        with self.lock:
+            entry = self.entries.get(cache_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if datetime.now() >= entry[0]:
+                # expired entries are dropped, the disk tier decides what happens next
+                self._remove(cache_key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry[1], entry[0]
+
+    def set(self, cache_key, expires_at, data, size):
+        """Store data with its approximate size in bytes, evicting LRU entries"""
+        with self.lock:
+            self._remove(cache_key)
+
+            # entries bigger than the whole tier are only kept on disk
+            if size > self.max_bytes:
+                return False
+
+            self.entries[cache_key] = (expires_at, data, size)
+            self.total_bytes += size
+
+            while (
+                len(self.entries) > self.max_entries
+                or self.total_bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+            return True
+
+    def _remove(self, cache_key):
+        """Remove an entry (caller holds the lock)"""
+        entry = self.entries.pop(cache_key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+            return True
+        return False
+
+    def remove(self, cache_key):
+        with self.lock:
+            return self._remove(cache_key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+            }
@@ -0,0 +1,50 @@
+# Discord rejects messages longer than this
+DISCORD_MESSAGE_LIMIT = 2000
+
+
+def _split_message(message, max_length):
+    """Split a message longer than max_length, preferring line breaks"""
+    chunks = []
+    while len(message) > max_length:
+        split_at = message.rfind("\n", 0, max_length)
+        if split_at <= 0:
+            split_at = max_length
+        chunks.append(message[:split_at])
+        message = message[split_at:].lstrip("\n")
+    chunks.append(message)
+    return chunks
+
+
+def batch_lines(lines, max_length=DISCORD_MESSAGE_LIMIT, flush_delay=4):
+    """
+    Pack consecutive (message, delay) lines into as few messages as possible
+
+    A batch is flushed once its pauses add up to flush_delay seconds or the
+    next line would not fit, and the batch keeps the sum of its pauses, so a
+    story takes about as long as before with fewer sends.
+
+    Args:
+        lines: Iterable of (message, delay) pairs
+        max_length: Maximum characters per message
+        flush_delay: Accumulated pause (seconds) after which a batch is sent
+    """
+    batch = []
+    batch_length = 0
+    batch_delay = 0
+
+    for message, delay in lines:
+        for chunk in _split_message(message, max_length):
+            # +1 for the joining newline
+            if batch and batch_length + 1 + len(chunk) > max_length:
+                yield "\n".join(batch), batch_delay
+                batch, batch_length, batch_delay = [], 0, 0
+            batch_length += len(chunk) + (1 if batch else 0)
+            batch.append(chunk)
+        batch_delay += delay or 0
+
+        if batch_delay >= flush_delay:
+            yield "\n".join(batch), batch_delay
+            batch, batch_length, batch_delay = [], 0, 0
+
+    if batch:
+        yield "\n".join(batch), batch_delay
@@ -1,27 +1,184 @@
+import asyncio
 import os
+import time
+from datetime import datetime, timedelta
 from loguru import logger
-import requests
+import aiohttp
 import json
 
 from utils.api_cache import APICache
+from utils.api_budget import (
+    APIBudget,
+    PRIORITY_INJURIES,
+    PRIORITY_LIVE,
+    PRIORITY_MATCHES,
+    PRIORITY_STANDINGS,
+)
+from utils.match_archive import MatchArchive
+from utils.match_codec import (
+    COMPACT_MATCH_EXTENSION,
+    MatchFormatError,
+    decode_match,
+    encode_match,
+)
+from utils.nfl_schedule import Season
+from utils.request_key import get_canonical_request
+from utils.resilience import (
+    APIClientError,
+    APIConnectionError,
+    APIError,
+    APIRateLimitError,
+    APIResponseError,
+    APIServerError,
+    APITimeoutError,
+    BudgetExhaustedError,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    parse_retry_after,
+)
+from utils.season_store import SeasonStore
+from utils.single_flight import SingleFlight
+
+# /standings leagueName per conference
+CONFERENCE_LEAGUE_NAMES = {
+    "afc": "American Football Conference",
+    "nfc": "National Football Conference",
+}
+
+# _send_once result of a 304 Not Modified answer to a conditional request
+NOT_MODIFIED = object()
+
+# marks a cache directory whose entries were re-keyed to canonical request keys
+CACHE_KEYS_MIGRATED_FILE = ".keys-migrated"
+
+# Stale-while-revalidate: how long past expiry an entry may still be served
+# while it is refreshed in the background (None always waits for upstream)
+DEFAULT_MAX_STALE = {
+    "matches": timedelta(minutes=30),
+    "match": timedelta(seconds=30),
+    "standings": timedelta(hours=6),
+    "injuries": timedelta(hours=3),
+}
 
 
 class NFLAPIManager:
 
     def __init__(
-        self, cache_dir="./cache", match_cache_dir="./match_cache", expiration_hours=24
+        self,
+        cache_dir="./cache",
+        match_cache_dir="./match_cache",
+        expiration_hours=24,
+        api_timeout=30,
+        connect_timeout=10,
+        max_connections=20,
+        max_connections_per_host=5,
+        keepalive_timeout=60,
+        budget_ledger_path="./api_budget.json",
+        max_stale=None,
+        fan_out_concurrency=4,
+        fan_out_deadline=15,
+        retry_policy=None,
+        breaker_failure_threshold=5,
+        breaker_reset_timeout=30,
+        sleep=None,
+        not_modified_counts=None,
+        season_store_path="./season_store.json",
+        incremental_sync=None,
+        full_sync_hours=None,
     ):
 
-        self.apiCache = APICache(cache_dir, expiration_hours)
+        # lock cache files across processes when several bots share ./cache
+        # and the match archive
+        file_locking = os.getenv("CACHE_FILE_LOCKING", "false").lower() == "true"
+        self.apiCache = APICache(cache_dir, expiration_hours, file_locking=file_locking)
+
+        # concurrent identical GETs share one upstream request
+        self.single_flight = SingleFlight()
+
+        # per endpoint stale-while-revalidate bounds and running refreshes
+        self.max_stale = {**DEFAULT_MAX_STALE, **(max_stale or {})}
+        self.refresh_tasks = {}
+
+        # upstream calls per canonical request
+        self.upstream_requests = {}
 
-        # Set up cache directory for match data
+        # bounds of independent requests issued together (see fan_out)
+        self.fan_out_concurrency = fan_out_concurrency
+        self.fan_out_deadline = fan_out_deadline
+
+        # retries of idempotent GETs and one circuit breaker per API host
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breakers = {}
+        self.breaker_failure_threshold = breaker_failure_threshold
+        self.breaker_reset_timeout = breaker_reset_timeout
+        self.sleep = sleep or asyncio.sleep
+
+        # conditional GET counters, and whether a 304 uses a daily call
+        # (RapidAPI bills every request, so by default it does)
+        self.conditional_stats = {
+            "conditional_requests": 0,
+            "not_modified": 0,
+            "bytes_received": 0,
+            "bytes_saved": 0,
+        }
+        if not_modified_counts is None:
+            not_modified_counts = (
+                os.getenv("NOT_MODIFIED_COUNTS_AGAINST_BUDGET", "true").lower()
+                == "true"
+            )
+        self.not_modified_counts = not_modified_counts
+
+        # HTTP session settings (session is opened in start() and closed in close())
+        self.session = None
+        self.api_timeout = api_timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_timeout = keepalive_timeout
+
+        # Set up cache directory and archive for finished match data
         self.match_cache_dir = match_cache_dir
         if not os.path.exists(match_cache_dir):
             os.makedirs(match_cache_dir)
+        self.match_archive = MatchArchive(match_cache_dir, file_locking=file_locking)
+
+        # daily call budget per API host
+        self.budget = APIBudget(
+            budget_ledger_path,
+            daily_budgets={
+                "nfl_ncca_api": int(
+                    os.getenv("NFL_NCAA_HIGHLIGHT_API_DAILY_BUDGET", "100")
+                ),
+                "nfl_api": int(os.getenv("NFL_API_DAILY_BUDGET", "100")),
+            },
+        )
+
+        # Season schedule built from the latest /matches payload
+        self.season = None
+        self.season_payload = None
 
         self.current_year = os.getenv("CURRENT_YEAR")
         self.league = "NFL"
 
+        # incremental /matches sync: only dates whose games can still change are
+        # fetched and merged into a persisted store, the full season on a slow cadence
+        if incremental_sync is None:
+            incremental_sync = (
+                os.getenv("SEASON_SYNC_MODE", "incremental").lower() == "incremental"
+            )
+        if full_sync_hours is None:
+            full_sync_hours = float(os.getenv("FULL_SYNC_HOURS", "24"))
+        self.full_sync_interval = full_sync_hours * 60 * 60
+        self.season_store = None
+        if incremental_sync:
+            self.season_store = SeasonStore(season_store_path, self.current_year)
+        self.sync_stats = {"full_syncs": 0, "incremental_syncs": 0, "last_sync": None}
+
+        # one sync at a time, so a full sync never replaces games merged while
+        # its payload was in flight
+        self.season_sync_lock = asyncio.Lock()
+
         self.nfl_ncca_api_headers = {
             "x-rapidapi-key": os.getenv("NFL_NCAA_HIGHLIGHT_API_KEY"),
             "x-rapidapi-host": os.getenv("NFL_NCAA_HIGHLIGHT_API_HOST"),
@@ -36,7 +193,79 @@ class NFLAPIManager:
         }
         self.base_nfl_api_url = f"https://{os.getenv('NFL_API_HOST')}"
 
-    def _cached_request(
+    async def start(self):
+        """Open the pooled HTTP session shared by all API calls"""
+        if self.session is not None and not self.session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self.api_timeout, connect=self.connect_timeout
+        )
+        self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        logger.debug("✅ Opened NFL API HTTP session")
+
+    async def close(self):
+        """Close the pooled HTTP session"""
+        for task in list(self.refresh_tasks.values()):
+            task.cancel()
+        self.refresh_tasks.clear()
+
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+            logger.debug("✅ Closed NFL API HTTP session")
+        self.session = None
+        self.match_archive.close()
+
+    @staticmethod
+    def _drop_none(values):
+        """Remove unset values, aiohttp refuses None in params/headers"""
+        if values is None:
+            return None
+        return {key: value for key, value in values.items() if value is not None}
+
+    async def fan_out(self, requests, max_concurrency=None, deadline=None):
+        """
+        Run independent API calls concurrently, keeping the results that succeeded
+
+        Args:
+            requests: Dict of name -> zero-argument coroutine function, e.g. lambda: self.get_nfl_standings("afc")
+            max_concurrency: Calls running at once (defaults to fan_out_concurrency)
+            deadline: Seconds each call may take once started (defaults to fan_out_deadline)
+        Returns:
+            (results, errors) dicts by name, a failed or timed out call only appears in errors
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.fan_out_concurrency)
+        if deadline is None:
+            deadline = self.fan_out_deadline
+
+        async def run(request):
+            async with semaphore:
+                return await asyncio.wait_for(request(), deadline)
+
+        names = list(requests)
+        outcomes = await asyncio.gather(
+            *(run(requests[name]) for name in names), return_exceptions=True
+        )
+
+        results = {}
+        errors = {}
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                errors[name] = APITimeoutError(f"Timed out after {deadline}s")
+            elif isinstance(outcome, Exception):
+                errors[name] = outcome
+            else:
+                results[name] = outcome
+        for name, error in errors.items():
+            logger.error(f"Fan-out request {name} failed: {error}")
+        return results, errors
+
+    async def _cached_request(
         self,
         method,
         url,
@@ -44,134 +273,590 @@ class NFLAPIManager:
         params=None,
         json=None,
         use_cache=True,
-        api_timeout=30,
+        api_timeout=None,
+        api_name="nfl_ncca_api",
+        priority=PRIORITY_MATCHES,
+        max_stale=None,
+        revalidate=False,
     ):
-        """Make a request with caching for GET requests"""
+        """
+        Make a request with caching for GET requests
+
+        Args:
+            use_cache: False to skip the cache (no cached or stale data is returned)
+            revalidate: With use_cache False, still send the cached entry's validators
+                and store the response, NOT_MODIFIED is returned if it is unchanged
+        """
         logger.debug(f"Making request: {url}")
-        if method.lower() == "get" and use_cache:
-            # Try to get from cache first
-            cached_response = self.apiCache.get(url, params)
-            if cached_response is not None:
+
+        async def fetch():
+            return await self._request(
+                method,
+                url,
+                headers,
+                params,
+                json,
+                use_cache,
+                api_timeout,
+                api_name,
+                priority,
+                revalidate,
+            )
+
+        if method.lower() != "get" or not use_cache:
+            return await fetch()
+
+        # Try to get from cache first
+        cache_key = self.apiCache._get_cache_key(url, params, headers)
+        cached_entry = self.apiCache.get_entry(
+            url, params, max_stale=max_stale or timedelta(0), headers=headers
+        )
+        if cached_entry is not None:
+            cached_response, expires_at = cached_entry
+            now = datetime.now()
+            if now < expires_at:
                 logger.debug(f"CACHE HIT: {url}")
                 return cached_response
-            logger.debug(f"CACHE MISS: {url}")
-        # Make request - raise exception if timed out
+            if max_stale is not None and now < expires_at + max_stale:
+                logger.debug(f"CACHE STALE HIT: {url}")
+                self._schedule_refresh(cache_key, fetch)
+                return cached_response
+        logger.debug(f"CACHE MISS: {url}")
+
+        # Coalesce identical in-flight requests into one upstream call
+        return await self.single_flight.do(cache_key, fetch)
+
+    def _schedule_refresh(self, cache_key, fetch):
+        """Refresh a stale cache entry in the background, once per key"""
+        if cache_key in self.refresh_tasks:
+            return
+        task = asyncio.create_task(self._background_refresh(cache_key, fetch))
+        self.refresh_tasks[cache_key] = task
+        task.add_done_callback(lambda t: self.refresh_tasks.pop(cache_key, None))
+
+    async def _background_refresh(self, cache_key, fetch):
         try:
-            if method.lower() == "get":
-                response = requests.get(
-                    url, headers=headers, params=params, timeout=api_timeout
-                )
-            elif method.lower() == "post":
-                response = requests.post(
-                    url, headers=headers, params=params, json=json, timeout=api_timeout
-                )
+            await self.single_flight.do(cache_key, fetch)
         except Exception as e:
-            raise Exception(f"Request failed with error: {e}")
-        # Cache successful GET responses
-        if method.lower() == "get" and response.status_code == 200 and use_cache:
+            logger.error(f"Background refresh failed for {cache_key}: {e}")
+
+    async def _request(
+        self,
+        method,
+        url,
+        headers,
+        params,
+        json,
+        use_cache,
+        api_timeout,
+        api_name,
+        priority,
+        revalidate=False,
+    ):
+        """Make the upstream request (retrying idempotent GETs) and cache successful GET responses"""
+        if self.session is None or self.session.closed:
+            raise Exception("HTTP session is not started, call start() first")
+
+        is_get = method.lower() == "get"
+        store_response = is_get and (use_cache or revalidate)
+
+        # revalidate what is cached instead of downloading it again
+        validators = {}
+        if store_response:
+            validators = self.apiCache.get_validators(url, params, headers)
+
+        attempt = 0
+        while True:
+            attempt += 1
             try:
-                result = response.json()
-                self.apiCache.set(url, result, params)
+                result, response_validators = await self._send_once(
+                    method,
+                    url,
+                    headers,
+                    params,
+                    json,
+                    api_timeout,
+                    api_name,
+                    priority,
+                    validators,
+                )
+                if result is not NOT_MODIFIED:
+                    break
+
+                renewed = self.apiCache.renew(url, params, headers)
+                if renewed is not None:
+                    data, payload_length = renewed
+                    self.conditional_stats["bytes_saved"] += payload_length
+                    logger.debug(f"NOT MODIFIED, cache renewed: {url}")
+                    return NOT_MODIFIED if revalidate else data
+
+                # the entry was evicted meanwhile, ask for the full payload
+                validators = {}
+            except APIError as e:
+                delay = self.retry_policy.get_delay(attempt, e) if is_get else None
+                if delay is not None:
+                    logger.warning(
+                        f"Attempt {attempt} failed ({e}), retrying {url} in {delay:.1f}s"
+                    )
+                    await self.sleep(delay)
+                    continue
+
+                # serve stale data rather than failing while the host is unavailable
+                if is_get and use_cache and not isinstance(e, APIClientError):
+                    stale_response = self.apiCache.get_stale(url, params, headers)
+                    if stale_response is not None:
+                        logger.warning(f"{e}, serving stale cache: {url}")
+                        return stale_response
+                raise
+
+        # Cache successful GET responses
+        if store_response:
+            if self.apiCache.set(url, result, params, headers, response_validators):
                 logger.debug(f"CACHE SAVED: {url}")
-                return result
-            except Exception as e:
-                logger.error(f"Error parsing JSON or caching: {str(e)}")
-                return None
-        elif response.status_code == 200:
+        return result
+
+    def _get_request_timeout(self, api_timeout):
+        """
+        ClientTimeout for one request, the session default unless api_timeout is given
+
+        Passing timeout=None to aiohttp disables the timeout entirely, so it is never passed
+        """
+        if api_timeout is None:
+            return self.session.timeout
+        return aiohttp.ClientTimeout(total=api_timeout, connect=self.connect_timeout)
+
+    async def _send_once(
+        self,
+        method,
+        url,
+        headers,
+        params,
+        json,
+        api_timeout,
+        api_name,
+        priority,
+        validators=None,
+    ):
+        """
+        One upstream attempt, raising a classified APIError on failure
+
+        Returns:
+            (result, response validators), result is NOT_MODIFIED when the
+            validators show the cached payload is still current
+        """
+
+        # Keep the remaining daily calls for more important requests
+        if not self.budget.allow(api_name, priority):
+            raise BudgetExhaustedError(f"Daily API budget for {api_name} exhausted")
+
+        # fail fast while the host keeps failing
+        breaker = self.breakers.setdefault(
+            api_name,
+            CircuitBreaker(
+                api_name, self.breaker_failure_threshold, self.breaker_reset_timeout
+            ),
+        )
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit for {api_name} is open")
+
+        # conditional request headers (not part of the request identity)
+        request_headers = self._drop_none(headers) or {}
+        if validators:
+            self.conditional_stats["conditional_requests"] += 1
+            if validators.get("etag"):
+                request_headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                request_headers["If-Modified-Since"] = validators["last_modified"]
+
+        self.budget.record_call(api_name)
+        canonical_request = get_canonical_request(method, url, params, headers)
+        self.upstream_requests[canonical_request] = (
+            self.upstream_requests.get(canonical_request, 0) + 1
+        )
+        try:
+            async with self.session.request(
+                method.upper(),
+                url,
+                headers=request_headers,
+                params=self._drop_none(params),
+                json=json,
+                timeout=self._get_request_timeout(api_timeout),
+            ) as response:
+                status = response.status
+                if status == 304 and validators:
+                    self.conditional_stats["not_modified"] += 1
+                    if not self.not_modified_counts:
+                        self.budget.refund_call(api_name)
+                    result = NOT_MODIFIED
+                elif status == 200:
+                    body = await response.read()
+                    self.conditional_stats["bytes_received"] += len(body)
+                    try:
+                        result = await response.json(content_type=None)
+                    except Exception as e:
+                        raise APIResponseError(f"Error parsing JSON: {e}", status)
+                else:
+                    text = await response.text()
+                    message = f"Request failed: {status} - {text[:200]}"
+                    if status == 429:
+                        raise APIRateLimitError(
+                            message,
+                            retry_after=parse_retry_after(
+                                response.headers.get("Retry-After")
+                            ),
+                        )
+                    if status >= 500:
+                        raise APIServerError(message, status)
+                    raise APIClientError(message, status)
+        except APIError as e:
+            # the host answered, only retryable errors count against it
+            if e.retryable:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except asyncio.TimeoutError:
+            breaker.record_failure()
+            raise APITimeoutError(f"Request timed out: {url}")
+        except aiohttp.ClientError as e:
+            breaker.record_failure()
+            raise APIConnectionError(f"Request failed with error: {e}")
+        except BaseException:
+            breaker.release()
+            raise
+
+        breaker.record_success()
+        response_validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        return result, self._drop_none(response_validators)
+
+    def get_metrics(self):
+        """Counters describing API usage"""
+        return {
+            "single_flight": self.single_flight.get_stats(),
+            "circuit_breakers": {
+                api_name: breaker.get_stats()
+                for api_name, breaker in self.breakers.items()
+            },
+            "upstream_requests": dict(self.upstream_requests),
+            "background_refreshes": len(self.refresh_tasks),
+            "conditional": {
+                **self.conditional_stats,
+                "not_modified_counts_against_budget": self.not_modified_counts,
+            },
+            "cache": self.apiCache.get_stats(),
+            "budget": self.budget.get_stats(),
+            "season_sync": self.sync_stats,
+        }
+
+    def migrate_cache_keys(self, team_ids):
+        """
+        One-time move of cache entries written with the legacy cache key (and format)
+
+        Args:
+            team_ids: NFL API team ids whose injuries may be cached
+        """
+        marker_path = os.path.join(self.apiCache.cache_dir, CACHE_KEYS_MIGRATED_FILE)
+        if os.path.exists(marker_path):
+            return 0
+
+        matches_url, matches_params = self._get_matches_request()
+        known_requests = [(matches_url, matches_params)]
+        for conference in CONFERENCE_LEAGUE_NAMES:
+            known_requests.append(self._get_standings_request(conference))
+        for team_id in team_ids:
+            known_requests.append(
+                (f"{self.base_nfl_api_url}/nfl-team-injuries", {"id": str(team_id)})
+            )
+        migrated = self.apiCache.migrate_legacy_keys(known_requests)
+
+        # match ids are known from the (now re-keyed) season payload
+        season_response = self.apiCache.get_stale(matches_url, matches_params)
+        if season_response is not None:
+            migrated += self.apiCache.migrate_legacy_keys(
+                (f"{matches_url}/{game['id']}", None)
+                for game in season_response.get("data", [])
+            )
+
+        with open(marker_path, "w", encoding="utf-8") as f:
+            f.write(datetime.now().isoformat())
+        logger.info(f"Migrated {migrated} cache entries to canonical request keys")
+        return migrated
+
+    def get_budget_stats(self):
+        """Used and remaining daily calls per API host"""
+        return self.budget.get_stats()
+
+    def _get_matches_request(self):
+        """(url, params) of the season /matches request"""
+        full_url = f"{self.base_nfl_ncca_api_url}/matches"
+        params = {"league": self.league, "season": self.current_year}
+        return full_url, params
+
+    def _get_standings_request(self, conference):
+        """(url, params) of the /standings request of a conference ("afc" or "nfc")"""
+        full_url = f"{self.base_nfl_ncca_api_url}/standings"
+        params = {
+            "leagueName": CONFERENCE_LEAGUE_NAMES[conference],
+            "leagueType": self.league,
+            "year": self.current_year,
+        }
+        return full_url, params
+
+    def get_matches_version(self):
+        """Version of the season /matches payload (changes whenever it is refreshed)"""
+        if self.season_store is not None:
+            return self.season_store.version
+        full_url, params = self._get_matches_request()
+        return self.apiCache.get_version(full_url, params, self.nfl_ncca_api_headers)
+
+    def get_standings_version(self, conference):
+        """Version of the cached /standings payload of a conference"""
+        full_url, params = self._get_standings_request(conference)
+        return self.apiCache.get_version(full_url, params, self.nfl_ncca_api_headers)
+
+    async def get_nfl_all_matches(self, priority=PRIORITY_MATCHES):
+        """Get all NFL matches, from the incrementally synced season store if enabled"""
+        if self.season_store is not None:
+            return await self._sync_season(priority)
+        return await self._get_full_season_matches(priority)
+
+    async def _sync_season(self, priority):
+        """Refresh the season store (full or by date) and return its /matches shaped payload"""
+        async with self.season_sync_lock:
+            return await self._sync_season_locked(priority)
+
+    async def _sync_season_locked(self, priority):
+        store = self.season_store
+        full_sync = store.is_full_sync_due(self.full_sync_interval)
+        dates = []
+        if not full_sync:
+            dates = store.get_dates_to_sync()
+            if not dates:
+                return store.get_payload()
+
+        bytes_before = self.conditional_stats["bytes_received"]
+        if full_sync:
+            # straight from upstream, a cached (or stale fallback) season can be
+            # older than the games merged since and would roll them back, the
+            # cached season's validators still let an unchanged season answer 304
             try:
-                return response.json()
-            except Exception as e:
-                logger.error(f"Error parsing JSON: {str(e)}")
-                return None
+                response = await self._get_full_season_matches(
+                    priority, use_cache=False, revalidate=True
+                )
+                if response is NOT_MODIFIED and not len(store):
+                    # nothing to confirm, fill the store from the renewed cached season
+                    response = await self._get_full_season_matches(priority)
+                games = None if response is NOT_MODIFIED else response["data"]
+            except Exception:
+                if not len(store):
+                    raise
+                logger.warning("Full season sync failed, serving the season store")
+                return store.get_payload()
         else:
-            logger.error(f"Request failed: {response.status_code} - {response.text}")
-            return None
+            responses, errors = await self.fan_out(
+                {
+                    date: (lambda date=date: self._get_matches_by_date(date, priority))
+                    for date in dates
+                }
+            )
+            games = [
+                game for response in responses.values() for game in response["data"]
+            ]
 
-    async def get_nfl_all_matches(self):
-        """Get all NFL matches from API"""
+        start = time.perf_counter()
+        if games is None:
+            # the season is unchanged upstream, the store is confirmed as is
+            changed = store.confirm_full_sync()
+            games = store.games.values()
+        elif full_sync:
+            changed = store.replace(games)
+        else:
+            changed = store.merge(games)
+        merge_time = time.perf_counter() - start
 
-        full_url = f"{self.base_nfl_ncca_api_url}/matches"
+        mode = "full" if full_sync else "incremental"
+        self.sync_stats[f"{mode}_syncs"] += 1
+        self.sync_stats["last_sync"] = {
+            "mode": mode,
+            "dates": dates,
+            "games": len(games),
+            "changed": changed,
+            "bytes_received": self.conditional_stats["bytes_received"] - bytes_before,
+            "merge_ms": round(merge_time * 1000, 3),
+        }
+        logger.info(
+            f"Season sync ({mode}{' ' + ', '.join(dates) if dates else ''}): "
+            f"{len(games)} games, {changed} changed, "
+            f"{self.sync_stats['last_sync']['bytes_received']} B received, "
+            f"merged in {merge_time * 1000:.2f} ms"
+        )
+        return store.get_payload()
 
-        params = {"league": self.league, "season": self.current_year}
+    async def _get_matches_by_date(self, date, priority=PRIORITY_MATCHES):
+        """Get the NFL matches of one day (YYYY-MM-DD)"""
+        full_url, params = self._get_matches_request()
+        params["date"] = date
+        return await self._cached_request(
+            "get",
+            full_url,
+            headers=self.nfl_ncca_api_headers,
+            params=params,
+            priority=priority,
+        )
+
+    async def _get_full_season_matches(
+        self, priority=PRIORITY_MATCHES, use_cache=True, revalidate=False
+    ):
+        """
+        Get all NFL matches of the season from API
+
+        Args:
+            use_cache: False to always ask the upstream, without stale fallback on failure
+            revalidate: With use_cache False, ask conditionally and return NOT_MODIFIED
+                if the cached season is still current
+        """
+
+        full_url, params = self._get_matches_request()
 
         try:
-            return self._cached_request(
-                "get", full_url, headers=self.nfl_ncca_api_headers, params=params
+            return await self._cached_request(
+                "get",
+                full_url,
+                headers=self.nfl_ncca_api_headers,
+                params=params,
+                use_cache=use_cache,
+                priority=priority,
+                max_stale=self.max_stale["matches"],
+                revalidate=revalidate,
             )
+        except APIError as e:
+            # classified errors reach the caller as they are (rate limit, open circuit, 404...)
+            logger.error(f"Failed to get NFL matches: {e}")
+            raise
         except Exception as e:
             logger.error(f"Failed to get NFL matches: {e}")
+            raise Exception("Failed to get NFL matches") from e
+
+    async def get_nfl_season(self, priority=PRIORITY_MATCHES):
+        """Get the indexed Season of all NFL matches, rebuilt only when the payload changes"""
+        response = await self.get_nfl_all_matches(priority=priority)
+        if response is None:
             raise Exception("Failed to get NFL matches")
+        if response is not self.season_payload:
+            self.season = Season(response["data"])
+            self.season_payload = response
+        return self.season
 
-    async def get_nfl_specific_matches(self, matchid):
+    async def get_nfl_specific_matches(self, matchid, allow_stale=True):
         """Get a specific NFL matches by ID"""
 
-        # check if matchid is already cached
+        # check if matchid is already archived
+        try:
+            cached_match = self.match_archive.get(matchid)
+        except MatchFormatError as e:
+            logger.error(f"Error loading match {matchid} from archive: {e}")
+            cached_match = None
+        if cached_match is not None:
+            logger.debug(f"Match {matchid} loaded from archive.")
+            return [cached_match]
+
+        # per-match files written before the archive, imported on first read
+        compact_file = os.path.join(
+            self.match_cache_dir, f"{matchid}{COMPACT_MATCH_EXTENSION}"
+        )
         cache_file = os.path.join(self.match_cache_dir, f"{matchid}.json")
-        if os.path.exists(cache_file):
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cached_data = json.load(f)
-            logger.debug(f"Match {matchid} loaded from cache.")
-            return cached_data
+        try:
+            if os.path.exists(compact_file):
+                with open(compact_file, "rb") as f:
+                    compact_bytes = f.read()
+                decode_match(compact_bytes)
+            elif os.path.exists(cache_file):
+                with open(cache_file, "r", encoding="utf-8") as f:
+                    compact_bytes = encode_match(json.load(f)[0])
+            else:
+                compact_bytes = None
+        except (ValueError, KeyError, IndexError, MatchFormatError) as e:
+            logger.error(f"Error loading match {matchid} from cache: {e}")
+            compact_bytes = None
+        if compact_bytes is not None:
+            self.match_archive.append(matchid, compact_bytes)
+            logger.debug(f"Match {matchid} loaded from cache and archived.")
+            return [decode_match(compact_bytes)]
 
         # make request to API
         full_url = f"{self.base_nfl_ncca_api_url}/matches/{matchid}"
         try:
-            response = self._cached_request(
-                "get", full_url, headers=self.nfl_ncca_api_headers
+            response = await self._cached_request(
+                "get",
+                full_url,
+                headers=self.nfl_ncca_api_headers,
+                priority=PRIORITY_LIVE,
+                max_stale=self.max_stale["match"] if allow_stale else None,
             )
+        except APIError as e:
+            logger.error(f"Failed to get NFL match {matchid}: {e}")
+            raise
         except Exception as e:
             logger.error(f"Failed to get NFL match {matchid}: {e}")
-            raise Exception(f"Failed to get NFL match {matchid}")
+            raise Exception(f"Failed to get NFL match {matchid}") from e
 
         # Save finished match data to cache
         if response[0]["state"]["report"] == "Final":
-            cache_file = os.path.join(self.match_cache_dir, f"{matchid}.json")
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(response, f, indent=2, ensure_ascii=False)
-            logger.debug(f"Match {matchid} cached successfully.")
+            self.match_archive.append_match(response[0])
+            logger.debug(f"Match {matchid} archived successfully.")
 
         return response
 
-    async def get_nfl_standings(self, conference=None):
+    async def get_nfl_standings(self, conference=None, priority=PRIORITY_STANDINGS):
         """Get NFL Standings by conference"""
 
-        league_type = ""
         if conference is None:
             logger.error("Conference must be specified")
             return None
-        elif conference == "afc":
-            league_type = "American Football Conference"
-        elif conference == "nfc":
-            league_type = "National Football Conference"
-        else:
+        if conference not in CONFERENCE_LEAGUE_NAMES:
             logger.error("Invalid conference specified")
             return None
 
-        full_url = f"{self.base_nfl_ncca_api_url}/standings"
-        params = {
-            "leagueName": league_type,
-            "leagueType": self.league,
-            "year": self.current_year,
-        }
+        full_url, params = self._get_standings_request(conference)
 
         try:
-            return self._cached_request(
-                "get", full_url, headers=self.nfl_ncca_api_headers, params=params
+            return await self._cached_request(
+                "get",
+                full_url,
+                headers=self.nfl_ncca_api_headers,
+                params=params,
+                priority=priority,
+                max_stale=self.max_stale["standings"],
             )
+        except APIError as e:
+            logger.error(f"Failed to get NFL Standings {conference}: {e}")
+            raise
         except Exception as e:
             logger.error(f"Failed to get NFL Standings {conference}: {e}")
-            raise Exception(f"Failed to get NFL Standings {conference}")
+            raise Exception(f"Failed to get NFL Standings {conference}") from e
 
-    async def get_nfl_team_injuries(self, team_id):
+    async def get_nfl_team_injuries(self, team_id, priority=PRIORITY_INJURIES):
         """Get NFL team injuries by team id"""
 
         full_url = f"{self.base_nfl_api_url}/nfl-team-injuries"
         params = {"id": str(team_id)}
         logger.info(f"full_url: {full_url}")
         try:
-            return self._cached_request(
-                "get", full_url, headers=self.nfl_api_headers, params=params
+            return await self._cached_request(
+                "get",
+                full_url,
+                headers=self.nfl_api_headers,
+                params=params,
+                api_name="nfl_api",
+                priority=priority,
+                max_stale=self.max_stale["injuries"],
             )
+        except APIError as e:
+            logger.error(f"Failed to get NFL injuries for {team_id}: {e}")
+            raise
         except Exception as e:
             logger.error(f"Failed to get NFL injuries for {team_id}: {e}")
-            raise Exception(f"Failed to get NFL injuries for {team_id}")
+            raise Exception(f"Failed to get NFL injuries for {team_id}") from e
@@ -1,32 +1,35 @@
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
 from loguru import logger
 
+# state descriptions of a game being played, any other state (Scheduled,
+# Finished, Postponed...) means the score cannot change right now
+LIVE_STATES = ("In Progress", "Halftime")
 
-def get_next_scheduled_games_by_team_id(games_list, team_id, num_games=5):
-    """Filter upcoming scheduled game where the specified team is playing"""
-    games = [
-        game
-        for game in games_list
-        if game["state"]["description"] == "Scheduled"
-        and (game["homeTeam"]["id"] == team_id or game["awayTeam"]["id"] == team_id)
-    ]
-    return sorted(
-        games,
-        key=lambda game: datetime.fromisoformat(game["date"].replace("Z", "+00:00")),
-    )[:num_games]
 
+def is_live_state(description):
+    return description in LIVE_STATES
 
-def get_gameweek_by_offset(games_data, offset=0):
+
+def parse_game_date(game):
+    """Parse a game's UTC ISO date into a naive datetime"""
+    game_date = datetime.fromisoformat(game["date"].replace("Z", "+00:00"))
+    return game_date.replace(tzinfo=None)
+
+
+def get_gameweek_window(offset=0, today=None):
     """
-    Get games of a specific week (This Thursday - Next Tuesday)
+    Get the start and end of a gameweek (This Thursday - Next Tuesday)
 
     Args:
-        games_data: List of game objects
         offset: Week offset (0=current week, -1=last week, 1=next week, etc.)
+        today: Reference date (defaults to now)
     """
 
     # Get current date
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    if today is None:
+        today = datetime.now()
+    today = today.replace(hour=0, minute=0, second=0, microsecond=0)
 
     # Find target Thursday
     days_since_thursday = (today.weekday() - 3) % 7
@@ -36,28 +39,77 @@ def get_gameweek_by_offset(games_data, offset=0):
     # Calculate target Tuesday (5 days after Thursday)
     target_tuesday = target_thursday + timedelta(days=4)
 
-    # Filter games within the Thursday-Tuesday range
-    week_games = []
-    for game in games_data:
-        try:
-            # Parse game date - handle the UTC format
-            game_date_str = game["date"]
-            game_date_str = game_date_str[:-1] + "+00:00"
-            game_date = datetime.fromisoformat(game_date_str)
-            game_date_naive = game_date.replace(tzinfo=None)
-
-            # Check if game is in our target week
-            if target_thursday <= game_date_naive <= target_tuesday:
-                week_games.append(game)
-
-        except (ValueError, KeyError) as e:
-            # Skip games with invalid date format
-            logger.error(
-                f"Skipping game with invalid date: {game.get('date', 'No date')}"
+    return target_thursday, target_tuesday
+
+
+class Season:
+    """Date-sorted, indexed view of the games of a /matches payload"""
+
+    def __init__(self, games_data):
+        parsed_games = []
+        for game in games_data:
+            try:
+                parsed_games.append((parse_game_date(game), game))
+            except (ValueError, KeyError, AttributeError):
+                # Skip games with invalid date format
+                logger.error(
+                    f"Skipping game with invalid date: {game.get('date', 'No date')}"
+                )
+        parsed_games.sort(key=lambda parsed_game: parsed_game[0])
+
+        self.timestamps = [game_date for game_date, _ in parsed_games]
+        self.games = [game for _, game in parsed_games]
+
+        # indexes hold positions into the date-sorted games
+        self.games_by_team_id = {}
+        self.games_by_state = {}
+        for index, game in enumerate(self.games):
+            for team in (game["homeTeam"], game["awayTeam"]):
+                self.games_by_team_id.setdefault(team["id"], []).append(index)
+            self.games_by_state.setdefault(game["state"]["description"], []).append(
+                index
             )
-            continue
 
-    # Sort by date
-    week_games.sort(key=lambda x: x["date"])
+    def __len__(self):
+        return len(self.games)
+
+    def get_games_between(self, start, end):
+        """Games with start <= date <= end, sorted by date"""
+        first = bisect_left(self.timestamps, start)
+        last = bisect_right(self.timestamps, end)
+        return self.games[first:last]
+
+    def get_gameweek(self, offset=0, today=None):
+        """Games of a gameweek (This Thursday - Next Tuesday), sorted by date"""
+        target_thursday, target_tuesday = get_gameweek_window(offset, today)
+        return self.get_games_between(target_thursday, target_tuesday)
 
-    return week_games
+    def get_games_by_state(self, state):
+        """Games in a state ("Scheduled", "In Progress", "Finished"), sorted by date"""
+        return [self.games[index] for index in self.games_by_state.get(state, [])]
+
+    def get_next_scheduled_games_by_team_id(self, team_id, num_games=5):
+        """Upcoming scheduled games where the specified team is playing"""
+        games = []
+        for index in self.games_by_team_id.get(team_id, []):
+            if self.games[index]["state"]["description"] == "Scheduled":
+                games.append(self.games[index])
+                if len(games) == num_games:
+                    break
+        return games
+
+
+def get_next_scheduled_games_by_team_id(games_list, team_id, num_games=5):
+    """Filter upcoming scheduled game where the specified team is playing"""
+    return Season(games_list).get_next_scheduled_games_by_team_id(team_id, num_games)
+
+
+def get_gameweek_by_offset(games_data, offset=0):
+    """
+    Get games of a specific week (This Thursday - Next Tuesday)
+
+    Args:
+        games_data: List of game objects
+        offset: Week offset (0=current week, -1=last week, 1=next week, etc.)
+    """
+    return Season(games_data).get_gameweek(offset)
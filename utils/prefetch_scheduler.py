@@ -0,0 +1,154 @@
+import argparse
+import asyncio
+import os
+from datetime import datetime, timedelta
+from loguru import logger
+from utils.api_budget import PRIORITY_PREFETCH
+from utils.nfl_schedule import get_gameweek_window
+from utils.read_json import load_nfl_teams
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+# Thursday morning, Sunday pre-kickoff, Tuesday after MNF
+DEFAULT_PREFETCH_SCHEDULE = "thu 09:00,sun 11:00,tue 09:00"
+
+
+def parse_prefetch_schedule(schedule):
+    """
+    Parse a prefetch schedule string into (weekday, hour, minute) slots
+
+    Examples:
+        >>> parse_prefetch_schedule("thu 09:00,sun 11:30")
+        [(3, 9, 0), (6, 11, 30)]
+    """
+    slots = []
+    for slot in schedule.split(","):
+        slot = slot.strip()
+        if not slot:
+            continue
+        day, time_of_day = slot.split()
+        hour, minute = time_of_day.split(":")
+        slots.append((WEEKDAYS.index(day.lower()[:3]), int(hour), int(minute)))
+    return slots
+
+
+class PrefetchScheduler:
+    """Warm the API cache at fixed points of the NFL week (Thursday - Tuesday)"""
+
+    def __init__(self, nfl_api_manager, injury_team_ids, schedule=None):
+        self.nfl_api_manager = nfl_api_manager
+        self.injury_team_ids = list(injury_team_ids)
+        self.slots = parse_prefetch_schedule(schedule or DEFAULT_PREFETCH_SCHEDULE)
+
+    def get_jobs(self):
+        """List of (api_name, description) fetched at every slot"""
+        jobs = [
+            ("nfl_ncca_api", "matches"),
+            ("nfl_ncca_api", "standings nfc"),
+            ("nfl_ncca_api", "standings afc"),
+        ]
+        jobs += [("nfl_api", f"injuries {team_id}") for team_id in self.injury_team_ids]
+        return jobs
+
+    def plan_week(self, offset=0, today=None):
+        """
+        Get the prefetch run times for a gameweek
+
+        Args:
+            offset: Week offset (0=current week, 1=next week, etc.)
+            today: Reference date (defaults to now)
+        """
+        thursday, _ = get_gameweek_window(offset, today)
+        run_times = []
+        for weekday, hour, minute in self.slots:
+            # slots are placed in the week starting at the gameweek Thursday
+            days_after_thursday = (weekday - 3) % 7
+            run_times.append(
+                thursday
+                + timedelta(days=days_after_thursday, hours=hour, minutes=minute)
+            )
+        return sorted(run_times)
+
+    def get_next_run(self, now=None):
+        if now is None:
+            now = datetime.now()
+        for offset in (0, 1):
+            for run_at in self.plan_week(offset, now):
+                if run_at > now:
+                    return run_at
+        return None
+
+    async def prefetch(self):
+        """Fetch every job once, leaving the calls reserved for users untouched"""
+        budget = self.nfl_api_manager.budget
+        fetched = 0
+        for api_name, job in self.get_jobs():
+            if not budget.can_spend(api_name, PRIORITY_PREFETCH):
+                logger.info(f"Skipping prefetch of {job}, {api_name} budget reserved")
+                continue
+            try:
+                await self._run_job(job)
+                fetched += 1
+            except Exception as e:
+                logger.warning(f"Prefetch of {job} failed: {e}")
+        logger.info(f"✅ Prefetched {fetched}/{len(self.get_jobs())} API requests")
+
+    async def _run_job(self, job):
+        name, _, argument = job.partition(" ")
+        if name == "matches":
+            await self.nfl_api_manager.get_nfl_all_matches(priority=PRIORITY_PREFETCH)
+        elif name == "standings":
+            await self.nfl_api_manager.get_nfl_standings(
+                argument, priority=PRIORITY_PREFETCH
+            )
+        elif name == "injuries":
+            await self.nfl_api_manager.get_nfl_team_injuries(
+                argument, priority=PRIORITY_PREFETCH
+            )
+
+    async def run(self):
+        """Prefetch forever at the scheduled times"""
+        while True:
+            run_at = self.get_next_run()
+            if run_at is None:
+                logger.warning("No prefetch slots configured, stopping scheduler")
+                return
+            logger.info(f"Next prefetch at {run_at}")
+            await asyncio.sleep((run_at - datetime.now()).total_seconds())
+            await self.prefetch()
+
+    def describe_week(self, offset=0, today=None):
+        """Printable fetch timeline of a gameweek (dry-run)"""
+        thursday, tuesday = get_gameweek_window(offset, today)
+        jobs = self.get_jobs()
+        calls_per_api = {}
+        for api_name, _ in jobs:
+            calls_per_api[api_name] = calls_per_api.get(api_name, 0) + 1
+
+        lines = [f"Gameweek {thursday:%a %d/%m/%y} - {tuesday:%a %d/%m/%y}"]
+        for run_at in self.plan_week(offset, today):
+            lines.append(f"{run_at:%a %d/%m/%y %H:%M}")
+            for api_name, job in jobs:
+                lines.append(f"    [{api_name}] {job}")
+        calls = ", ".join(f"{api}: {count}" for api, count in calls_per_api.items())
+        lines.append(f"Upstream calls per run at most (on cold cache): {calls}")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="NFL API prefetch scheduler")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Print the planned fetch timeline"
+    )
+    parser.add_argument("--offset", type=int, default=0, help="Gameweek offset")
+    args = parser.parse_args()
+
+    if not args.dry_run:
+        parser.error("only --dry-run is supported outside the bot")
+
+    team_ids = [team["nflApiId"] for team in load_nfl_teams().values()]
+    scheduler = PrefetchScheduler(None, team_ids, os.getenv("PREFETCH_SCHEDULE"))
+    print(scheduler.describe_week(args.offset))
@@ -0,0 +1,51 @@
+from collections import OrderedDict
+
+
+class RenderCache:
+    """
+    Rendered command output by (command, arguments), valid for one payload version
+
+    The version is the creation time of the API cache entry the output was rendered from,
+    so output rendered from a payload that has since been refreshed is never served
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+
+        # (command, args) -> (version, rendered), oldest first
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, command, args, version):
+        """Rendered output for the payload version, or None"""
+        entry = self.entries.get((command, args))
+        if version is None or entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+        self.entries.move_to_end((command, args))
+        self.hits += 1
+        return entry[1]
+
+    def set(self, command, args, version, rendered):
+        """Store output, replacing output rendered from an older payload"""
+        if version is None:
+            return
+        self.entries[(command, args)] = (version, rendered)
+        self.entries.move_to_end((command, args))
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get_or_render(self, command, args, version, render):
+        """Cached output, or call render() and cache its result"""
+        rendered = self.get(command, args, version)
+        if rendered is None:
+            rendered = render()
+            self.set(command, args, version, rendered)
+        return rendered
+
+    def clear(self):
+        self.entries.clear()
+
+    def get_stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
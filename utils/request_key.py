@@ -0,0 +1,78 @@
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# request headers that change the upstream response, every other header
+# (API key, host, user agent...) is left out of the request identity
+VARY_HEADERS = ("accept", "accept-language")
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_param_value(value):
+    """Normalize a query value to the string aiohttp would send ("2025" == 2025)"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def normalize_params(params):
+    """Sorted (name, value) pairs, None values dropped and values normalized"""
+    pairs = []
+    for name, value in dict(params or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            pairs.extend((str(name), normalize_param_value(item)) for item in value)
+        else:
+            pairs.append((str(name), normalize_param_value(value)))
+    return sorted(pairs)
+
+
+def normalize_url(url):
+    """Lowercase scheme and host, drop default port, fragment and trailing slash"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, "", ""))
+
+
+def get_canonical_request(method, url, params=None, headers=None):
+    """
+    Readable identity of a request, equal for requests the upstream answers identically
+
+    Query parameters embedded in the URL are merged into params
+    """
+    query_params = parse_qsl(urlsplit(url).query, keep_blank_values=True)
+    all_params = normalize_params(params) + [
+        (name, normalize_param_value(value)) for name, value in query_params
+    ]
+
+    canonical = f"{method.upper()} {normalize_url(url)}"
+    if all_params:
+        canonical += f"?{urlencode(sorted(all_params))}"
+
+    vary = sorted(
+        (name.lower(), str(value).strip())
+        for name, value in (headers or {}).items()
+        if value is not None and name.lower() in VARY_HEADERS
+    )
+    if vary:
+        canonical += " " + "&".join(f"{name}={value}" for name, value in vary)
+    return canonical
+
+
+def get_request_key(method, url, params=None, headers=None):
+    """Hashed request identity, used as cache file name and coalescing key"""
+    canonical = get_canonical_request(method, url, params, headers)
+    return hashlib.md5(canonical.encode()).hexdigest()
+
+
+def get_legacy_cache_key(url, params=None):
+    """Cache key of the previous APICache (str() of params, so ordering and types mattered)"""
+    key_data = f"{url}_{str(params)}"
+    return hashlib.md5(key_data.encode()).hexdigest()
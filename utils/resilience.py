@@ -0,0 +1,215 @@
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from loguru import logger
+
+
+class APIError(Exception):
+    """Base of classified upstream API errors, retryable errors may succeed when repeated"""
+
+    retryable = False
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class APITimeoutError(APIError):
+    retryable = True
+
+
+class APIConnectionError(APIError):
+    retryable = True
+
+
+class APIServerError(APIError):
+    """5xx response"""
+
+    retryable = True
+
+
+class APIRateLimitError(APIError):
+    """429 response, retry_after is the delay asked by the server in seconds (or None)"""
+
+    retryable = True
+
+    def __init__(self, message, status=429, retry_after=None):
+        super().__init__(message, status)
+        self.retry_after = retry_after
+
+
+class APIClientError(APIError):
+    """4xx response other than 429, repeating the request will not help"""
+
+    pass
+
+
+class APIResponseError(APIError):
+    """Response body could not be parsed"""
+
+    pass
+
+
+class CircuitOpenError(APIError):
+    """Raised without calling the API while its circuit breaker is open"""
+
+    pass
+
+
+class BudgetExhaustedError(APIError):
+    """Raised without calling the API once its daily budget is spent"""
+
+    pass
+
+
+# user-facing reason per error class, the first matching class wins
+API_ERROR_REASONS = [
+    (BudgetExhaustedError, "the daily API limit is used up, try again tomorrow"),
+    (CircuitOpenError, "the NFL API is unavailable, try again in a minute"),
+    (APIRateLimitError, "the NFL API is busy, try again in a minute"),
+    (APITimeoutError, "the NFL API did not answer in time"),
+    (APIConnectionError, "the NFL API could not be reached"),
+    (APIServerError, "the NFL API is having problems, try again later"),
+]
+
+
+def describe_api_error(error):
+    """Short reason for a failed API call that can be shown to users"""
+    if isinstance(error, APIClientError) and error.status == 404:
+        return "not found"
+    for error_class, reason in API_ERROR_REASONS:
+        if isinstance(error, error_class):
+            return reason
+    return str(error)
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delay seconds or HTTP date), None if invalid"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (retry_at - now).total_seconds())
+
+
+class RetryPolicy:
+    """Bounded retries with full-jitter exponential backoff"""
+
+    def __init__(
+        self,
+        max_attempts=3,
+        base_delay=0.5,
+        max_delay=8,
+        max_retry_after=30,
+        retry_timeouts=False,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        # a timed out attempt already waited the whole timeout, retrying it
+        # would multiply the wait during a brownout (the breaker still counts it)
+        self.retry_timeouts = retry_timeouts
+
+        # a 429 asking to wait longer than this is not retried
+        self.max_retry_after = max_retry_after
+
+    def get_delay(self, attempt, error):
+        """
+        Seconds to wait before retrying after a failed attempt, or None to give up
+
+        Args:
+            attempt: Number of the failed attempt (1 = first)
+            error: The APIError the attempt failed with
+        """
+        if not getattr(error, "retryable", False) or attempt >= self.max_attempts:
+            return None
+        if isinstance(error, APITimeoutError) and not self.retry_timeouts:
+            return None
+        if isinstance(error, APIRateLimitError) and error.retry_after is not None:
+            if error.retry_after > self.max_retry_after:
+                return None
+            return error.retry_after
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+# circuit breaker states
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures of an API host, probing again after reset_timeout"""
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30, clock=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock or time.monotonic
+
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.total_failures = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    def allow(self):
+        """Whether a request may be sent, a half-open circuit lets one probe through"""
+        if self.state == CIRCUIT_OPEN:
+            if self.clock() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = CIRCUIT_HALF_OPEN
+            self.probing = False
+        if self.state == CIRCUIT_HALF_OPEN:
+            if self.probing:
+                self.rejected += 1
+                return False
+            self.probing = True
+        return True
+
+    def release(self):
+        """Give back a half-open probe that ended without an outcome (e.g. cancelled)"""
+        self.probing = False
+
+    def record_success(self):
+        if self.state != CIRCUIT_CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.total_failures += 1
+        if self.state == CIRCUIT_HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != CIRCUIT_OPEN:
+                self.times_opened += 1
+                logger.warning(
+                    f"Circuit for {self.name} opened after {self.failures} failures"
+                )
+            self.state = CIRCUIT_OPEN
+            self.opened_at = self.clock()
+            self.probing = False
+
+    def get_stats(self):
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "total_failures": self.total_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,121 @@
+import json
+import os
+import time
+from datetime import datetime, timezone
+from loguru import logger
+from utils.atomic_file import atomic_write
+from utils.nfl_schedule import is_live_state, parse_game_date
+
+
+class SeasonStore:
+    """Games of a season by id, persisted so incremental syncs survive restarts"""
+
+    def __init__(self, path, season):
+        self.path = path
+        self.season = str(season)
+        self.games = {}
+        self.full_synced_at = None
+        self.version = None
+        self.payload = None
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if str(stored.get("season")) != self.season:
+                logger.info(
+                    f"Season store is for {stored.get('season')}, starting over"
+                )
+                return
+            self.games = {game["id"]: game for game in stored["games"]}
+            self.full_synced_at = stored.get("full_synced_at")
+            self.version = stored.get("version")
+        except Exception as e:
+            logger.error(f"Error loading season store: {e}")
+            self.games = {}
+
+    def _save(self):
+        stored = {
+            "season": self.season,
+            "full_synced_at": self.full_synced_at,
+            "version": self.version,
+            "games": list(self.games.values()),
+        }
+        try:
+            atomic_write(self.path, json.dumps(stored).encode("utf-8"))
+        except Exception as e:
+            logger.error(f"Error saving season store: {e}")
+
+    def __len__(self):
+        return len(self.games)
+
+    def is_full_sync_due(self, interval, now=None):
+        """Whether the last full sync is older than interval seconds (or never happened)"""
+        if not self.games or self.full_synced_at is None:
+            return True
+        return (now or time.time()) - self.full_synced_at >= interval
+
+    def replace(self, games):
+        """Replace every game with a full season payload, returning how many changed"""
+        games = {game["id"]: game for game in games}
+        changed = len(self.games.keys() - games.keys())
+        for game_id, game in games.items():
+            if self.games.get(game_id) != game:
+                changed += 1
+        self.games = games
+        self.full_synced_at = time.time()
+        if changed:
+            self._changed()
+        self._save()
+        return changed
+
+    def confirm_full_sync(self):
+        """Record a full sync that found the season unchanged, returning 0 changed games"""
+        self.full_synced_at = time.time()
+        self._save()
+        return 0
+
+    def merge(self, games):
+        """Insert or update games by id, returning how many changed"""
+        changed = 0
+        for game in games:
+            if self.games.get(game["id"]) != game:
+                self.games[game["id"]] = game
+                changed += 1
+        if changed:
+            self._changed()
+            self._save()
+        return changed
+
+    def _changed(self):
+        self.version = time.time()
+        self.payload = None
+
+    def get_dates_to_sync(self, now=None):
+        """
+        UTC dates (YYYY-MM-DD) of games whose state can still change
+
+        These are live games (see LIVE_STATES) and unfinished games whose kickoff has passed
+        """
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        dates = set()
+        for game in self.games.values():
+            state = game["state"]["description"]
+            if state == "Finished":
+                continue
+            try:
+                game_date = parse_game_date(game)
+            except (ValueError, KeyError, AttributeError):
+                continue
+            if is_live_state(state) or game_date <= now:
+                dates.add(game_date.strftime("%Y-%m-%d"))
+        return sorted(dates)
+
+    def get_payload(self):
+        """Stored games shaped like a /matches response, the same object until a change"""
+        if self.payload is None:
+            self.payload = {"data": list(self.games.values())}
+        return self.payload
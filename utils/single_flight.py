@@ -0,0 +1,46 @@
+import asyncio
+from loguru import logger
+
+
+class SingleFlight:
+    """Share one in-flight request between concurrent callers of the same key"""
+
+    def __init__(self):
+        self.in_flight = {}
+        self.originated = 0
+        self.coalesced = 0
+
+    async def do(self, key, request_func):
+        """
+        Await the in-flight request for key, or start one with request_func.
+
+        Args:
+            key: Request identity (e.g. APICache cache key)
+            request_func: Zero-argument coroutine function making the request
+        """
+        task = self.in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.debug(f"COALESCED: {key}")
+        else:
+            self.originated += 1
+            task = asyncio.ensure_future(request_func())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+
+        # shield so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+        # mark exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self):
+        return {
+            "originated": self.originated,
+            "coalesced": self.coalesced,
+            "in_flight": len(self.in_flight),
+        }
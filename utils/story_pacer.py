@@ -0,0 +1,78 @@
+import asyncio
+from loguru import logger
+from utils.message_batcher import DISCORD_MESSAGE_LIMIT, batch_lines
+
+
+class StoryPacer:
+    """Deliver story lines with dramatic pauses without blocking the bot"""
+
+    def __init__(self, sleep=None, flush_delay=4, max_length=DISCORD_MESSAGE_LIMIT):
+        self.sleep = sleep or asyncio.sleep
+
+        # consecutive lines are packed into one message until flush_delay
+        # seconds of pauses have accumulated (0 sends every line on its own)
+        self.flush_delay = flush_delay
+        self.max_length = max_length
+        self.total_lines = 0
+        self.total_sends = 0
+
+        # stories in the same channel are delivered one after another
+        self.channel_locks = {}
+        self.channel_tasks = {}
+
+    def deliver(self, channel, lines):
+        """
+        Schedule a story for delivery to a channel
+
+        Args:
+            channel: Discord channel (anything with an async send)
+            lines: Iterable of (message, delay) pairs, delay is the pause in seconds after the message
+        """
+        task = asyncio.create_task(self._deliver(channel, lines))
+        self.channel_tasks.setdefault(channel.id, set()).add(task)
+        task.add_done_callback(lambda t: self._finish(channel.id, t))
+        return task
+
+    async def _deliver(self, channel, lines):
+        lock = self.channel_locks.setdefault(channel.id, asyncio.Lock())
+        lines = list(lines)
+        sends = 0
+        async with lock:
+            for message, delay in batch_lines(lines, self.max_length, self.flush_delay):
+                await channel.send(message)
+                sends += 1
+                self.total_sends += 1
+                if delay:
+                    await self.sleep(delay)
+        self.total_lines += len(lines)
+        logger.debug(
+            f"Story delivered to {channel.id}: {len(lines)} lines in {sends} sends"
+        )
+
+    def _finish(self, channel_id, task):
+        tasks = self.channel_tasks.get(channel_id, set())
+        tasks.discard(task)
+        if not tasks:
+            self.channel_tasks.pop(channel_id, None)
+            self.channel_locks.pop(channel_id, None)
+
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Story delivery failed in {channel_id}: {task.exception()}")
+
+    def is_running(self, channel_id):
+        return bool(self.channel_tasks.get(channel_id))
+
+    def stop(self, channel_id):
+        """Cancel running and queued stories of a channel, returning how many were cancelled"""
+        tasks = list(self.channel_tasks.get(channel_id, set()))
+        for task in tasks:
+            task.cancel()
+        return len(tasks)
+
+    def get_stats(self):
+        """Lines (sends without batching) vs actual Discord sends"""
+        return {"lines": self.total_lines, "sends": self.total_sends}
+
+    def stop_all(self):
+        for channel_id in list(self.channel_tasks):
+            self.stop(channel_id)
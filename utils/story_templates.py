@@ -0,0 +1,109 @@
+import random
+from string import Formatter
+from loguru import logger
+
+STORYLINE_PLACEHOLDERS = frozenset(
+    [
+        "winner_character",
+        "winner_team",
+        "winner_score",
+        "loser_character",
+        "loser_team",
+        "loser_score",
+    ]
+)
+UPCOMING_PLACEHOLDERS = frozenset(
+    ["team1_character", "team1", "team2_character", "team2", "game_time"]
+)
+GAME_EVENT_PLACEHOLDERS = frozenset(
+    [
+        "offensive_character",
+        "offensive_team",
+        "defensive_character",
+        "defensive_team",
+    ]
+)
+
+# allowed placeholders per group and per (group, category) of storyline.json
+GROUP_PLACEHOLDERS = {"game_events": GAME_EVENT_PLACEHOLDERS}
+ALLOWED_PLACEHOLDERS = {
+    ("storylines", "big_win"): STORYLINE_PLACEHOLDERS,
+    ("storylines", "small_win"): STORYLINE_PLACEHOLDERS,
+    ("storylines", "tie"): STORYLINE_PLACEHOLDERS,
+    ("storylines", "upcoming"): UPCOMING_PLACEHOLDERS,
+}
+
+
+class TemplateError(Exception):
+    """Raised when a story template cannot be compiled"""
+
+    pass
+
+
+class StoryTemplate:
+    """Story template pre-split into literal text and placeholder names"""
+
+    __slots__ = ("text", "literals", "fields")
+
+    def __init__(self, text, allowed_placeholders):
+        self.text = text
+        literals = []
+        fields = []
+        try:
+            parsed = list(Formatter().parse(text))
+        except ValueError as e:
+            raise TemplateError(f"Malformed template: {e}")
+
+        pending_literal = ""
+        for literal, field_name, format_spec, conversion in parsed:
+            pending_literal += literal
+            if field_name is None:
+                continue
+            if format_spec or conversion:
+                raise TemplateError(f"Unsupported format in '{{{field_name}}}'")
+            if field_name not in allowed_placeholders:
+                raise TemplateError(f"Unknown placeholder '{{{field_name}}}'")
+            literals.append(pending_literal)
+            fields.append(field_name)
+            pending_literal = ""
+        literals.append(pending_literal)
+
+        self.literals = tuple(literals)
+        self.fields = tuple(fields)
+
+    def render(self, **values):
+        """Fill the placeholders, equivalent to str.format(**values)"""
+        parts = [self.literals[0]]
+        for field_name, literal in zip(self.fields, self.literals[1:]):
+            parts.append(str(values[field_name]))
+            parts.append(literal)
+        return "".join(parts)
+
+
+class TemplateRegistry:
+    """Compiled story templates by (group, category), e.g. ("game_events", "touchdown")"""
+
+    def __init__(self, storyline_data):
+        self.templates = {}
+        for group, categories in storyline_data.items():
+            for category, category_data in categories.items():
+                allowed = ALLOWED_PLACEHOLDERS.get(
+                    (group, category), GROUP_PLACEHOLDERS.get(group, frozenset())
+                )
+                compiled = []
+                for text in category_data.get("templates", []):
+                    try:
+                        compiled.append(StoryTemplate(text, allowed))
+                    except TemplateError as e:
+                        logger.error(f"❌ Invalid {group}.{category} template: {e}")
+                self.templates[(group, category)] = tuple(compiled)
+
+    def get_random(self, group, category):
+        """Random compiled template of a category (None if the category is empty)"""
+        templates = self.templates.get((group, category))
+        if not templates:
+            return None
+        return random.choice(templates)
+
+    def get_categories(self):
+        return list(self.templates)